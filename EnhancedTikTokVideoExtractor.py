@@ -7,6 +7,9 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from loguru import logger
 
+from src.utils.media_urls import classify_media_url
+from src.scraper.network_capture import NetworkCapture
+
 class EnhancedTikTokVideoExtractor:
     """TikTok Ad Library'den gerçek video URL'lerini çıkarma"""
     
@@ -100,7 +103,7 @@ class EnhancedTikTokVideoExtractor:
                     elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                     for elem in elements:
                         src = elem.get_attribute('src') or elem.get_attribute('data-src')
-                        if src and any(ext in src.lower() for ext in ['.mp4', '.mov', '.avi']):
+                        if src and classify_media_url(src).has_video_ext:
                             return {
                                 'media_urls': [src],
                                 'media_type': 'video',
@@ -129,20 +132,15 @@ class EnhancedTikTokVideoExtractor:
     def _method_2_network_capture(self, ad_element) -> dict:
         """Yöntem 2: Browser network logs'undan video URL yakala"""
         try:
-            # Chrome DevTools Protocol kullanarak network logları al
-            logs = self.driver.get_log('performance')
-            
-            for log in logs:
-                message = json.loads(log['message'])
-                if message['message']['method'] == 'Network.responseReceived':
-                    url = message['message']['params']['response']['url']
-                    if any(ext in url.lower() for ext in ['.mp4', '.mov', '.avi']) and 'tiktok' in url:
-                        return {
-                            'media_urls': [url],
-                            'media_type': 'video',
-                            'video_found': True,
-                            'extraction_method': 'network_logs'
-                        }
+            # Chrome DevTools Protocol network logları (sadece video response'ları parse edilir)
+            for url in NetworkCapture(self.driver).drain_performance_log():
+                if classify_media_url(url).has_video_ext and 'tiktok' in url:
+                    return {
+                        'media_urls': [url],
+                        'media_type': 'video',
+                        'video_found': True,
+                        'extraction_method': 'network_logs'
+                    }
         except Exception as e:
             logger.debug(f"Method 2 failed: {e}")
         
@@ -217,7 +215,7 @@ class EnhancedTikTokVideoExtractor:
                         # Farklı attribute'ları kontrol et
                         for attr in ['src', 'data-src', 'data-video-src', 'data-video-url', 'href']:
                             url = elem.get_attribute(attr)
-                            if url and any(ext in url.lower() for ext in ['.mp4', '.mov', '.avi']):
+                            if url and classify_media_url(url).has_video_ext:
                                 return {
                                     'media_urls': [url],
                                     'media_type': 'video',
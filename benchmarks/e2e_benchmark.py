@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+End-to-end scraper benchmark (offline)
+Usage: python -m benchmarks.e2e_benchmark --page-sizes 10,30 --keywords banka,kredi
+
+Fake Ad Library sunucusunu başlatır, TikTokSeleniumScraper'ı headless
+olarak ona yönlendirir ve her konfigürasyon için ads/sec,
+time-to-first-ad ve peak RSS (Python + Chrome process ağacı) raporlar.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fake_ad_library import FakeAdLibraryServer
+
+
+def _process_tree_rss_kb(root_pid: int) -> int:
+    """root_pid ve tüm alt process'lerin toplam RSS'i (KB, /proc üzerinden)"""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read().decode("utf-8", "replace")
+            ppid = int(stat.rsplit(")", 1)[1].split()[1])
+            children.setdefault(ppid, []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total
+
+
+class PeakRssSampler:
+    """Arka planda process ağacı RSS'ini örnekle ve tepe değeri tut"""
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self.peak_kb = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        pid = os.getpid()
+        while not self._stop.is_set():
+            self.peak_kb = max(self.peak_kb, _process_tree_rss_kb(pid))
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+def run_case(page_size: int, total_ads: int, keywords: List[str], max_ads: int) -> Dict:
+    from src.scraper.tiktok_selenium_scraper import TikTokSeleniumScraper
+
+    with FakeAdLibraryServer(total_ads=total_ads, page_size=page_size) as server:
+        scraper = TikTokSeleniumScraper(headless=True, base_url=server.base_url)
+        scraper.stats.reset()
+
+        with PeakRssSampler() as sampler:
+            started = time.perf_counter()
+            ads = scraper.search_ads_by_keyword(keywords, max_ads=max_ads)
+            elapsed = time.perf_counter() - started
+
+        performance = scraper.stats.summary()
+        return {
+            "page_size": page_size,
+            "total_ads_per_keyword": total_ads,
+            "keywords": keywords,
+            "ads": len(ads),
+            "seconds": round(elapsed, 2),
+            "ads_per_second": round(len(ads) / elapsed, 3) if elapsed else 0.0,
+            "time_to_first_ad_seconds": performance["time_to_first_ad_seconds"],
+            "peak_rss_mb": round(sampler.peak_kb / 1024, 1),
+            "server_requests": dict(server.library.request_counts),
+            "performance": performance,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end scraper benchmark")
+    parser.add_argument("--page-sizes", default="12", help="Virgülle ayrılmış 'View more' sayfa boyutları")
+    parser.add_argument("--total-ads", type=int, default=36, help="Keyword başına sunucudaki reklam sayısı")
+    parser.add_argument("--keywords", default="banka", help="Virgülle ayrılmış keyword'ler")
+    parser.add_argument("--max-ads", type=int, default=24, help="Scraper'a verilen maksimum reklam")
+    parser.add_argument("--output", default=None, help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    keywords = [k.strip() for k in args.keywords.split(",") if k.strip()]
+    results = []
+    for page_size in [int(p) for p in args.page_sizes.split(",")]:
+        result = run_case(page_size, args.total_ads, keywords, args.max_ads)
+        results.append(result)
+        print(
+            f"page_size={page_size:<4} ads={result['ads']:<4} {result['seconds']:>8.2f}s  "
+            f"ads/sec={result['ads_per_second']:<7} ttfa={result['time_to_first_ad_seconds']}s  "
+            f"peak_rss={result['peak_rss_mb']}MB"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Sonuçlar kaydedildi: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
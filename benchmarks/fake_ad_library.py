@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Offline TikTok Ad Library stand-in server
+Usage: python -m benchmarks.fake_ad_library --port 8765 --total-ads 60 --page-size 12
+
+Listing sayfası (autocomplete, Search butonu, "View more" pagination),
+reklam detay sayfaları (<video><source>) ve sahte CDN medya dosyalarını
+sunar. TikTokSeleniumScraper(base_url=...) ile canlı siteye gitmeden
+uçtan uca ölçüm yapmak için kullanılır.
+
+--fixtures dizini verilirse, istenen path dizinde kayıtlı bir dosya
+olarak varsa (örn. fixtures/ads/index.html) sentetik sayfa yerine o sunulur.
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import random
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+ADVERTISERS = [
+    "TURKIYE GARANTI BANKASI ANONIM SIRKETI",
+    "AKBANK TURK ANONIM SIRKETI",
+    "YAPI VE KREDI BANKASI ANONIM SIRKETI",
+    "TURKIYE IS BANKASI",
+    "QNB BANK ANONIM SIRKETI",
+    "PAPARA ELEKTRONIK PARA A.S.",
+    "ING BANK A.S.",
+    "DENIZBANK A.S.",
+]
+
+# Küçük ama geçerli görünen medya gövdeleri
+FAKE_MP4 = b"\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom" + b"\x00" * 2048
+FAKE_JPEG = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00" + b"\x00" * 1024 + b"\xff\xd9"
+
+LISTING_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>TikTok Ad Library (offline)</title>
+<style>
+  .byted-popover {{ display: none; border: 1px solid #ccc; padding: 4px; }}
+  .ad_card {{ border: 1px solid #eee; margin: 8px; padding: 8px; }}
+  .video_player {{ width: 160px; height: 90px; background-size: cover; }}
+</style></head>
+<body>
+<h1>TikTok Ad Library</h1>
+<p>Search ads that ran on TikTok. Filter by target country, advertiser name or keyword and date range.</p>
+<div class="search_bar">
+  <span>Target country</span>
+  <input id="search" type="text" placeholder="Advertiser name or keyword" autocomplete="off">
+  <div class="byted-popover" id="popover">
+    <div class="exact_field_label" id="exact">
+      <span class="exact_field_label_text">Search this exact phrase</span>
+      <span class="exact_field_label_text_dark" id="exact_text"></span>
+    </div>
+  </div>
+  <button type="submit" id="search_btn">Search</button>
+</div>
+<div id="total">Total ads: NaN</div>
+<div id="results"></div>
+<div class="loading_more" id="more" style="display:none"><span class="loading_more_text">View more</span></div>
+<script>
+  var PAGE_SIZE = {page_size};
+  var offset = 0;
+  var keyword = "";
+  var input = document.getElementById("search");
+  var popover = document.getElementById("popover");
+  input.addEventListener("input", function() {{
+    document.getElementById("exact_text").textContent = '"' + input.value.toUpperCase() + '"';
+    popover.style.display = input.value ? "block" : "none";
+  }});
+  document.getElementById("exact").addEventListener("click", function() {{
+    input.value = '"' + input.value + '"';
+    popover.style.display = "none";
+  }});
+  function renderCard(ad) {{
+    var card = document.createElement("div");
+    card.className = "ad_card";
+    card.innerHTML =
+      '<div class="ad_info_name">Ad<br><span class="ad_info_text"></span></div>' +
+      '<div class="video_player" style="background-image: url(&quot;' + ad.thumbnail_url + '&quot;)"></div>' +
+      '<div class="ad_details">First shown:<br>' + ad.first_shown + '<br>Last shown:<br>' + ad.last_shown +
+      '<br>Unique users seen:<br>' + ad.reach + '</div>' +
+      '<a class="link" href="/ads/detail/?ad_id=' + ad.ad_id + '">See ad details</a>';
+    card.querySelector(".ad_info_text").textContent = ad.advertiser_name;
+    document.getElementById("results").appendChild(card);
+  }}
+  function loadPage() {{
+    var xhr = new XMLHttpRequest();
+    xhr.open("GET", "/api/ads?keyword=" + encodeURIComponent(keyword) + "&offset=" + offset + "&limit=" + PAGE_SIZE);
+    xhr.onload = function() {{
+      var data = JSON.parse(xhr.responseText);
+      data.ads.forEach(renderCard);
+      offset += data.ads.length;
+      document.getElementById("total").textContent = "Total ads: " + data.total;
+      document.getElementById("more").style.display = offset < data.total ? "block" : "none";
+    }};
+    xhr.send();
+  }}
+  document.getElementById("search_btn").addEventListener("click", function() {{
+    keyword = input.value.replace(/"/g, "");
+    offset = 0;
+    document.getElementById("results").innerHTML = "";
+    var params = new URLSearchParams(location.search);
+    params.set("adv_name", keyword);
+    history.pushState({{}}, "", location.pathname + "?" + params.toString());
+    loadPage();
+  }});
+  input.addEventListener("keydown", function(e) {{
+    if (e.key === "Enter") {{ document.getElementById("search_btn").click(); }}
+  }});
+  document.getElementById("more").addEventListener("click", loadPage);
+</script>
+</body></html>
+"""
+
+DETAIL_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Ad details {ad_id}</title></head>
+<body>
+<h2>{advertiser}</h2>
+<div class="video-player">
+  <video controls poster="/cdn/img/{ad_id}.jpeg"><source src="/cdn/video/{ad_id}.mp4" type="video/mp4"></video>
+</div>
+<p>First shown: {first_shown}</p><p>Last shown: {last_shown}</p>
+</body></html>
+"""
+
+
+class FakeAdLibrary:
+    """Sentetik reklam veri seti (keyword'e göre deterministik)"""
+
+    def __init__(self, total_ads: int = 60, page_size: int = 12, seed: int = 42):
+        self.total_ads = total_ads
+        self.page_size = page_size
+        self.seed = seed
+        self.request_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def count(self, kind: str):
+        with self._lock:
+            self.request_counts[kind] = self.request_counts.get(kind, 0) + 1
+
+    def ads_for(self, keyword: str) -> List[Dict]:
+        digest = int(hashlib.md5(f"{self.seed}:{keyword.lower()}".encode("utf-8")).hexdigest()[:8], 16)
+        rng = random.Random(digest)
+        today = datetime(2025, 9, 30)
+        ads = []
+        for i in range(self.total_ads):
+            # Keyword'ler arası örtüşme olsun diye ad_id havuzu sınırlı
+            ad_id = str(7_400_000_000_000_000_000 + rng.randint(0, self.total_ads * 3))
+            last = today - timedelta(days=rng.randint(0, 30))
+            ads.append({
+                "ad_id": ad_id,
+                "advertiser_name": rng.choice(ADVERTISERS),
+                "first_shown": (last - timedelta(days=rng.randint(1, 60))).strftime("%m/%d/%Y"),
+                "last_shown": last.strftime("%m/%d/%Y"),
+                "reach": f"{rng.randint(1, 900)}K-{rng.randint(1, 9)}M",
+                "thumbnail_url": f"/cdn/img/{ad_id}.jpeg",
+            })
+        return ads
+
+    def find_ad(self, ad_id: str) -> Dict:
+        return {
+            "ad_id": ad_id,
+            "advertiser_name": ADVERTISERS[int(ad_id) % len(ADVERTISERS)] if ad_id.isdigit() else ADVERTISERS[0],
+            "first_shown": "08/01/2025",
+            "last_shown": "09/30/2025",
+        }
+
+
+def make_handler(library: FakeAdLibrary, fixtures: Optional[Path] = None):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "public, max-age=3600")
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+
+        def _fixture(self, path: str) -> Optional[bytes]:
+            if not fixtures:
+                return None
+            candidate = (fixtures / path.lstrip("/")).resolve()
+            if candidate.is_dir():
+                candidate = candidate / "index.html"
+            if fixtures.resolve() in candidate.parents and candidate.is_file():
+                return candidate.read_bytes()
+            return None
+
+        def do_HEAD(self):
+            self.do_GET()
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+            path = parsed.path
+
+            recorded = self._fixture(path)
+            if recorded is not None:
+                library.count("fixture")
+                content_type = "text/html; charset=utf-8" if path.endswith(("/", ".html")) else "application/octet-stream"
+                self._send(200, recorded, content_type)
+                return
+
+            if path in ("/ads", "/ads/"):
+                library.count("listing")
+                body = LISTING_HTML.format(page_size=library.page_size).encode("utf-8")
+                self._send(200, body, "text/html; charset=utf-8")
+            elif path == "/api/ads":
+                library.count("api")
+                ads = library.ads_for(query.get("keyword", ""))
+                offset = int(query.get("offset", 0))
+                limit = int(query.get("limit", library.page_size))
+                payload = {"total": len(ads), "ads": ads[offset:offset + limit]}
+                self._send(200, json.dumps(payload).encode("utf-8"), "application/json")
+            elif path.startswith("/ads/detail"):
+                library.count("detail")
+                ad = library.find_ad(query.get("ad_id", "0"))
+                body = DETAIL_HTML.format(
+                    ad_id=html.escape(ad["ad_id"]),
+                    advertiser=html.escape(ad["advertiser_name"]),
+                    first_shown=ad["first_shown"],
+                    last_shown=ad["last_shown"],
+                ).encode("utf-8")
+                self._send(200, body, "text/html; charset=utf-8")
+            elif path.startswith("/cdn/video/"):
+                library.count("video")
+                self._send(200, FAKE_MP4, "video/mp4")
+            elif path.startswith("/cdn/img/"):
+                library.count("image")
+                self._send(200, FAKE_JPEG, "image/jpeg")
+            else:
+                self._send(404, b"not found", "text/plain")
+
+    return Handler
+
+
+class FakeAdLibraryServer:
+    """Arka plan thread'inde çalışan offline Ad Library sunucusu"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 total_ads: int = 60, page_size: int = 12, fixtures: Optional[str] = None):
+        self.library = FakeAdLibrary(total_ads=total_ads, page_size=page_size)
+        fixtures_path = Path(fixtures) if fixtures else None
+        self.httpd = ThreadingHTTPServer((host, port), make_handler(self.library, fixtures_path))
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeAdLibraryServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fake-ad-library", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FakeAdLibraryServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline TikTok Ad Library stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--total-ads", type=int, default=60, help="Keyword başına toplam reklam")
+    parser.add_argument("--page-size", type=int, default=12, help="'View more' başına reklam")
+    parser.add_argument("--fixtures", default=None, help="Kayıtlı sayfaların bulunduğu dizin")
+    args = parser.parse_args()
+
+    server = FakeAdLibraryServer(args.host, args.port, args.total_ads, args.page_size, args.fixtures)
+    print(f"Fake Ad Library: {server.base_url}/ads")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Hot-path microbenchmark'ları (saf Python fonksiyonlar)
+Usage:
+    python -m benchmarks.micro_benchmark --update-baseline   # baseline kaydet
+    python -m benchmarks.micro_benchmark                     # baseline ile karşılaştır
+
+Reklam başına veya network log mesajı başına çalışan fonksiyonlar, gerçekçi
+üretilmiş korpuslar (Türkçe reklam metinleri, CDN URL'leri, performance log
+mesajları) üzerinde ölçülür. Sonuçlar makine hızına göre kalibre edilir ve
+baseline'dan --threshold oranından fazla yavaşlayan fonksiyon varsa
+exit code 1 döner. Baseline dosyası yoksa (--update-baseline verilmeden)
+exit code 2: eksik baseline gate'i sessizce geçirmesin.
+
+Memoize edilen fonksiyonların (classify_media_url) cache'i her tekrardan önce
+temizlenir; üretimde URL'ler çoğunlukla tekildir, ölçüm cache hit'i değil
+gerçek sınıflandırma maliyetini göstermeli.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "micro_baseline.json"
+
+TR_WORDS = [
+    "kredi", "kartı", "faiz", "oranları", "hemen", "başvur", "dijital", "bankacılık",
+    "hayallerinizi", "gerçekleştirin", "kampanya", "puan", "taksit", "mobil", "uygulama",
+    "şimdi", "indir", "ücretsiz", "hesap", "aç", "yatırım", "fon", "döviz", "altın",
+    "İstanbul", "Türkiye", "güvenli", "ödeme", "cüzdan", "çekiliş", "fırsat", "özel",
+]
+ADVERTISERS = [
+    "TURKIYE GARANTI BANKASI ANONIM SIRKETI", "AKBANK TURK ANONIM SIRKETI",
+    "YAPI VE KREDI BANKASI ANONIM SIRKETI", "Papara", "İş Bankası", "Trendyol", "Getir",
+]
+CDN_HOSTS = [
+    "v16-webapp.tiktokcdn.com", "v19.tiktokcdn-us.com", "p16-sign-va.ibyteimg.com",
+    "sf16-website-login.neutral.ttwstatic.com", "v77.tiktokv.com", "library.tiktok.com",
+]
+PATHS = [
+    "/video/tos/alisg/tos-alisg-pve-0037c001/{id}/?a=1988&bti={id}&ch=0&cr=3&dr=0&lr=all&cd=0%7C0%7C0",
+    "/obj/tos-alisg-p-0037/{id}~tplv-noop.image",
+    "/tos-alisg-i-0000/{id}.mp4?x-expires=1700000000&x-signature=abc%3D",
+    "/img/tos-alisg-avt-0068/{id}~c5_100x100.jpeg",
+    "/static/js/main.{id}.js",
+    "/api/v1/ad/list?offset={id}&limit=12",
+    "/video/thumb/{id}_cover.jpg",
+]
+MIME_TYPES = ["video/mp4", "image/jpeg", "application/json", "text/javascript", "", "image/webp"]
+
+
+def build_corpora(size: int, seed: int = 7) -> Dict[str, list]:
+    """Tekrarlanabilir test korpusları üret"""
+    rng = random.Random(seed)
+
+    texts = []
+    for _ in range(size):
+        words = rng.choices(TR_WORDS, k=rng.randint(8, 40))
+        if rng.random() < 0.3:
+            words.insert(rng.randint(0, len(words)), "<b>" + rng.choice(TR_WORDS) + "</b>")
+        if rng.random() < 0.3:
+            words.append(f"https://www.{rng.choice(['garanti', 'akbank', 'papara'])}.com.tr/kampanya?id={rng.randint(1, 99999)}")
+        texts.append(("  ".join(words)) if rng.random() < 0.5 else " ".join(words))
+
+    urls = []
+    for _ in range(size):
+        path = rng.choice(PATHS).format(id=rng.randint(10 ** 15, 10 ** 16))
+        urls.append((f"https://{rng.choice(CDN_HOSTS)}{path}", rng.choice(MIME_TYPES)))
+
+    log_messages = []
+    for url, mime in urls:
+        method = rng.choice(["Network.responseReceived", "Network.requestWillBeSent",
+                             "Network.dataReceived", "Page.frameNavigated"])
+        if method == "Network.responseReceived":
+            params = {"requestId": "1.1", "response": {"url": url, "mimeType": mime, "status": 200}}
+        elif method == "Network.requestWillBeSent":
+            params = {"requestId": "1.1", "request": {"url": url, "method": "GET"}}
+        else:
+            params = {"requestId": "1.1", "dataLength": rng.randint(100, 90000)}
+        log_messages.append({
+            "level": "INFO",
+            "timestamp": 1700000000000,
+            "message": json.dumps({"message": {"method": method, "params": params}, "webview": "A1B2"}),
+        })
+
+    ad_datas = []
+    for i in range(size):
+        video = rng.random() < 0.6
+        ad_datas.append({
+            "advertiser_name": rng.choice(ADVERTISERS),
+            "ad_text": texts[i],
+            "ad_url": f"https://library.tiktok.com/ads/detail/?ad_id={rng.randint(10 ** 15, 10 ** 16)}",
+            "media_urls": [urls[i][0]] if rng.random() < 0.8 else [],
+            "raw_data": {"media_type": ("video" if video else "image") if rng.random() < 0.5 else ""},
+            "scrape_index": i,
+            "first_shown": "08/01/2025",
+            "last_shown": "09/30/2025",
+        })
+
+    return {"texts": texts, "urls": urls, "log_messages": log_messages, "ad_datas": ad_datas}
+
+
+def build_cases(corpora: Dict[str, list]) -> Dict[str, Callable[[], None]]:
+    """Ölçülecek fonksiyonları korpus üzerinde döngü olarak hazırla"""
+    from src.config.settings import settings
+    from src.utils.helpers import is_banking_related, clean_text, create_filename_safe, extract_urls_from_text
+    from src.scraper.tiktok_selenium_scraper import NetworkVideoExtractor
+    from src.scraper.network_capture import NetworkCapture
+    from src.scraper.tiktok_scraper import TikTokAdScraper
+
+    texts = corpora["texts"]
+    urls = corpora["urls"]
+    url_groups = [[u for u, _ in urls[i:i + 8]] for i in range(0, len(urls), 8)]
+    log_messages = corpora["log_messages"]
+    ad_datas = corpora["ad_datas"]
+    keywords = [k for k in settings.banking_keywords if k] or ["banka", "kredi", "kart", "hesap", "faiz"]
+    keywords = keywords + settings.turkish_banks
+
+    extractor = NetworkVideoExtractor(driver=None)
+    capture = NetworkCapture(driver=None)
+    ad_scraper = TikTokAdScraper(headless=True)
+    ads = [ad for ad in (ad_scraper._create_ad_from_selenium_data(d) for d in ad_datas) if ad]
+
+    def process_log_messages():
+        found: List[str] = []
+        for entry in log_messages:
+            extractor._process_network_message(json.loads(entry["message"]), found)
+
+    return {
+        "is_banking_related": lambda: [is_banking_related(t, keywords) for t in texts],
+        "clean_text": lambda: [clean_text(t) for t in texts],
+        "create_filename_safe": lambda: [create_filename_safe(t) for t in texts],
+        "extract_urls_from_text": lambda: [extract_urls_from_text(t) for t in texts],
+        "NetworkVideoExtractor._is_video_url": lambda: [extractor._is_video_url(u, m) for u, m in urls],
+        "NetworkVideoExtractor._select_best_video_url": lambda: [extractor._select_best_video_url(g) for g in url_groups],
+        "NetworkVideoExtractor._process_network_message": process_log_messages,
+        "NetworkCapture.parse_performance_logs": lambda: capture.parse_performance_logs(log_messages),
+        "TikTokAdScraper._compute_ad_hash": lambda: [ad_scraper._compute_ad_hash(ad) for ad in ads],
+        "TikTokAdScraper._create_ad_from_selenium_data": lambda: [ad_scraper._create_ad_from_selenium_data(d) for d in ad_datas],
+    }
+
+
+def _calibrate(repeats: int) -> float:
+    """Makine hızı referansı: sabit saf Python iş yükü (saniye)"""
+    def workload():
+        total = 0
+        data = {str(i): i for i in range(2000)}
+        for _ in range(20):
+            for key, value in data.items():
+                total += len(key) * value
+        return total
+    return _best_of(workload, repeats)
+
+
+def _reset_caches():
+    """Memoize edilmiş hot-path fonksiyonların cache'ini boşalt (ölçüm dışında)"""
+    from src.utils.media_urls import classify_media_url
+    classify_media_url.cache_clear()
+
+
+def _best_of(func: Callable[[], object], repeats: int, reset: Callable[[], None] = lambda: None) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        reset()
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(size: int, repeats: int) -> Tuple[float, Dict[str, float]]:
+    """Her fonksiyon için çağrı başına süre (mikrosaniye)"""
+    corpora = build_corpora(size)
+    cases = build_cases(corpora)
+    calibration = _calibrate(repeats)
+
+    results = {}
+    for name, func in cases.items():
+        func()  # warm-up (regex cache, import)
+        elapsed = _best_of(func, repeats, reset=_reset_caches)
+        # _select_best_video_url 8'li URL grupları üzerinde çalışır
+        calls = -(-size // 8) if "select_best" in name else size
+        results[name] = elapsed / calls * 1e6
+    return calibration, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path microbenchmark suite")
+    parser.add_argument("--size", type=int, default=2000, help="Korpus boyutu")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Baseline'a göre izin verilen yavaşlama oranı (1.25 = %%25)")
+    parser.add_argument("--update-baseline", action="store_true", help="Sonuçları baseline olarak kaydet")
+    args = parser.parse_args()
+
+    logger.remove()  # Ölçüm sırasında log çıktısı yazılmasın
+
+    baseline_path = Path(args.baseline)
+    if not args.update_baseline and not baseline_path.exists():
+        print(f"❌ Baseline bulunamadı: {baseline_path} (önce --update-baseline ile kaydedin)")
+        return 2
+
+    calibration, results = run(args.size, args.repeats)
+
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps({
+            "calibration_seconds": calibration,
+            "size": args.size,
+            "results_us_per_call": results,
+        }, indent=2), encoding="utf-8")
+        for name, us in results.items():
+            print(f"{name:<50} {us:>10.2f} µs/call")
+        print(f"Baseline kaydedildi: {baseline_path}")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    # Farklı makinelerde karşılaştırılabilirlik için kalibrasyon oranı ile ölçekle
+    scale = calibration / baseline["calibration_seconds"]
+    regressions = []
+    for name, us in results.items():
+        expected = baseline["results_us_per_call"].get(name)
+        if expected is None:
+            print(f"{name:<50} {us:>10.2f} µs/call  (yeni)")
+            continue
+        ratio = us / (expected * scale)
+        status = "REGRESSION" if ratio > args.threshold else "ok"
+        print(f"{name:<50} {us:>10.2f} µs/call  baseline={expected * scale:>9.2f}  x{ratio:.2f}  {status}")
+        if ratio > args.threshold:
+            regressions.append(name)
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} fonksiyon eşik (x{args.threshold}) üzerinde yavaşladı: {', '.join(regressions)}")
+        return 1
+    print("\n✅ Regression yok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,13 @@
 FastAPI server for TikTok scraper - N8N integration
 Windows compatible version
 """
+import time
+
+# Açılış süresi bu andan itibaren ölçülür (/ready, tiktok_startup_seconds)
+_BOOT_STARTED = time.perf_counter()
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
@@ -14,6 +18,8 @@ from loguru import logger
 import json
 import sys
 import os
+import asyncio
+import threading
 from pathlib import Path
 import traceback
 
@@ -25,8 +31,13 @@ if (current_dir / "src").exists():
     sys.path.insert(0, str(current_dir / "src"))
 
 try:
-    from src.scraper.tiktok_scraper import TikTokAdScraper
+    # Selenium'u çeken scraper modülleri burada import edilmez: açılışta arka planda ısıtılır
     from src.config.settings import settings
+    from src.utils.metrics import STARTUP_SECONDS, render_metrics
+    from src.utils.circuit_breaker import breakers
+    from src.utils.proxy_manager import proxy_pool
+    from src.utils.job_queue import JobQueue, STATE_DONE, STATE_DEAD, owner_prefix, worker_owner
+    from src.scraper.browser_supervisor import browser_supervisor
     logger.info("Successfully imported project modules")
     print("✅ Successfully imported project modules")
 except ImportError as e:
@@ -59,12 +70,34 @@ class ScrapeRequest(BaseModel):
     keywords: List[str] = Field(default=[])
     max_results: int = Field(default=50, ge=1, le=200)
     region: str = Field(default="TR")
+    regions: Optional[List[str]] = Field(default=None, max_length=20, description="Scrape several countries in one job (e.g. ['TR', 'AZ', 'GE']); overrides region. Regions run in parallel and share max_results and ad_id dedup")
     days_back: int = Field(default=7, ge=1, le=30)
     banking_only: bool = Field(default=True)
     headless: bool = Field(default=True)
     search_type: str = Field(default="keyword", description="'keyword' or 'advertiser' - keyword searches broadly, advertiser looks for exact company name")
     advertiser_blacklist: Optional[List[str]] = Field(default=None, description="Exclude advertisers containing these keywords (e.g., ['QNB', 'ING'])")
     advertiser_whitelist: Optional[List[str]] = Field(default=None, description="Only include advertisers containing these keywords (e.g., ['GARANTI', 'AKBANK'])")
+    deadline_seconds: Optional[float] = Field(default=None, gt=0, le=3600, description="Return partial results (truncated=true) before this many seconds")
+    job_id: Optional[str] = Field(default=None, max_length=200, description="Idempotency key: a retried request with the same id returns the stored result or resumes the queued job")
+
+# Kalıcı job kuyruğu: /scrape-tiktok istekleri buraya yazılır, worker thread'leri tüketir
+API_QUEUE = "api"
+job_queue: Optional[JobQueue] = None
+_stop_workers = threading.Event()
+
+# Readiness: açılış fazlarının süreleri; warmup bitince _ready set edilir
+_startup_phases: Dict[str, float] = {}
+_startup_error: Optional[str] = None
+_ready = threading.Event()
+# PREWARM_DRIVERS=true ise headless job'lar bu keep-alive pool'daki browser'ları kullanır
+driver_pool = None
+
+def _record_startup_phase(phase: str, started: float):
+    seconds = time.perf_counter() - started
+    _startup_phases[phase] = round(seconds, 3)
+    STARTUP_SECONDS.set(seconds, phase=phase)
+
+_record_startup_phase("imports", _BOOT_STARTED)
 
 class N8NAdResponse(BaseModel):
     """N8N-friendly ad response format"""
@@ -88,7 +121,7 @@ async def root():
     return {
         "message": "TikTok Banking Ad Intelligence API", 
         "status": "running",
-        "endpoints": ["/health", "/scrape-tiktok", "/test-scrape", "/turkish-banks"]
+        "endpoints": ["/health", "/ready", "/metrics", "/scrape-tiktok", "/jobs/{job_id}", "/test-scrape", "/turkish-banks"]
     }
 
 @app.get("/test-selenium")
@@ -114,7 +147,11 @@ async def health_check():
             "service": "TikTok Banking Ad Scraper",
             "version": "1.0.0",
             "settings_loaded": True,
-            "banking_keywords_count": len(settings.banking_keywords)
+            "banking_keywords_count": len(settings.banking_keywords),
+            "circuit_breakers": breakers.snapshot(),
+            "proxies": proxy_pool.snapshot(),
+            "job_queue": job_queue.stats() if job_queue else None,
+            "browsers": browser_supervisor.snapshot()
         }
     except Exception as e:
         import traceback
@@ -127,6 +164,329 @@ async def health_check():
         logger.error(f"Health check failed: {error_detail}")
         return error_detail
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: kuyruk açık, chromedriver çözülmüş ve (PREWARM_DRIVERS) browser'lar ısınmışsa 200
+
+    /health liveness'tır (process ayakta); deploy healthcheck'i trafiği /ready 200 dönünce açar.
+    """
+    body = {
+        "ready": _ready.is_set(),
+        "startup_phases": _startup_phases,
+        "prewarm_drivers": settings.prewarm_drivers,
+        "warm_drivers": len(driver_pool) if driver_pool is not None else 0,
+        "error": _startup_error,
+    }
+    return JSONResponse(body, status_code=200 if _ready.is_set() else 503)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint'i (faz süreleri, reklam/saniye, ban sayıları)"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+def run_scrape_request(request: ScrapeRequest, job_id: str, selenium_scraper=None) -> List[Dict[str, Any]]:
+    """Kuyruktan alınan scrape job'ını çalıştır, N8N ad listesini döndür
+
+    job_id checkpoint id'si olarak kullanılır: çöken process sonrası tekrar
+    dağıtılan job tamamlanmış keyword'leri yeniden taramaz. selenium_scraper
+    verilirse (pool'dan) açık browser kullanılır.
+    """
+    from src.scraper.tiktok_scraper import TikTokAdScraper
+    import json as json_log
+    # SMART KEYWORD FALLBACK: Eğer keyword yok ama whitelist varsa, whitelist'i keyword yap
+    keywords_to_use = request.keywords
+    if (not keywords_to_use or len(keywords_to_use) == 0) and request.advertiser_whitelist:
+        # Whitelist'teki uzun isimleri kısa keyword'lere map et
+        def extract_bank_keyword(advertiser_name: str) -> str:
+            """Uzun advertiser name'den kısa keyword çıkar"""
+            name_upper = advertiser_name.upper()
+            
+            # TAM İSİMLER (TikTok UI'dan alındı - tırnak ile exact match)
+            # TikTok sadece TAM ŞİRKET İSMİ ile eşleşiyor (A.Ş. / ANONIM SIRKETI dahil)
+            bank_mapping = {
+                # GARANTI - TAM İSİM
+                "GARANTI": "TURKIYE GARANTI BANKASI ANONIM SIRKETI",
+                "GARANTI BBVA": "TURKIYE GARANTI BANKASI ANONIM SIRKETI",
+                "GARANTI BANKASI": "TURKIYE GARANTI BANKASI ANONIM SIRKETI",
+                "TURKIYE GARANTI BANKASI": "TURKIYE GARANTI BANKASI ANONIM SIRKETI",
+                "TURKIYE GARANTI BANKASI ANONIM SIRKETI": "TURKIYE GARANTI BANKASI ANONIM SIRKETI",
+                # AKBANK - TAM İSİM
+                "AKBANK": "AKBANK TURK ANONIM SIRKETI",
+                "AKBANK T.A.S": "AKBANK TURK ANONIM SIRKETI",
+                "AKBANK TURK": "AKBANK TURK ANONIM SIRKETI",
+                "AKBANK TURK ANONIM SIRKETI": "AKBANK TURK ANONIM SIRKETI",
+                # YAPI KREDİ - TAM İSİM
+                "YAPI VE KREDI": "YAPI VE KREDI BANKASI ANONIM SIRKETI",
+                "YAPI KREDI": "YAPI VE KREDI BANKASI ANONIM SIRKETI",
+                "YAPIKREDI": "YAPI VE KREDI BANKASI ANONIM SIRKETI",
+                "KREDI BANKASI": "YAPI VE KREDI BANKASI ANONIM SIRKETI",
+                "YAPI VE KREDI BANKASI": "YAPI VE KREDI BANKASI ANONIM SIRKETI",
+                "YAPI VE KREDI BANKASI ANONIM SIRKETI": "YAPI VE KREDI BANKASI ANONIM SIRKETI",
+                # İŞ BANKASI - TAM İSİM (kullanıcı sağlarsa güncellenecek)
+                "IS BANKASI": "TURKIYE IS BANKASI",
+                "ISBANK": "TURKIYE IS BANKASI",
+                "TURKIYE IS BANKASI": "TURKIYE IS BANKASI",
+                # QNB - TAM İSİM (whitelist'te "QNB BANK ANONIM SIRKETI" olarak aranır)
+                "QNB BANK ANONIM SIRKETI": "QNB BANK ANONIM SIRKETI",
+                "QNB FINANSBANK": "QNB BANK ANONIM SIRKETI",
+                "QNB": "QNB BANK ANONIM SIRKETI",
+                # Diğer bankalar
+                "ING": "ING BANK",
+                "ING BANK": "ING BANK",
+                "DENIZBANK": "DENIZBANK",
+                "ZIRAAT": "ZIRAAT BANKASI",
+                "ZIRAAT BANKASI": "ZIRAAT BANKASI",
+                "HALKBANK": "HALKBANK",
+                "VAKIFBANK": "VAKIFBANK",
+                "VAKIF": "VAKIFBANK"
+            }
+            
+            # Mapping'de ara
+            for key, short_name in bank_mapping.items():
+                if key in name_upper:
+                    return short_name
+            
+            # Mapping bulunamazsa ilk anlamlı kelimeyi al
+            words = advertiser_name.lower().split()
+            # "turkiye", "anonim", "sirketi" gibi genel kelimeleri atla
+            skip_words = {"turkiye", "anonim", "sirketi", "turk", "limited", "inc", "bank"}
+            for word in words:
+                if word not in skip_words and len(word) > 3:
+                    return word
+            
+            # Hiçbiri yoksa lowercase yap
+            return advertiser_name.lower()
+        
+        keywords_to_use = [extract_bank_keyword(name) for name in request.advertiser_whitelist]
+        logger.info(f"⚡ SMART KEYWORD MAPPING: {request.advertiser_whitelist} → {keywords_to_use}")
+        
+        # #region agent log
+        try:
+            with open('/app/debug.log', 'a') as f:
+                f.write(json_log.dumps({
+                    "timestamp": int(time.time() * 1000),
+                    "location": "fastapi_server.py:199",
+                    "message": "Smart keyword mapping activated",
+                    "data": {
+                        "original_whitelist": request.advertiser_whitelist,
+                        "mapped_keywords": keywords_to_use,
+                        "mapping": dict(zip(request.advertiser_whitelist, keywords_to_use))
+                    },
+                    "sessionId": "debug-session",
+                    "runId": "test",
+                    "hypothesisId": "H4"
+                }) + '\n')
+        except: pass
+        # #endregion
+    
+    # Initialize scraper
+    scraper = TikTokAdScraper(headless=request.headless, selenium_scraper=selenium_scraper, driver_pool=driver_pool)
+    
+    # Execute scraping
+    logger.info(f"Scraping başlatılıyor: {request.max_results} maksimum reklam, search_type={request.search_type}")
+    if request.advertiser_blacklist:
+        logger.info(f"Advertiser blacklist: {request.advertiser_blacklist}")
+    if request.advertiser_whitelist:
+        logger.info(f"Advertiser whitelist: {request.advertiser_whitelist}")
+    
+    result = scraper.search_ads(
+        keywords=keywords_to_use,
+        max_results=request.max_results,
+        search_type=request.search_type,
+        advertiser_blacklist=request.advertiser_blacklist,
+        advertiser_whitelist=request.advertiser_whitelist,
+        deadline_seconds=request.deadline_seconds,
+        job_id=job_id,
+        region=request.region,
+        regions=request.regions,
+        days_back=request.days_back
+    )
+    # Çöken scrape (driver kurulamadı, tüm aramalar hata) boş sonuçla DONE olmasın: kuyruk tekrar dener / dead-letter
+    if result.errors and not result.total_ads:
+        raise RuntimeError(result.errors[-1])
+    
+    # #region agent log
+    try:
+        with open('/app/debug.log', 'a') as f:
+            f.write(json_log.dumps({
+                "timestamp": int(time.time() * 1000),
+                "location": "fastapi_server.py:210",
+                "message": "Scraping completed",
+                "data": {
+                    "keywords_used": keywords_to_use,
+                    "total_ads": result.total_ads,
+                    "banking_ads": result.banking_ads
+                },
+                "sessionId": "debug-session",
+                "runId": "test",
+                "hypothesisId": "H3"
+            }) + '\n')
+    except: pass
+    # #endregion
+    
+    # Convert to N8N format - RETURN ARRAY FOR N8N
+    n8n_ads = []
+    
+    for ad in scraper.scraped_ads:
+        # Filter banking ads if requested
+        if request.banking_only and not ad.is_banking_ad:
+            continue
+        
+        # Create N8N item
+        n8n_ad = {
+            "ad_id": ad.ad_id,
+            "advertiser_name": ad.advertiser_name or "Unknown",
+            "ad_text": ad.ad_text or "",
+            "media_type": ad.media_type.value,
+            "media_urls": ad.media_urls or [],
+            "is_banking_ad": ad.is_banking_ad,
+            "banking_keywords_found": ad.banking_keywords_found,
+            "scraped_at": ad.scraped_at.isoformat(),
+            "first_shown": ad.raw_data.get('first_shown'),
+            "last_shown": ad.raw_data.get('last_shown'),
+            "source_url": ad.source_url,
+            "region": ad.region,
+            
+            # N8N specific metadata
+            "n8n_meta": {
+                "media_count": len(ad.media_urls),
+                "has_video": ad.is_video(),
+                "has_image": ad.is_image(),
+                "is_banking": ad.is_banking_ad,
+                "processing_priority": "high" if ad.is_banking_ad else "normal",
+                "advertiser_slug": (ad.advertiser_name or "unknown").lower().replace(' ', '_'),
+                "keywords_count": len(ad.banking_keywords_found),
+                "video_url": ad.media_urls[0] if ad.media_urls and ad.is_video() else None,
+                "image_url": ad.media_urls[0] if ad.media_urls and ad.is_image() else None,
+                "banking_score": len(ad.banking_keywords_found) * 10,
+                "content_length": len(ad.ad_text) if ad.ad_text else 0
+            },
+            
+            # Summary for N8N (added to each item)
+            "scrape_summary": {
+                "total_ads": result.total_ads,
+                "banking_ads": result.banking_ads,
+                "video_ads": result.video_ads,
+                "image_ads": result.image_ads,
+                "duration_seconds": result.duration_seconds or 0.0,
+                "truncated": result.truncated,
+                "performance": result.performance_summary()
+            }
+        }
+        n8n_ads.append(n8n_ad)
+    
+    logger.info(f"N8N response ready: {len(n8n_ads)} ads")
+    
+    return n8n_ads
+
+def _run_job(job):
+    """Headless job'lar ısınmış pool browser'ında, diğerleri yeni Chrome'da çalışır"""
+    request = ScrapeRequest(**job.payload)
+    if driver_pool is None or not request.headless:
+        return run_scrape_request(request, job.id)
+    worker = driver_pool.checkout()
+    try:
+        return run_scrape_request(request, job.id, selenium_scraper=worker.scraper)
+    except Exception:
+        # Yarım kalmış sayfa/driver durumu sonraki job'a taşınmasın
+        worker.scraper.shutdown()
+        raise
+    finally:
+        driver_pool.checkin(worker)
+
+def _queue_worker(owner: str):
+    """Kuyruktan lease al, heartbeat ile çalıştır, sonucu kuyruğa yaz"""
+    # Warmup bitmeden (chromedriver çözülmeden) job alınmaz
+    while not _ready.wait(1.0):
+        if _stop_workers.is_set():
+            return
+    while not _stop_workers.is_set():
+        try:
+            job = job_queue.lease(API_QUEUE, owner)
+        except Exception as e:
+            logger.error(f"Job kuyruğu okunamadı: {e}")
+            _stop_workers.wait(5.0)
+            continue
+        if job is None:
+            _stop_workers.wait(1.0)
+            continue
+
+        logger.info(f"Job {job.id} başladı (deneme {job.attempts}/{job.max_attempts})")
+        try:
+            with job_queue.keep_leased(job, owner):
+                n8n_ads = _run_job(job)
+        except Exception as e:
+            logger.error(f"Scraping failed: {e}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            job_queue.fail(job.id, owner, f"{type(e).__name__}: {e}", retry_delay=min(2 ** job.attempts, 60))
+            continue
+        if not job_queue.complete(job.id, owner, n8n_ads):
+            logger.warning(f"Job {job.id} lease'i kaybedildi, sonuç yazılmadı")
+
+def _warm_up():
+    """Scraper modülünü import et, chromedriver'ı çöz, istenirse browser'ları başlat
+
+    Event loop'u bloklamaz: /health açılıştan hemen sonra cevap verir, /ready
+    bu fonksiyon bitince 200 döner.
+    """
+    global driver_pool, _startup_error
+    try:
+        started = time.perf_counter()
+        from src.scraper import tiktok_scraper  # noqa: F401  (selenium import'u)
+        from src.scraper.chromedriver import chromedriver_path
+        chromedriver_path()
+        _record_startup_phase("chromedriver", started)
+
+        if settings.prewarm_drivers:
+            from src.scraper.driver_pool import DriverPool
+            started = time.perf_counter()
+            pool = DriverPool(max(1, settings.queue_workers), headless=True)
+            if pool.warm() == 0:
+                pool.shutdown()
+                raise RuntimeError("hiçbir browser başlatılamadı")
+            driver_pool = pool
+            _record_startup_phase("prewarm", started)
+    except Exception as e:
+        # Warmup hatası servisi durdurmaz: job'lar eskisi gibi kendi Chrome'unu açar
+        _startup_error = f"{type(e).__name__}: {e}"
+        logger.error(f"Açılış warmup'ı başarısız: {_startup_error}")
+    _record_startup_phase("ready", _BOOT_STARTED)
+    _ready.set()
+    logger.info(f"🚀 Servis hazır: {_startup_phases['ready']:.2f}s ({_startup_phases})")
+
+@app.on_event("startup")
+async def start_queue_workers():
+    global job_queue
+    started = time.perf_counter()
+    job_queue = JobQueue()
+    # Aynı container'da çöken önceki process'in yarım job'ları hemen tekrar dağıtılır
+    job_queue.release_owner(API_QUEUE, owner_prefix("api"))
+    _record_startup_phase("job_queue", started)
+    owner = worker_owner("api")
+    for index in range(max(1, settings.queue_workers)):
+        threading.Thread(target=_queue_worker, args=(f"{owner}/{index}",), name=f"queue-worker-{index}", daemon=True).start()
+    logger.info(f"Job kuyruğu hazır: {job_queue.path} ({settings.queue_workers} worker)")
+    threading.Thread(target=_warm_up, name="warmup", daemon=True).start()
+    # Önceki process'ten / hata ile çıkan handler'lardan kalan Chrome'lar ve geçici profiller
+    browser_supervisor.start()
+
+@app.on_event("shutdown")
+async def stop_queue_workers():
+    # Çalışan job'ın lease'i kalır, sonraki açılışta tekrar kuyruğa alınır
+    _stop_workers.set()
+    browser_supervisor.stop()
+    if driver_pool is not None:
+        driver_pool.shutdown()
+
+async def _wait_for_job(job_id: str, timeout: float):
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    while True:
+        job = job_queue.get(job_id)
+        if job.state in (STATE_DONE, STATE_DEAD) or loop.time() - started >= timeout:
+            return job
+        await asyncio.sleep(1.0)
+
 @app.post("/scrape-tiktok")
 async def scrape_tiktok_ads(request: ScrapeRequest):
     """
@@ -157,195 +517,41 @@ async def scrape_tiktok_ads(request: ScrapeRequest):
     except: pass
     # #endregion
     
-    try:
-        # SMART KEYWORD FALLBACK: Eğer keyword yok ama whitelist varsa, whitelist'i keyword yap
-        keywords_to_use = request.keywords
-        if (not keywords_to_use or len(keywords_to_use) == 0) and request.advertiser_whitelist:
-            # Whitelist'teki uzun isimleri kısa keyword'lere map et
-            def extract_bank_keyword(advertiser_name: str) -> str:
-                """Uzun advertiser name'den kısa keyword çıkar"""
-                name_upper = advertiser_name.upper()
-                
-                # TAM İSİMLER (TikTok UI'dan alındı - tırnak ile exact match)
-                # TikTok sadece TAM ŞİRKET İSMİ ile eşleşiyor (A.Ş. / ANONIM SIRKETI dahil)
-                bank_mapping = {
-                    # GARANTI - TAM İSİM
-                    "GARANTI": "TURKIYE GARANTI BANKASI ANONIM SIRKETI",
-                    "GARANTI BBVA": "TURKIYE GARANTI BANKASI ANONIM SIRKETI",
-                    "GARANTI BANKASI": "TURKIYE GARANTI BANKASI ANONIM SIRKETI",
-                    "TURKIYE GARANTI BANKASI": "TURKIYE GARANTI BANKASI ANONIM SIRKETI",
-                    "TURKIYE GARANTI BANKASI ANONIM SIRKETI": "TURKIYE GARANTI BANKASI ANONIM SIRKETI",
-                    # AKBANK - TAM İSİM
-                    "AKBANK": "AKBANK TURK ANONIM SIRKETI",
-                    "AKBANK T.A.S": "AKBANK TURK ANONIM SIRKETI",
-                    "AKBANK TURK": "AKBANK TURK ANONIM SIRKETI",
-                    "AKBANK TURK ANONIM SIRKETI": "AKBANK TURK ANONIM SIRKETI",
-                    # YAPI KREDİ - TAM İSİM
-                    "YAPI VE KREDI": "YAPI VE KREDI BANKASI ANONIM SIRKETI",
-                    "YAPI KREDI": "YAPI VE KREDI BANKASI ANONIM SIRKETI",
-                    "YAPIKREDI": "YAPI VE KREDI BANKASI ANONIM SIRKETI",
-                    "KREDI BANKASI": "YAPI VE KREDI BANKASI ANONIM SIRKETI",
-                    "YAPI VE KREDI BANKASI": "YAPI VE KREDI BANKASI ANONIM SIRKETI",
-                    "YAPI VE KREDI BANKASI ANONIM SIRKETI": "YAPI VE KREDI BANKASI ANONIM SIRKETI",
-                    # İŞ BANKASI - TAM İSİM (kullanıcı sağlarsa güncellenecek)
-                    "IS BANKASI": "TURKIYE IS BANKASI",
-                    "ISBANK": "TURKIYE IS BANKASI",
-                    "TURKIYE IS BANKASI": "TURKIYE IS BANKASI",
-                    # QNB - TAM İSİM (whitelist'te "QNB BANK ANONIM SIRKETI" olarak aranır)
-                    "QNB BANK ANONIM SIRKETI": "QNB BANK ANONIM SIRKETI",
-                    "QNB FINANSBANK": "QNB BANK ANONIM SIRKETI",
-                    "QNB": "QNB BANK ANONIM SIRKETI",
-                    # Diğer bankalar
-                    "ING": "ING BANK",
-                    "ING BANK": "ING BANK",
-                    "DENIZBANK": "DENIZBANK",
-                    "ZIRAAT": "ZIRAAT BANKASI",
-                    "ZIRAAT BANKASI": "ZIRAAT BANKASI",
-                    "HALKBANK": "HALKBANK",
-                    "VAKIFBANK": "VAKIFBANK",
-                    "VAKIF": "VAKIFBANK"
-                }
-                
-                # Mapping'de ara
-                for key, short_name in bank_mapping.items():
-                    if key in name_upper:
-                        return short_name
-                
-                # Mapping bulunamazsa ilk anlamlı kelimeyi al
-                words = advertiser_name.lower().split()
-                # "turkiye", "anonim", "sirketi" gibi genel kelimeleri atla
-                skip_words = {"turkiye", "anonim", "sirketi", "turk", "limited", "inc", "bank"}
-                for word in words:
-                    if word not in skip_words and len(word) > 3:
-                        return word
-                
-                # Hiçbiri yoksa lowercase yap
-                return advertiser_name.lower()
-            
-            keywords_to_use = [extract_bank_keyword(name) for name in request.advertiser_whitelist]
-            logger.info(f"⚡ SMART KEYWORD MAPPING: {request.advertiser_whitelist} → {keywords_to_use}")
-            
-            # #region agent log
-            try:
-                with open('/app/debug.log', 'a') as f:
-                    f.write(json_log.dumps({
-                        "timestamp": int(time.time() * 1000),
-                        "location": "fastapi_server.py:199",
-                        "message": "Smart keyword mapping activated",
-                        "data": {
-                            "original_whitelist": request.advertiser_whitelist,
-                            "mapped_keywords": keywords_to_use,
-                            "mapping": dict(zip(request.advertiser_whitelist, keywords_to_use))
-                        },
-                        "sessionId": "debug-session",
-                        "runId": "test",
-                        "hypothesisId": "H4"
-                    }) + '\n')
-            except: pass
-            # #endregion
-        
-        # Initialize scraper
-        scraper = TikTokAdScraper(headless=request.headless)
-        
-        # Execute scraping
-        logger.info(f"Scraping başlatılıyor: {request.max_results} maksimum reklam, search_type={request.search_type}")
-        if request.advertiser_blacklist:
-            logger.info(f"Advertiser blacklist: {request.advertiser_blacklist}")
-        if request.advertiser_whitelist:
-            logger.info(f"Advertiser whitelist: {request.advertiser_whitelist}")
-        
-        result = scraper.search_ads(
-            keywords=keywords_to_use,
-            max_results=request.max_results,
-            search_type=request.search_type,
-            advertiser_blacklist=request.advertiser_blacklist,
-            advertiser_whitelist=request.advertiser_whitelist
-        )
-        
-        # #region agent log
-        try:
-            with open('/app/debug.log', 'a') as f:
-                f.write(json_log.dumps({
-                    "timestamp": int(time.time() * 1000),
-                    "location": "fastapi_server.py:210",
-                    "message": "Scraping completed",
-                    "data": {
-                        "keywords_used": keywords_to_use,
-                        "total_ads": result.total_ads,
-                        "banking_ads": result.banking_ads
-                    },
-                    "sessionId": "debug-session",
-                    "runId": "test",
-                    "hypothesisId": "H3"
-                }) + '\n')
-        except: pass
-        # #endregion
-        
-        # Convert to N8N format - RETURN ARRAY FOR N8N
-        n8n_ads = []
-        
-        for ad in scraper.scraped_ads:
-            # Filter banking ads if requested
-            if request.banking_only and not ad.is_banking_ad:
-                continue
-            
-            # Create N8N item
-            n8n_ad = {
-                "ad_id": ad.ad_id,
-                "advertiser_name": ad.advertiser_name or "Unknown",
-                "ad_text": ad.ad_text or "",
-                "media_type": ad.media_type.value,
-                "media_urls": ad.media_urls or [],
-                "is_banking_ad": ad.is_banking_ad,
-                "banking_keywords_found": ad.banking_keywords_found,
-                "scraped_at": ad.scraped_at.isoformat(),
-                "first_shown": ad.raw_data.get('first_shown'),
-                "last_shown": ad.raw_data.get('last_shown'),
-                "source_url": ad.source_url,
-                
-                # N8N specific metadata
-                "n8n_meta": {
-                    "media_count": len(ad.media_urls),
-                    "has_video": ad.is_video(),
-                    "has_image": ad.is_image(),
-                    "is_banking": ad.is_banking_ad,
-                    "processing_priority": "high" if ad.is_banking_ad else "normal",
-                    "advertiser_slug": (ad.advertiser_name or "unknown").lower().replace(' ', '_'),
-                    "keywords_count": len(ad.banking_keywords_found),
-                    "video_url": ad.media_urls[0] if ad.media_urls and ad.is_video() else None,
-                    "image_url": ad.media_urls[0] if ad.media_urls and ad.is_image() else None,
-                    "banking_score": len(ad.banking_keywords_found) * 10,
-                    "content_length": len(ad.ad_text) if ad.ad_text else 0
-                },
-                
-                # Summary for N8N (added to each item)
-                "scrape_summary": {
-                    "total_ads": result.total_ads,
-                    "banking_ads": result.banking_ads,
-                    "video_ads": result.video_ads,
-                    "image_ads": result.image_ads,
-                    "duration_seconds": result.duration_seconds or 0.0
-                }
-            }
-            n8n_ads.append(n8n_ad)
-        
-        logger.info(f"N8N response ready: {len(n8n_ads)} ads")
-        
+    # Aynı job_id ile tekrar gelen istek yeni iş açmaz: bitmişse saklanan sonuç döner
+    job = job_queue.enqueue(request.dict(), queue=API_QUEUE, job_id=request.job_id)
+    job = await _wait_for_job(job.id, settings.job_wait_timeout_seconds)
+
+    if job.state == STATE_DONE:
         # Return array directly for N8N
-        return n8n_ads
-        
-    except Exception as e:
-        logger.error(f"Scraping failed: {e}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
-        
+        return job.result
+    if job.state == STATE_DEAD:
         raise HTTPException(
             status_code=500,
             detail={
-                "error": str(e),
-                "type": type(e).__name__,
-                "success": False
+                "error": job.error,
+                "type": "JobFailed",
+                "success": False,
+                "job_id": job.id,
+                "attempts": job.attempts
             }
         )
+    # Hâlâ çalışıyor: sonucu GET /jobs/{job_id} veya aynı job_id ile tekrar istek verir
+    return JSONResponse(status_code=202, content={"job_id": job.id, "state": job.state, "success": False})
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Kuyruktaki job'ın durumu ve (bittiyse) sonucu"""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail={"error": "job not found", "job_id": job_id})
+    return job.dict()
+
+@app.post("/jobs/{job_id}/requeue")
+async def requeue_job(job_id: str):
+    """Dead-letter'daki job'ı deneme hakları sıfırlanarak tekrar kuyruğa al"""
+    if not job_queue.requeue(job_id):
+        raise HTTPException(status_code=409, detail={"error": "job is not dead-lettered", "job_id": job_id})
+    return {"job_id": job_id, "state": "queued"}
 
 @app.get("/turkish-banks")
 async def get_turkish_banks():
@@ -360,6 +566,7 @@ async def get_turkish_banks():
 async def test_scrape():
     """Quick test endpoint for debugging"""
     try:
+        from src.scraper.tiktok_scraper import TikTokAdScraper
         scraper = TikTokAdScraper(headless=True)
         result = scraper.search_ads(keywords=["garanti"], max_results=3)
         
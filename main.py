@@ -1,5 +1,6 @@
 import sys
 import os
+import argparse
 from pathlib import Path
 from loguru import logger
 from datetime import datetime
@@ -34,9 +35,65 @@ def setup_logging():
         encoding="utf-8"
     )
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='TikTok Ad Scraper')
+    parser.add_argument('--batch', action='store_true',
+                        help='Batch crawl: tüm bankalar + keyword seti, her days_back penceresi için')
+    parser.add_argument('--manifest', help='Batch job manifest (JSON); verilmezse banka × keyword × days_back')
+    parser.add_argument('--keywords', default='banka,kredi,kart,finans', help='Virgülle ayrılmış keyword\'ler')
+    parser.add_argument('--days-back', default='30', help='Virgülle ayrılmış days_back pencereleri (örn: 7,30)')
+    parser.add_argument('--max-results', type=int, default=None, help='Entry başına maksimum reklam')
+    parser.add_argument('--workers', type=int, default=None, help='Paralel scraper worker sayısı')
+    parser.add_argument('--retries', type=int, default=None, help='Entry başına tekrar deneme sayısı')
+    parser.add_argument('--output-dir', default=None, help='Shard ve rapor dosyalarının klasörü')
+    return parser.parse_args()
+
+def run_batch(args) -> int:
+    """Batch modu: manifest'i worker pool ile çalıştır ve aggregate rapor yazdır"""
+    from src.scraper.batch import BatchRunner, build_manifest, load_manifest
+    
+    if args.manifest:
+        entries = load_manifest(args.manifest)
+        if args.max_results:
+            for entry in entries:
+                entry.max_results = args.max_results
+    else:
+        entries = build_manifest(
+            keywords=[k.strip() for k in args.keywords.split(',') if k.strip()],
+            days_back=[int(d) for d in args.days_back.split(',') if d.strip()],
+            max_results=args.max_results
+        )
+    
+    runner = BatchRunner(workers=args.workers, retries=args.retries, output_dir=args.output_dir)
+    report = runner.run(entries)
+    
+    print("\n" + "="*50)
+    print("📦 BATCH RAPORU")
+    print("="*50)
+    print(f"📋 Entry: {report['entries']} (✅ {report['succeeded']} / ❌ {report['failed']}, tekrar denenen: {report['retried']})")
+    print(f"🎯 Toplam Reklam: {report['total_ads']} (tekil: {report['unique_ads']}, banking: {report['banking_ads']})")
+    print(f"⏱️  Süre: {report['wall_seconds']:.2f} saniye, {report['workers']} worker")
+    print(f"🚀 Throughput: {report['ads_per_second']} reklam/sn, {report['entries_per_minute']} entry/dk")
+    print(f"💾 Çıktı: {report['output_dir']}")
+    if report['failures']:
+        print("\n⚠️  BAŞARISIZ ENTRY'LER:")
+        for failure in report['failures']:
+            print(f"  • {failure['entry_id']} ({failure['attempts']} deneme): {failure['error']}")
+    print("="*50)
+    
+    return 1 if report['failed'] else 0
+
 def main():
     """Ana uygulama fonksiyonu"""
+    args = parse_args()
     setup_logging()
+    
+    if args.batch:
+        try:
+            return run_batch(args)
+        except KeyboardInterrupt:
+            logger.info("❌ Kullanıcı tarafından durduruldu")
+            return 1
     logger.info("🚀 TikTok Ad Scraper başlatılıyor...")
     
     try:
@@ -45,13 +102,14 @@ def main():
         logger.info("Scraper oluşturuldu")
         
         # Bankacılık anahtar kelimeleri ile ara
-        banking_keywords = ["banka", "kredi", "kart", "finans"]
+        banking_keywords = [k.strip() for k in args.keywords.split(',') if k.strip()]
         logger.info(f"Arama anahtar kelimeleri: {banking_keywords}")
         
         # Scraping'i başlat
         result = scraper.search_ads(
             keywords=banking_keywords,
-            max_results=settings.tiktok_max_ads_per_search
+            max_results=args.max_results or settings.tiktok_max_ads_per_search,
+            days_back=int(args.days_back.split(',')[0])
         )
         
         # Sonuçları göster
@@ -2,81 +2,230 @@
 """
 N8N TikTok Ad Scraper Wrapper
 Usage: python n8n_tiktok_scraper.py --keywords "banka,kredi" --max-results 50
+
+Daemon modu (Chrome ve import'lar sıcak kalır):
+    python n8n_tiktok_scraper.py --daemon                 # Unix socket sunucusu
+    python n8n_tiktok_scraper.py --client --keywords ...  # İşi daemon'a gönder
+Client modu daemon'a ulaşamazsa işi kendi process'inde çalıştırır.
 """
 
+import os
 import sys
 import json
 import argparse
+import socket
 from pathlib import Path
+from typing import Optional
 
-# Proje modüllerini import et
+# Proje modüllerini import et (selenium/pydantic import'ları sadece scraping yapan
+# process'te yüklenir, client modu hafif kalır)
 sys.path.append(str(Path(__file__).parent))
-from src.config.settings import settings
-from src.scraper.tiktok_scraper import TikTokAdScraper
+
+DEFAULT_SOCKET_PATH = os.getenv("SCRAPER_DAEMON_SOCKET", "/tmp/tiktok_scraper.sock")
+CHUNK_SIZE = 64 * 1024
+
+
+def build_output(scraper, result, output_format: str):
+    """Scraping sonucunu N8N / JSON çıktı formatına çevir"""
+    if output_format == 'n8n':
+        # N8N'nin beklediği format: array of objects
+        n8n_output = []
+        scrape_summary = {
+            'total_ads': result.total_ads,
+            'banking_ads': result.banking_ads,
+            'duration_seconds': result.duration_seconds,
+            'truncated': result.truncated,
+            'performance': result.performance_summary()
+        }
+
+        for ad in scraper.scraped_ads:
+            ad_dict = ad.dict()
+
+            # N8N için ek meta bilgiler
+            ad_dict['n8n_meta'] = {
+                'media_count': len(ad_dict.get('media_urls', [])),
+                'has_video': ad.is_video(),
+                'has_image': ad.is_image(),
+                'is_banking': ad.is_banking_ad,
+                'processing_priority': 'high' if ad.is_banking_ad else 'normal'
+            }
+            ad_dict['scrape_summary'] = scrape_summary
+
+            n8n_output.append(ad_dict)
+
+        return n8n_output
+
+    # Standard JSON format
+    return {
+        'summary': {
+            'total_ads': result.total_ads,
+            'banking_ads': result.banking_ads,
+            'video_ads': result.video_ads,
+            'image_ads': result.image_ads,
+            'duration_seconds': result.duration_seconds,
+            'truncated': result.truncated,
+            'performance': result.performance_summary()
+        },
+        'ads': [ad.dict() for ad in scraper.scraped_ads]
+    }
+
+
+def error_output(e: Exception) -> dict:
+    """N8N error format"""
+    return {
+        'error': True,
+        'message': str(e),
+        'type': type(e).__name__
+    }
+
+
+def run_job(job: dict, selenium_scraper=None) -> str:
+    """İşi çalıştır ve çıktı JSON'unu döndür (hata durumunda error JSON)"""
+    try:
+        from src.scraper.tiktok_scraper import TikTokAdScraper
+
+        # Her job yeni TikTokAdScraper (sonuç listesi ve hash'ler job'a özel),
+        # daemon'da açık Selenium driver paylaşılır
+        scraper = TikTokAdScraper(headless=True, selenium_scraper=selenium_scraper)  # N8N'de headless
+        result = scraper.search_ads(
+            job['keywords'], job['max_results'], deadline_seconds=job.get('deadline_seconds'),
+            job_id=job.get('job_id'), regions=job.get('regions')
+        )
+        output = build_output(scraper, result, job.get('output_format', 'n8n'))
+        return json.dumps(output, ensure_ascii=False, default=str)
+    except Exception as e:
+        return json.dumps(error_output(e))
+
+
+def is_error(payload: str) -> bool:
+    return payload.startswith('{"error": true')
+
+
+def serve(socket_path: str):
+    """Daemon: Unix socket üzerinden newline-delimited JSON job'ları sırayla çalıştır
+
+    Her bağlantı bir job: istek satırı {"keywords": [...], "max_results": N, ...},
+    yanıt tek satır çıktı JSON'u. Chrome job'lar arasında açık kalır.
+    """
+    import signal
+    import socketserver
+    from loguru import logger
+    from src.scraper.tiktok_selenium_scraper import TikTokSeleniumScraper
+    from src.scraper.browser_supervisor import browser_supervisor
+
+    # Öldürülen önceki CLI/daemon çalıştırmalarından kalan Chrome'lar toplanır
+    browser_supervisor.start()
+    selenium_scraper = TikTokSeleniumScraper(headless=True, keep_alive=True)
+    # Pre-warm: chromedriver çözümlemesi + Chrome başlatma ilk job'dan önce
+    if not selenium_scraper.setup_driver():
+        logger.warning("Daemon: WebDriver ön ısıtması başarısız, ilk job'da tekrar denenecek")
+
+    class JobHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                payload = json.dumps(error_output(e))
+            else:
+                logger.info(f"Daemon job: {job.get('keywords')} (max {job.get('max_results')})")
+                payload = run_job(job, selenium_scraper)
+            self.wfile.write(payload.encode('utf-8') + b'\n')
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)  # Önceki process'ten kalan socket
+    server = socketserver.UnixStreamServer(socket_path, JobHandler)
+    os.chmod(socket_path, 0o600)
+
+    def stop(signum, frame):
+        raise SystemExit(0)
+    signal.signal(signal.SIGTERM, stop)
+
+    logger.info(f"Scraper daemon hazır: {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        selenium_scraper.shutdown()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def send_job(job: dict, socket_path: str, out=None) -> Optional[bool]:
+    """Client: job'ı daemon'a gönder ve yanıtı geldikçe stdout'a yaz
+
+    Daemon'a bağlanılamazsa None döner. Aksi halde job başarılı mı döner.
+    """
+    out = out or sys.stdout.buffer
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        sys.stderr.write(f"Daemon'a bağlanılamadı ({socket_path}: {e}), iş bu process'te çalışacak\n")
+        return None
+
+    with sock:
+        sock.sendall(json.dumps(job).encode('utf-8') + b'\n')
+        head = b''
+        while True:
+            chunk = sock.recv(CHUNK_SIZE)
+            if not chunk:
+                break
+            if len(head) < 16:
+                head += chunk[:16]
+            out.write(chunk)
+        out.flush()
+    return bool(head) and not is_error(head.decode('utf-8', 'replace'))
+
 
 def main():
     parser = argparse.ArgumentParser(description='TikTok Ad Scraper for N8N')
-    parser.add_argument('--keywords', default='banka,kredi,kart,finans', 
+    parser.add_argument('--keywords', default='banka,kredi,kart,finans',
                        help='Comma-separated keywords')
     parser.add_argument('--max-results', type=int, default=100,
                        help='Maximum number of ads to scrape')
     parser.add_argument('--output-format', choices=['json', 'n8n'], default='n8n',
                        help='Output format')
-    
+    parser.add_argument('--deadline-seconds', type=float, default=None,
+                       help='Return partial results before this many seconds')
+    parser.add_argument('--job-id', default=None,
+                       help='Checkpoint progress under this id; rerunning with the same id resumes')
+    parser.add_argument('--regions', default=None,
+                       help='Comma-separated country codes scraped in parallel (default: TIKTOK_COUNTRY)')
+    parser.add_argument('--daemon', action='store_true',
+                       help='Run as a long-lived scraper daemon on a Unix socket')
+    parser.add_argument('--client', action='store_true',
+                       help='Send the job to a running daemon (falls back to in-process)')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH,
+                       help='Daemon Unix socket path')
+
     args = parser.parse_args()
-    
-    try:
-        # Scraper'ı çalıştır
-        scraper = TikTokAdScraper(headless=True)  # N8N'de headless
-        keywords = args.keywords.split(',')
-        
-        result = scraper.search_ads(keywords, args.max_results)
-        
-        # N8N formatında output
-        if args.output_format == 'n8n':
-            # N8N'nin beklediği format: array of objects
-            n8n_output = []
-            
-            for ad in scraper.scraped_ads:
-                ad_dict = ad.dict()
-                
-                # N8N için ek meta bilgiler
-                ad_dict['n8n_meta'] = {
-                    'media_count': len(ad_dict.get('media_urls', [])),
-                    'has_video': ad.is_video(),
-                    'has_image': ad.is_image(),
-                    'is_banking': ad.is_banking_ad,
-                    'processing_priority': 'high' if ad.is_banking_ad else 'normal'
-                }
-                
-                n8n_output.append(ad_dict)
-            
-            # N8N output
-            print(json.dumps(n8n_output, ensure_ascii=False, default=str))
-            
-        else:
-            # Standard JSON format
-            output = {
-                'summary': {
-                    'total_ads': result.total_ads,
-                    'banking_ads': result.banking_ads,
-                    'video_ads': result.video_ads,
-                    'image_ads': result.image_ads,
-                    'duration_seconds': result.duration_seconds
-                },
-                'ads': [ad.dict() for ad in scraper.scraped_ads]
-            }
-            print(json.dumps(output, ensure_ascii=False, default=str))
-            
-    except Exception as e:
-        # N8N error format
-        error_output = {
-            'error': True,
-            'message': str(e),
-            'type': type(e).__name__
-        }
-        print(json.dumps(error_output))
+
+    if args.daemon:
+        serve(args.socket)
+        return
+
+    job = {
+        'keywords': args.keywords.split(','),
+        'max_results': args.max_results,
+        'output_format': args.output_format,
+        'deadline_seconds': args.deadline_seconds,
+        'job_id': args.job_id,
+        'regions': args.regions.split(',') if args.regions else None,
+    }
+
+    if args.client:
+        ok = send_job(job, args.socket)
+        if ok is not None:
+            sys.exit(0 if ok else 1)
+
+    # Scraper'ı bu process'te çalıştır
+    payload = run_job(job)
+    print(payload)
+    if is_error(payload):
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
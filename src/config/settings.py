@@ -17,12 +17,21 @@ class Settings(BaseSettings):
     
     # Proxy Settings
     use_proxies: bool = os.getenv("USE_PROXIES", "false").lower() == "true"
+    # Browser'ın proxy'si bu kadar job'dan sonra (veya proxy sağlıksızlaşınca) değiştirilir
     proxy_rotation_interval: int = int(os.getenv("PROXY_ROTATION_INTERVAL", "10"))
+    # Virgüllü liste; str tutulur (pydantic-settings List[str] env'ini JSON olarak parse eder)
+    proxy_list: str = os.getenv("PROXY_LIST", "")
+    proxy_file: str = os.getenv("PROXY_FILE", "")
+    proxy_stats_window: int = int(os.getenv("PROXY_STATS_WINDOW", "50"))
     max_retries: int = int(os.getenv("MAX_RETRIES", "3"))
     
     # Rate Limiting
     requests_per_minute: int = int(os.getenv("REQUESTS_PER_MINUTE", "30"))
     delay_between_requests: int = int(os.getenv("DELAY_BETWEEN_REQUESTS", "2"))
+    # Token bucket: CDN (HEAD/media) limiti, anlık burst ve process'ler arası ortak state dosyası
+    cdn_requests_per_minute: int = int(os.getenv("CDN_REQUESTS_PER_MINUTE", "120"))
+    rate_limit_burst: float = float(os.getenv("RATE_LIMIT_BURST", "3"))
+    rate_limit_state_path: str = os.getenv("RATE_LIMIT_STATE_PATH", "data/rate_limit.json")
     
     # Database
     db_type: str = os.getenv("DB_TYPE", "sqlite")
@@ -40,6 +49,82 @@ class Settings(BaseSettings):
     raw_data_path: str = os.getenv("RAW_DATA_PATH", "data\\raw")
     processed_data_path: str = os.getenv("PROCESSED_DATA_PATH", "data\\processed")
     
+    # Debug Artifacts (page source, screenshot, network log)
+    debug_artifacts_enabled: bool = os.getenv("DEBUG_ARTIFACTS_ENABLED", "true").lower() == "true"
+    debug_artifacts_path: str = os.getenv("DEBUG_ARTIFACTS_PATH", "data/debug")
+    debug_artifacts_max_mb: int = int(os.getenv("DEBUG_ARTIFACTS_MAX_MB", "50"))
+    debug_artifacts_sample_rate: float = float(os.getenv("DEBUG_ARTIFACTS_SAMPLE_RATE", "0.05"))
+
+    # Resource Profiles (Network.setBlockedURLs): metadata-only, media-url-discovery, full
+    listing_resource_profile: str = os.getenv("LISTING_RESOURCE_PROFILE", "metadata-only")
+    detail_resource_profile: str = os.getenv("DETAIL_RESOURCE_PROFILE", "media-url-discovery")
+
+    # Deadline: sonuçları işleyip döndürmek için ayrılan süre (saniye)
+    deadline_reserve_seconds: float = float(os.getenv("DEADLINE_RESERVE_SECONDS", "5"))
+
+    # Faz 2 (detay sayfaları) arama başına zaman bütçesi, 0 = sınırsız
+    detail_phase_budget_seconds: float = float(os.getenv("DETAIL_PHASE_BUDGET_SECONDS", "0"))
+    # Detay sayfasından çözülmüş media cache'te en fazla bu kadar tutulur (imzalı CDN URL'leri expire olur)
+    media_cache_ttl_seconds: float = float(os.getenv("MEDIA_CACHE_TTL_SECONDS", "1800"))
+
+    # Search Session Mode (arama sayfası keyword'ler arasında yeniden kullanılır)
+    search_session_mode: bool = os.getenv("SEARCH_SESSION_MODE", "true").lower() == "true"
+
+    # Circuit Breaker (egress kimliği başına): ban/boş sayfa → exponential backoff + probe
+    circuit_anomaly_threshold: int = int(os.getenv("CIRCUIT_ANOMALY_THRESHOLD", "2"))
+    circuit_base_backoff_seconds: float = float(os.getenv("CIRCUIT_BASE_BACKOFF_SECONDS", "60"))
+    circuit_max_backoff_seconds: float = float(os.getenv("CIRCUIT_MAX_BACKOFF_SECONDS", "1800"))
+    # Job içinde açık breaker için en fazla bu kadar beklenir, sonra job kısmi sonuçla döner
+    circuit_max_wait_seconds: float = float(os.getenv("CIRCUIT_MAX_WAIT_SECONDS", "600"))
+
+    # Job Checkpoint (job_id verilen job'lar keyword bazında diske yazılır, yeniden başlatılınca devam eder)
+    checkpoint_path: str = os.getenv("CHECKPOINT_PATH", "data/checkpoints")
+
+    # Job Queue (SQLite; Railway'de kalıcı volume'a yönlendirin). Heartbeat gelmeyen lease visibility timeout sonra tekrar dağıtılır
+    job_queue_path: str = os.getenv("JOB_QUEUE_PATH", "data/jobs.db")
+    job_visibility_timeout_seconds: float = float(os.getenv("JOB_VISIBILITY_TIMEOUT_SECONDS", "120"))
+    job_max_attempts: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    # FastAPI server'da kuyruğu tüketen worker thread sayısı
+    queue_workers: int = int(os.getenv("QUEUE_WORKERS", "1"))
+    # POST /scrape-tiktok sonucu en fazla bu kadar bekler, sonra 202 + job_id döner
+    job_wait_timeout_seconds: float = float(os.getenv("JOB_WAIT_TIMEOUT_SECONDS", "3600"))
+
+    # Persistent Browser Profile (pool slot başına user-data-dir + HTTP cache)
+    persistent_profile_enabled: bool = os.getenv("PERSISTENT_PROFILE_ENABLED", "false").lower() == "true"
+    browser_profile_path: str = os.getenv("BROWSER_PROFILE_PATH", "data/browser_profiles")
+    browser_profile_max_mb: int = int(os.getenv("BROWSER_PROFILE_MAX_MB", "300"))
+    browser_profile_cleanup_hours: float = float(os.getenv("BROWSER_PROFILE_CLEANUP_HOURS", "6"))
+
+    # Browser Memory: Chrome process ağacı RSS'i / JS heap'i bu sınırları veya sayfa sayısını aşınca
+    # driver arama birimleri arasında (checkpoint yazıldıktan sonra) yeniden başlatılır. 0 = kapalı
+    browser_rss_limit_mb: int = int(os.getenv("BROWSER_RSS_LIMIT_MB", "600"))
+    js_heap_limit_mb: int = int(os.getenv("JS_HEAP_LIMIT_MB", "256"))
+    browser_recycle_pages: int = int(os.getenv("BROWSER_RECYCLE_PAGES", "200"))
+
+    # Browser Supervisor: TTL'den eski sahipsiz chrome/chromedriver process'leri ve geçici profil / /dev/shm artıkları temizlenir
+    browser_orphan_ttl_seconds: float = float(os.getenv("BROWSER_ORPHAN_TTL_SECONDS", "900"))
+    browser_reaper_interval_seconds: float = float(os.getenv("BROWSER_REAPER_INTERVAL_SECONDS", "60"))
+
+    # Time-Window Partitioning: days_back bu eşiği geçen aramalar geçmiş reklam yoğunluğuna göre pencerelere bölünür
+    time_window_partition_min_days: int = int(os.getenv("TIME_WINDOW_PARTITION_MIN_DAYS", "14"))
+    time_window_target_ads: int = int(os.getenv("TIME_WINDOW_TARGET_ADS", "60"))
+    time_window_default_days: int = int(os.getenv("TIME_WINDOW_DEFAULT_DAYS", "7"))
+    time_window_max_windows: int = int(os.getenv("TIME_WINDOW_MAX_WINDOWS", "8"))
+    # Tek job'ın pencerelerini aynı anda tarayan browser sayısı (API/daemon pool'undan boş olanlar ödünç alınır)
+    time_window_workers: int = int(os.getenv("TIME_WINDOW_WORKERS", "3"))
+    ad_density_path: str = os.getenv("AD_DENSITY_PATH", "data/ad_density.json")
+
+    # Startup: chromedriver yolu bir kez çözülüp önbelleğe yazılır (Docker build'de), PREWARM_DRIVERS ile Chrome açılışta başlatılır
+    chromedriver_path: str = os.getenv("CHROMEDRIVER_PATH", "")
+    chromedriver_cache_file: str = os.getenv("CHROMEDRIVER_CACHE_FILE", "data/chromedriver_path")
+    prewarm_drivers: bool = os.getenv("PREWARM_DRIVERS", "false").lower() == "true"
+
+    # Multi-Region: bir job'daki region'ları aynı anda tarayan browser sayısı
+    region_workers: int = int(os.getenv("REGION_WORKERS", "3"))
+
+    # Batch Mode (main.py --batch): aynı anda açık Chrome/worker sayısı
+    batch_workers: int = int(os.getenv("BATCH_WORKERS", "2"))
+
     # User Agents
     rotate_user_agents: bool = os.getenv("ROTATE_USER_AGENTS", "true").lower() == "true"
     
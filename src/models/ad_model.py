@@ -33,6 +33,7 @@ class TikTokAd(BaseModel):
     media_type: MediaType = Field(..., description="Medya türü")
     media_urls: List[str] = Field(default_factory=list, description="Medya URL'leri")
     thumbnail_url: Optional[str] = Field(None, description="Küçük resim URL")
+    media_status: str = Field(default="resolved", description="Media çözüm durumu: resolved, cached, unresolved, no_detail_url")
     
     # Banking specific fields
     is_banking_ad: bool = Field(default=False, description="Bankacılık reklamı mı")
@@ -41,6 +42,7 @@ class TikTokAd(BaseModel):
     # Metadata
     scraped_at: datetime = Field(default_factory=datetime.now, description="Scrape edilme tarihi")
     source_url: Optional[str] = Field(None, description="Kaynak URL")
+    region: Optional[str] = Field(None, description="Reklamın bulunduğu ülke kodu")
     raw_data: Dict[str, Any] = Field(default_factory=dict, description="Ham veri")
     
     def is_video(self) -> bool:
@@ -66,12 +68,68 @@ class ScrapingResult(BaseModel):
     errors: List[str] = Field(default_factory=list)
     warnings: List[str] = Field(default_factory=list)
     
+    # Performans raporu (job başına)
+    phase_timings: Dict[str, float] = Field(default_factory=dict, description="Faz başına duvar saati süresi (saniye)")
+    webdriver_commands: int = 0
+    webdriver_command_counts: Dict[str, int] = Field(default_factory=dict)
+    cdp_bytes_received: int = 0
+    blocked_requests: int = 0
+    estimated_bytes_saved: int = 0
+    page_weights: List[Dict[str, Any]] = Field(default_factory=list, description="Sayfa başına alınan/kazanılan byte")
+    pages_loaded: int = 0
+    sleep_seconds: float = 0.0
+    active_seconds: float = 0.0
+    time_to_first_ad_seconds: Optional[float] = None
+    truncated: bool = Field(default=False, description="Deadline nedeniyle kısmi sonuç")
+    truncated_steps: List[str] = Field(default_factory=list, description="Deadline nedeniyle atlanan adımlar")
+    phase_completion: Dict[str, Dict[str, int]] = Field(default_factory=dict, description="Faz başına done/total")
+    unresolved_ads: int = Field(default=0, description="Bütçe/hata nedeniyle media'sı çözülemeyen reklamlar")
+    duplicates_avoided: int = Field(default=0, description="Faz 1'de ad_id ile atlanan (detay sayfası açılmayan) reklamlar")
+    resumed_units: int = Field(default=0, description="Checkpoint'ten geri yüklenen (tekrar aranmayan) keyword'ler")
+    failed_units: List[str] = Field(default_factory=list, description="max_retries sonrası tamamlanamayan keyword'ler")
+    region_timings: Dict[str, Dict[str, Any]] = Field(default_factory=dict, description="Region başına süre, bütçe ve reklam sayısı")
+    peak_browser_rss_mb: Optional[float] = Field(default=None, description="Tek browser'ın tepe process ağacı RSS'i (/proc)")
+    peak_js_heap_mb: Optional[float] = Field(default=None, description="Tepe kullanılan JS heap (CDP Performance.getMetrics)")
+    browser_recycles: int = Field(default=0, description="Bellek/sayfa sınırı nedeniyle yeniden başlatılan browser sayısı")
+    
     def complete(self):
         """Scraping'i tamamla"""
         self.end_time = datetime.now()
         if self.end_time:
             self.duration_seconds = (self.end_time - self.start_time).total_seconds()
     
+    def apply_performance(self, performance: Dict[str, Any]):
+        """JobStats özetini sonuca işle"""
+        for key, value in performance.items():
+            if key in type(self).model_fields:
+                setattr(self, key, value)
+    
+    def performance_summary(self) -> Dict[str, Any]:
+        """N8N / JSON çıktısı için performans özeti"""
+        return {
+            "phase_timings": self.phase_timings,
+            "webdriver_commands": self.webdriver_commands,
+            "cdp_bytes_received": self.cdp_bytes_received,
+            "blocked_requests": self.blocked_requests,
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+            "page_weights": self.page_weights,
+            "pages_loaded": self.pages_loaded,
+            "sleep_seconds": self.sleep_seconds,
+            "active_seconds": self.active_seconds,
+            "time_to_first_ad_seconds": self.time_to_first_ad_seconds,
+            "duplicates_avoided": self.duplicates_avoided,
+            "unresolved_ads": self.unresolved_ads,
+            "truncated": self.truncated,
+            "truncated_steps": self.truncated_steps,
+            "phase_completion": self.phase_completion,
+            "resumed_units": self.resumed_units,
+            "failed_units": self.failed_units,
+            "region_timings": self.region_timings,
+            "peak_browser_rss_mb": self.peak_browser_rss_mb,
+            "peak_js_heap_mb": self.peak_js_heap_mb,
+            "browser_recycles": self.browser_recycles
+        }
+    
     def add_error(self, error: str):
         """Hata ekle"""
         self.errors.append(f"{datetime.now()}: {error}")
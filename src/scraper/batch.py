@@ -0,0 +1,315 @@
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from src.config.settings import settings
+from src.scraper.tiktok_scraper import TikTokAdScraper
+from src.scraper.browser_supervisor import browser_supervisor
+from src.scraper.driver_pool import DriverPool, PooledDriver
+from src.scraper.time_windows import density_key, plan_windows
+from src.utils.circuit_breaker import breakers
+from src.utils.job_queue import JobQueue, QueuedJob, STATE_DEAD, STATE_DONE, owner_prefix, worker_owner
+from src.utils.proxy_manager import proxy_pool
+
+DEFAULT_BATCH_KEYWORDS = ["banka", "kredi", "kart", "finans"]
+
+
+class BatchEntry(BaseModel):
+    """Manifest'teki tek arama"""
+
+    entry_id: str
+    keywords: List[str]
+    search_type: str = "keyword"  # keyword | advertiser
+    days_back: int = 30
+    region: Optional[str] = None
+    max_results: int = Field(default_factory=lambda: settings.tiktok_max_ads_per_search)
+    deadline_seconds: Optional[float] = None
+    # Zaman penceresi entry'si (partition_entries üretir): parent_id'nin days_back aralığının bir parçası
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    parent_id: Optional[str] = None
+
+
+class EntryOutcome(BaseModel):
+    """Bir manifest entry'sinin sonucu (rapor satırı)"""
+
+    entry_id: str
+    success: bool = False
+    attempts: int = 0
+    total_ads: int = 0
+    banking_ads: int = 0
+    duration_seconds: float = 0.0
+    truncated: bool = False
+    error: Optional[str] = None
+
+
+def build_manifest(banks: Optional[List[str]] = None,
+                   keywords: Optional[List[str]] = None,
+                   days_back: Optional[List[int]] = None,
+                   max_results: Optional[int] = None,
+                   region: Optional[str] = None) -> List[BatchEntry]:
+    """Banka (advertiser araması) × days_back ve keyword × days_back manifest'i"""
+    banks = settings.turkish_banks if banks is None else banks
+    keywords = DEFAULT_BATCH_KEYWORDS if keywords is None else keywords
+    entries = []
+    for window in days_back or [30]:
+        searches = [("advertiser", bank) for bank in banks] + [("keyword", kw) for kw in keywords]
+        for search_type, term in searches:
+            entry = BatchEntry(
+                entry_id=f"{search_type}-{term}-{window}d",
+                keywords=[term],
+                search_type=search_type,
+                days_back=window,
+                region=region,
+            )
+            if max_results:
+                entry.max_results = max_results
+            entries.append(entry)
+    return entries
+
+
+def load_manifest(path: str) -> List[BatchEntry]:
+    """JSON manifest yükle: entry listesi veya {"entries": [...]}"""
+    data = json.loads(Path(path).read_text(encoding='utf-8'))
+    if isinstance(data, dict):
+        data = data.get('entries', [])
+    entries = []
+    for index, item in enumerate(data):
+        item.setdefault('entry_id', f"entry-{index:04d}")
+        entries.append(BatchEntry(**item))
+    return entries
+
+
+def partition_entries(entries: List[BatchEntry], min_days: Optional[int] = None) -> List[BatchEntry]:
+    """Uzun aralıklı entry'leri zaman penceresi entry'lerine böl
+
+    Pencereler terimlerin geçmiş reklam yoğunluğuna göre boyutlanır; her
+    pencere ayrı job olarak worker'lara paralel dağıtılır. Reklam bütçesi
+    pencerelere eşit bölünür.
+    """
+    min_days = settings.time_window_partition_min_days if min_days is None else min_days
+    result = []
+    for entry in entries:
+        if entry.start_time or entry.days_back < min_days:
+            result.append(entry)
+            continue
+        region = entry.region or settings.tiktok_country
+        keys = [density_key(entry.search_type, term, region) for term in entry.keywords]
+        windows = plan_windows(entry.days_back, keys)
+        if len(windows) < 2:
+            result.append(entry)
+            continue
+        for window in windows:
+            result.append(entry.copy(update={
+                'entry_id': f"{entry.entry_id}@{window.label}",
+                'start_time': window.start,
+                'end_time': window.end,
+                'parent_id': entry.entry_id,
+                'max_results': max(3, entry.max_results // len(windows)),
+            }))
+    return result
+
+
+class BatchRunner:
+    """Manifest'i sınırlı sayıda scraper worker'ı ile çalıştır
+
+    Entry'ler kalıcı job kuyruğuna eklenir; worker'lar lease alıp DriverPool'dan
+    keep-alive Chrome ile (kendi profil slot'u ve proxy'si) çalıştırır.
+    Başarısız entry'ler backoff sonrası taze driver ile yeniden denenir,
+    retries tükenince dead-letter'a düşer. Uzun aralıklı entry'ler zaman
+    pencerelerine bölünüp ayrı job'lar olarak paralel taranır.
+    Entry'ler en hızlı sağlıklı proxy'ye / circuit breaker'ı kapalı kimliğe
+    sahip boş browser'a yönlendirilir. Reklamlar worker başına bir JSONL shard'ına, özet report.json'a
+    yazılır.
+    """
+
+    def __init__(self,
+                 workers: Optional[int] = None,
+                 retries: Optional[int] = None,
+                 output_dir: Optional[str] = None,
+                 headless: bool = True,
+                 queue: Optional[JobQueue] = None):
+        self.workers = max(1, workers or settings.batch_workers)
+        self.retries = settings.max_retries if retries is None else retries
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.output_dir = Path(output_dir or Path(settings.raw_data_path) / f"batch_{timestamp}")
+        self.headless = headless
+
+        self.queue = queue
+        self.window_entries = 0
+        self.pool: Optional[DriverPool] = None
+        self._seen_hashes = set()
+        self._lock = threading.Lock()
+
+    def run(self, entries: List[BatchEntry]) -> Dict[str, Any]:
+        """Entry'leri kuyruğa ekle, worker'larla tüket, aggregate raporu döndür
+
+        Aynı output_dir ile yeniden başlatılan batch tamamlanmış entry'leri
+        tekrar çalıştırmaz; yarım kalanlar checkpoint'ten devam eder,
+        dead-letter'dakiler yeniden denenir.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.queue = self.queue or JobQueue()
+        browser_supervisor.start()
+        queue_name = f"batch:{self.output_dir.name}"
+        # Yeniden başlatılan batch'te pencere planı değişmesin: kuyruğa girmiş entry'ler tekrar bölünmez
+        queued = {job.payload.get('parent_id') or job.payload.get('entry_id') for job in self.queue.jobs(queue_name)}
+        fresh = partition_entries([entry for entry in entries if entry.entry_id not in queued])
+        for entry in fresh:
+            self.queue.enqueue(entry.dict(), queue=queue_name, job_id=f"{self.output_dir.name}:{entry.entry_id}",
+                               max_attempts=self.retries + 1)
+        for job in self.queue.jobs(queue_name):
+            if job.state == STATE_DEAD:
+                self.queue.requeue(job.id)
+        # Bu host'ta çökmüş önceki çalıştırmanın lease'leri
+        self.queue.release_owner(queue_name, owner_prefix("batch"))
+
+        pending = self.queue.pending(queue_name)
+        worker_count = min(self.workers, pending) or 1
+        logger.info(f"Batch başlatıldı: {len(entries)} entry, {len(fresh)} yeni job ({pending} bekleyen), {worker_count} worker → {self.output_dir}")
+        started = time.monotonic()
+        if pending:
+            self.pool = DriverPool(worker_count, headless=self.headless)
+            owner = worker_owner("batch")
+            threads = [
+                threading.Thread(target=self._drain, args=(queue_name, f"{owner}/{slot}"), name=f"batch-{slot}")
+                for slot in range(worker_count)
+            ]
+            try:
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            finally:
+                self.pool.shutdown()
+
+        jobs = self.queue.jobs(queue_name)
+        self.window_entries = sum(1 for job in jobs if job.payload.get('parent_id'))
+        outcomes = [self._outcome(job) for job in jobs]
+        report = self._build_report(outcomes, time.monotonic() - started)
+        (self.output_dir / "report.json").write_text(
+            json.dumps(report, ensure_ascii=False, indent=2, default=str), encoding='utf-8'
+        )
+        return report
+
+    def _drain(self, queue_name: str, owner: str):
+        """Kuyrukta bitmemiş job kalmayana kadar lease al ve çalıştır"""
+        while True:
+            job = self.queue.lease(queue_name, owner)
+            if job is None:
+                if not self.queue.pending(queue_name):
+                    return
+                # Backoff'taki veya başka worker'da çalışan job'lar
+                time.sleep(1.0)
+                continue
+            worker = self.pool.checkout()
+            try:
+                with self.queue.keep_leased(job, owner):
+                    self._run_entry(worker, BatchEntry(**job.payload), job, owner)
+            finally:
+                self.pool.checkin(worker)
+
+    def _run_entry(self, worker: PooledDriver, entry: BatchEntry, job: QueuedJob, owner: str):
+        """Entry'nin tek denemesi; başarısızlıkta job backoff ile tekrar kuyruğa (veya dead-letter'a) düşer"""
+        selenium_scraper = worker.scraper
+        try:
+            scraper = TikTokAdScraper(selenium_scraper=selenium_scraper)
+            result = scraper.search_ads(
+                entry.keywords,
+                entry.max_results,
+                search_type=entry.search_type,
+                deadline_seconds=entry.deadline_seconds,
+                region=entry.region,
+                days_back=entry.days_back,
+                start_time=entry.start_time,
+                end_time=entry.end_time,
+                # Pencere entry'leri zaten bölünmüş; bölünmeyen kısa entry'ler tek aralık
+                partition=False,
+                # Tekrar deneme ve aynı output_dir ile yeniden başlatılan batch checkpoint'ten devam eder
+                job_id=job.id,
+            )
+            if selenium_scraper.driver is None:
+                raise RuntimeError("WebDriver kurulamadı")
+            if result.errors and not result.total_ads:
+                raise RuntimeError(result.errors[-1])
+        except Exception as e:
+            logger.warning(f"[{entry.entry_id}] deneme {job.attempts}/{job.max_attempts} başarısız: {e}")
+            # Sonraki deneme taze driver ile
+            selenium_scraper.shutdown()
+            self.queue.fail(job.id, owner, str(e), retry_delay=min(2 ** job.attempts, 30))
+            return
+
+        self._write_shard(worker.slot, entry, scraper)
+        outcome = EntryOutcome(
+            entry_id=entry.entry_id,
+            success=True,
+            attempts=job.attempts,
+            total_ads=result.total_ads,
+            banking_ads=result.banking_ads,
+            duration_seconds=result.duration_seconds or 0.0,
+            truncated=result.truncated,
+        )
+        if not self.queue.complete(job.id, owner, outcome.dict()):
+            logger.warning(f"[{entry.entry_id}] lease kaybedildi, sonuç başka worker'a bırakıldı")
+        logger.info(f"[{entry.entry_id}] {result.total_ads} reklam ({result.duration_seconds:.1f}s)")
+
+    @staticmethod
+    def _outcome(job: QueuedJob) -> EntryOutcome:
+        if job.state == STATE_DONE and job.result:
+            return EntryOutcome(**{**job.result, 'attempts': job.attempts})
+        return EntryOutcome(entry_id=job.payload.get('entry_id', job.id), attempts=job.attempts,
+                            error=job.error or job.state)
+
+    def _write_shard(self, slot: int, entry: BatchEntry, scraper: TikTokAdScraper):
+        """Reklamları worker'ın shard'ına ekle (shard'a sadece o worker yazar)"""
+        path = self.output_dir / f"shard-{slot:02d}.jsonl"
+        with open(path, 'a', encoding='utf-8') as f:
+            for ad in scraper.scraped_ads:
+                ad_hash = scraper._compute_ad_hash(ad)
+                # Aynı reklam birden fazla zaman penceresinde gösterilmiş olabilir: TikTok ad_id ile birleştir
+                dedup_key = (ad.raw_data or {}).get('ad_id') or ad_hash
+                with self._lock:
+                    duplicate = dedup_key in self._seen_hashes
+                    self._seen_hashes.add(dedup_key)
+                record = ad.dict()
+                record['batch'] = {
+                    'entry_id': entry.parent_id or entry.entry_id,
+                    'window': entry.entry_id if entry.parent_id else None,
+                    'search_type': entry.search_type,
+                    'days_back': entry.days_back,
+                    'ad_hash': ad_hash,
+                    'duplicate': duplicate,
+                }
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def _build_report(self, outcomes: List[EntryOutcome], wall_seconds: float) -> Dict[str, Any]:
+        succeeded = [o for o in outcomes if o.success]
+        failed = [o for o in outcomes if not o.success]
+        total_ads = sum(o.total_ads for o in succeeded)
+        return {
+            'entries': len(outcomes),
+            'time_windows': self.window_entries,
+            'succeeded': len(succeeded),
+            'failed': len(failed),
+            'retried': sum(1 for o in outcomes if o.attempts > 1),
+            'attempts': sum(o.attempts for o in outcomes),
+            'truncated': sum(1 for o in succeeded if o.truncated),
+            'total_ads': total_ads,
+            'unique_ads': len(self._seen_hashes),
+            'banking_ads': sum(o.banking_ads for o in succeeded),
+            'workers': self.workers,
+            'wall_seconds': round(wall_seconds, 2),
+            'ads_per_second': round(total_ads / wall_seconds, 3) if wall_seconds else 0.0,
+            'entries_per_minute': round(len(outcomes) * 60 / wall_seconds, 2) if wall_seconds else 0.0,
+            'output_dir': str(self.output_dir),
+            'circuit_breakers': breakers.snapshot(),
+            'proxies': proxy_pool.snapshot(),
+            # Dead-letter: deneme hakkı tükenen entry'ler
+            'failures': [{'entry_id': o.entry_id, 'attempts': o.attempts, 'error': o.error} for o in failed],
+            'outcomes': [o.dict() for o in outcomes],
+        }
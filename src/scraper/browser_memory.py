@@ -0,0 +1,72 @@
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+from loguru import logger
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def parent_map(proc_root: str = '/proc') -> Dict[int, int]:
+    """/proc'taki tüm process'lerin pid → ppid eşlemesi"""
+    parents: Dict[int, int] = {}
+    for entry in os.scandir(proc_root):
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = Path(entry.path, 'stat').read_text()
+            # "pid (comm) state ppid ..." - comm boşluk/parantez içerebilir
+            parents[int(entry.name)] = int(stat.rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+    return parents
+
+
+def process_tree(root_pid: int, parents: Optional[Dict[int, int]] = None) -> List[int]:
+    """root_pid ve tüm alt process'leri (chromedriver → chrome → renderer/gpu/...)"""
+    children: Dict[int, List[int]] = {}
+    for pid, ppid in (parents if parents is not None else parent_map()).items():
+        children.setdefault(ppid, []).append(pid)
+    tree, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(children.get(pid, []))
+    return tree
+
+
+def process_tree_rss(root_pid: Optional[int]) -> Optional[int]:
+    """Process ağacının toplam RSS'i (byte); /proc yoksa (Windows/macOS) None
+
+    Paylaşılan sayfalar her process'te sayıldığı için gerçek kullanımın biraz
+    üstündedir; OOM sınırına karşı temkinli bir ölçü.
+    """
+    if root_pid is None or not os.path.isdir('/proc'):
+        return None
+    total = 0
+    for pid in process_tree(root_pid):
+        try:
+            total += int(Path(f'/proc/{pid}/statm').read_text().split()[1]) * PAGE_SIZE
+        except (OSError, ValueError, IndexError):
+            continue  # Bu arada kapanan process
+    return total
+
+
+def driver_pid(driver) -> Optional[int]:
+    """chromedriver process'inin pid'i (Chrome onun alt process'i)"""
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+def js_heap_used(driver) -> Optional[int]:
+    """Aktif sekmenin kullanılan JS heap'i (byte), CDP Performance.getMetrics ile"""
+    try:
+        metrics = driver.execute_cdp_cmd('Performance.getMetrics', {}).get('metrics', [])
+    except Exception as e:
+        logger.debug(f"Performance.getMetrics okunamadı: {e}")
+        return None
+    for metric in metrics:
+        if metric.get('name') == 'JSHeapUsedSize':
+            return int(metric['value'])
+    return None
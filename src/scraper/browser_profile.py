@@ -0,0 +1,201 @@
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from loguru import logger
+
+from src.config.settings import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: slot kilidi olmadan çalış
+    fcntl = None
+
+# Boyut limiti aşıldığında ilk silinecek (yeniden oluşturulabilir) cache dizinleri
+CACHE_DIRS = [
+    "Default/Cache", "Default/Code Cache", "Default/GPUCache",
+    "Default/Service Worker/CacheStorage", "Default/Service Worker/ScriptCache",
+    "ShaderCache", "GrShaderCache", "GraphiteDawnCache",
+]
+SESSION_FILE = "session.json"
+CLEANUP_MARKER = ".last_cleanup"
+
+# localStorage'ı sayfa script'lerinden önce geri yükler (sadece eksik key'ler)
+_LOCAL_STORAGE_SEED = """
+(function() {
+    const snapshot = %s;
+    const items = snapshot[location.origin];
+    if (!items) return;
+    try {
+        for (const [key, value] of Object.entries(items)) {
+            if (localStorage.getItem(key) === null) localStorage.setItem(key, value);
+        }
+    } catch (e) {}
+})();
+"""
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for item in path.rglob('*'):
+        try:
+            if item.is_file() and not item.is_symlink():
+                total += item.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+class PersistentProfile:
+    """Pool slot'u başına kalıcı Chrome user-data-dir
+
+    HTTP cache, consent/region cookie'leri ve localStorage çalıştırmalar
+    arasında korunur. Cookie + localStorage ayrıca JSON olarak snapshot'lanır;
+    profil temizlenirse (boyut limiti, bozulma) oturum snapshot'tan döner.
+    """
+
+    def __init__(self,
+                 slot: int = 0,
+                 base_dir: Optional[str] = None,
+                 max_bytes: Optional[int] = None,
+                 cleanup_interval_hours: Optional[float] = None):
+        self.slot = slot
+        self.root = Path(base_dir or settings.browser_profile_path) / f"slot-{slot}"
+        self.user_data_dir = self.root / "chrome"
+        self.max_bytes = max_bytes if max_bytes is not None else settings.browser_profile_max_mb * 1024 * 1024
+        self.cleanup_interval = (
+            cleanup_interval_hours if cleanup_interval_hours is not None else settings.browser_profile_cleanup_hours
+        ) * 3600
+
+        self.active = False
+        self.warm = False  # Profil önceki çalıştırmadan dolu mu
+        self._lock_file = None
+
+    def acquire(self) -> bool:
+        """Slot'u bu process için kilitle (aynı user-data-dir iki Chrome'da açılamaz)"""
+        if self.active:
+            return True
+        self.root.mkdir(parents=True, exist_ok=True)
+        if fcntl is not None:
+            lock_file = open(self.root / ".lock", 'w')
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                logger.warning(f"Profil slot-{self.slot} başka bir process'te kullanımda, geçici profil kullanılacak")
+                return False
+            self._lock_file = lock_file
+
+        # Kilit bizde: önceki crash'ten kalan Chrome singleton dosyalarını temizle
+        for name in ("SingletonLock", "SingletonSocket", "SingletonCookie"):
+            try:
+                (self.user_data_dir / name).unlink()
+            except OSError:
+                pass
+
+        self._cleanup_if_due()
+        self.warm = (self.user_data_dir / "Default").exists()
+        self.active = True
+        return True
+
+    def release(self):
+        """Slot kilidini bırak"""
+        if self._lock_file is not None:
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            finally:
+                self._lock_file.close()
+                self._lock_file = None
+        self.active = False
+
+    def apply(self, chrome_options):
+        """Chrome argümanlarına kalıcı profil ve cache limiti ekle"""
+        chrome_options.add_argument(f"--user-data-dir={self.user_data_dir.resolve()}")
+        # Cache, profil bütçesinin yarısını geçmesin (geri kalanı cookie/storage/metadata)
+        chrome_options.add_argument(f"--disk-cache-size={self.max_bytes // 2}")
+
+    def restore_session(self, driver) -> bool:
+        """Soğuk profilde snapshot'taki cookie ve localStorage'ı geri yükle
+
+        Sıcak profilde Chrome'un kendi kopyası daha güncel olduğu için dokunulmaz.
+        """
+        if self.warm:
+            return False
+        snapshot = self._read_snapshot()
+        if not snapshot:
+            return False
+        try:
+            if snapshot.get('cookies'):
+                driver.execute_cdp_cmd('Network.setCookies', {'cookies': snapshot['cookies']})
+            if snapshot.get('local_storage'):
+                driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                    'source': _LOCAL_STORAGE_SEED % json.dumps(snapshot['local_storage'])
+                })
+            logger.info(f"Oturum snapshot'tan yüklendi: {len(snapshot.get('cookies', []))} cookie")
+            return True
+        except Exception as e:
+            logger.warning(f"Oturum snapshot'ı yüklenemedi: {e}")
+            return False
+
+    def save_session(self, driver):
+        """Cookie'leri ve aktif origin'in localStorage'ını snapshot'la"""
+        try:
+            cookies = driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', [])
+            local_storage: Dict[str, Dict[str, str]] = self._read_snapshot().get('local_storage', {})
+            page = driver.execute_script(
+                "return location.protocol.startsWith('http') ? "
+                "{origin: location.origin, items: Object.assign({}, localStorage)} : null;"
+            )
+            if page:
+                local_storage[page['origin']] = page['items']
+
+            path = self.root / SESSION_FILE
+            tmp_path = path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps({
+                'saved_at': time.time(),
+                'cookies': [self._settable_cookie(c) for c in cookies],
+                'local_storage': local_storage,
+            }), encoding='utf-8')
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.debug(f"Oturum snapshot'ı kaydedilemedi: {e}")
+
+    def _read_snapshot(self) -> Dict:
+        try:
+            return json.loads((self.root / SESSION_FILE).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _settable_cookie(cookie: Dict) -> Dict:
+        """Network.getAllCookies çıktısını Network.setCookies formatına çevir"""
+        keys = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires')
+        result = {k: cookie[k] for k in keys if k in cookie}
+        if result.get('expires', 0) <= 0:  # Session cookie
+            result.pop('expires', None)
+        return result
+
+    def _cleanup_if_due(self):
+        """Periyodik boyut kontrolü: önce cache dizinleri, yetmezse tüm profil silinir"""
+        marker = self.root / CLEANUP_MARKER
+        try:
+            if time.time() - marker.stat().st_mtime < self.cleanup_interval:
+                return
+        except OSError:
+            pass
+
+        if self.user_data_dir.exists():
+            size = _dir_size(self.user_data_dir)
+            if size > self.max_bytes:
+                for rel in CACHE_DIRS:
+                    shutil.rmtree(self.user_data_dir / rel, ignore_errors=True)
+                trimmed = _dir_size(self.user_data_dir)
+                if trimmed > self.max_bytes:
+                    # Oturum bilgisi session.json'da, profil sıfırdan kurulabilir
+                    shutil.rmtree(self.user_data_dir, ignore_errors=True)
+                    trimmed = 0
+                logger.info(
+                    f"Profil slot-{self.slot} temizlendi: {size // (1024 * 1024)} MB → {trimmed // (1024 * 1024)} MB"
+                )
+        marker.touch()
@@ -0,0 +1,325 @@
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from loguru import logger
+
+from src.config.settings import settings
+from src.scraper.browser_memory import driver_pid, parent_map, process_tree
+from src.utils.metrics import BROWSER_PROCESSES, BROWSER_TEMP_REMOVED_TOTAL, BROWSERS_LIVE, BROWSERS_REAPED_TOTAL
+
+# chromedriver'ın açtığı Chrome'un geçici user-data-dir'i ve /dev/shm dosyalarının önekleri
+TEMP_PREFIXES = ('.org.chromium.Chromium.', '.com.google.Chrome.', 'scoped_dir')
+SHM_DIR = Path('/dev/shm')
+# chromedriver'ın Chrome'a her zaman eklediği argümanlar (excludeSwitches ile kaldırılmıyor)
+WEBDRIVER_SWITCHES = ('--remote-debugging-port', '--remote-debugging-pipe', '--test-type=webdriver')
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+# SIGTERM sonrası SIGKILL'e kadar bekleme
+TERMINATE_GRACE_SECONDS = 3.0
+
+
+class _Process:
+    """/proc/<pid> anlık görüntüsü (taramada kullanılan alanlar)"""
+
+    def __init__(self, pid: int, comm: str, state: str, ppid: int, started_at: float, cmdline: List[str]):
+        self.pid = pid
+        self.comm = comm
+        self.state = state
+        self.ppid = ppid
+        self.started_at = started_at
+        self.cmdline = cmdline
+
+    @property
+    def is_browser(self) -> bool:
+        return self.comm.startswith('chrome')
+
+    @property
+    def is_root(self) -> bool:
+        """Öldürülecek ağacın kökü: chromedriver veya webdriver ile açılmış Chrome (kullanıcının Chrome'u değil)
+
+        setup_driver enable-automation switch'ini kaldırdığı için Chrome'u
+        chromedriver'ın her zaman eklediği remote debugging / webdriver
+        argümanlarından veya geçici / kalıcı profil dizininden tanırız.
+        Renderer, GPU vb. alt process'ler (--type=) kök değildir.
+        """
+        if self.comm == 'chromedriver':
+            return True
+        if not self.is_browser or any(arg.startswith('--type=') for arg in self.cmdline):
+            return False
+        if any(arg.startswith(WEBDRIVER_SWITCHES) for arg in self.cmdline):
+            return True
+        user_data_dir = self.user_data_dir
+        if user_data_dir is None:
+            return False
+        return (Path(user_data_dir).name.startswith(TEMP_PREFIXES)
+                or Path(user_data_dir).resolve().is_relative_to(Path(settings.browser_profile_path).resolve()))
+
+    @property
+    def user_data_dir(self) -> Optional[str]:
+        for arg in self.cmdline:
+            if arg.startswith('--user-data-dir='):
+                return arg.split('=', 1)[1]
+        return None
+
+
+def _boot_time(proc_root: str) -> float:
+    for line in Path(proc_root, 'stat').read_text().splitlines():
+        if line.startswith('btime '):
+            return float(line.split()[1])
+    return 0.0
+
+
+def _read_process(pid: int, boot_time: float, proc_root: str = '/proc') -> Optional[_Process]:
+    try:
+        stat = Path(proc_root, str(pid), 'stat').read_text()
+        cmdline = Path(proc_root, str(pid), 'cmdline').read_bytes().split(b'\0')
+    except OSError:
+        return None
+    comm = stat[stat.index('(') + 1:stat.rindex(')')]
+    fields = stat.rsplit(')', 1)[1].split()
+    # fields[0] = state, fields[1] = ppid, fields[19] = starttime (boot'tan beri clock tick)
+    return _Process(pid, comm, fields[0], int(fields[1]), boot_time + int(fields[19]) / CLOCK_TICKS,
+                    [arg.decode('utf-8', 'replace') for arg in cmdline if arg])
+
+
+class BrowserSupervisor:
+    """Process içinde açılan browser'ları takip eder, sahipsiz kalanları toplar
+
+    setup_driver her yeni driver'ı register() eder (weakref: scraper nesnesi
+    driver kapatılmadan çöpe giderse browser sahipsiz sayılır). Periyodik
+    tarama TTL'den eski şu process ağaçlarını öldürür:
+
+    - bu process'in altında olup takip edilen açık bir driver'a ait olmayanlar
+      (close_driver() çalışmadan hata ile çıkılmış handler),
+    - ebeveyni ölüp init'e kalmış olanlar (öldürülen CLI / çöken worker).
+
+    Başka bir canlı process'in (örn. aynı container'da çalışan batch CLI)
+    browser'larına ve webdriver dışı Chrome'lara dokunulmaz. Zombi
+    chromedriver/chrome çocukları waitpid ile toplanır (container'da PID 1
+    olduğumuzda init'e kalan process'ler bize düşer). Kullanılmayan geçici
+    profil dizinleri ve /dev/shm artıkları da silinir.
+    """
+
+    def __init__(self,
+                 ttl: Optional[float] = None,
+                 interval: Optional[float] = None,
+                 proc_root: str = '/proc',
+                 temp_dir: Optional[str] = None,
+                 shm_dir: Path = SHM_DIR):
+        self.ttl = ttl if ttl is not None else settings.browser_orphan_ttl_seconds
+        self.interval = interval if interval is not None else settings.browser_reaper_interval_seconds
+        self.proc_root = proc_root
+        self.temp_dir = Path(temp_dir or tempfile.gettempdir())
+        self.shm_dir = Path(shm_dir)
+        self.available = os.path.isdir(proc_root)
+        self._lock = threading.Lock()
+        self._scrapers: "weakref.WeakSet" = weakref.WeakSet()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.reaped: Dict[str, int] = {}
+        self.temp_removed: Dict[str, int] = {}
+        self.browser_processes = 0
+        self.last_sweep: Optional[float] = None
+
+    def register(self, scraper):
+        """Yeni açılan driver'ın scraper'ını takibe al (driver None olunca canlı sayılmaz)"""
+        with self._lock:
+            self._scrapers.add(scraper)
+
+    def live_drivers(self) -> List[int]:
+        """Takip edilen açık driver'ların chromedriver pid'leri"""
+        with self._lock:
+            scrapers = list(self._scrapers)
+        pids = [driver_pid(scraper.driver) for scraper in scrapers if scraper.driver is not None]
+        return [pid for pid in pids if pid is not None]
+
+    def start(self):
+        """Arka plan taramasını başlat (idempotent); ilk tarama hemen yapılır"""
+        if not self.available or self.interval <= 0:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="browser-reaper", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.warning(f"Browser reaper taraması başarısız: {e}")
+            if self._stop.wait(self.interval):
+                return
+
+    def sweep(self) -> Dict[str, int]:
+        """Tek tarama: zombileri topla, sahipsiz ağaçları öldür, geçici artıkları sil"""
+        if not self.available:
+            return {}
+        now = time.time()
+        boot_time = _boot_time(self.proc_root)
+        parents = parent_map(self.proc_root)
+        processes = {pid: proc for pid in parents
+                     if (proc := _read_process(pid, boot_time, self.proc_root)) is not None}
+        live: Set[int] = set()
+        for pid in self.live_drivers():
+            live.update(process_tree(pid, parents))
+        browsers = [proc for proc in processes.values() if proc.is_browser or proc.comm == 'chromedriver']
+
+        counts = {'zombie': self._reap_zombies(browsers)}
+        for proc in browsers:
+            if proc.state == 'Z' or not proc.is_root or proc.pid in live or now - proc.started_at < self.ttl:
+                continue
+            # Üst zincirdeki başka bir kök (chromedriver → chrome) ağacı zaten kapsıyor
+            if processes.get(proc.ppid) is not None and processes[proc.ppid].is_root:
+                continue
+            reason = self._orphan_reason(proc, processes)
+            if reason is None:
+                continue
+            logger.warning(f"🧟 Sahipsiz {proc.comm} (pid {proc.pid}, {(now - proc.started_at) / 60:.0f} dk) öldürülüyor: {reason}")
+            self._terminate(process_tree(proc.pid, parents))
+            counts[reason] = counts.get(reason, 0) + 1
+
+        in_use = {proc.user_data_dir for proc in browsers if proc.user_data_dir}
+        counts['profile'] = self._remove_temp_profiles(in_use, now)
+        counts['shm'] = self._remove_shm(browsers, now)
+
+        with self._lock:
+            for key in ('zombie', 'leaked', 'orphan'):
+                if counts.get(key):
+                    self.reaped[key] = self.reaped.get(key, 0) + counts[key]
+                    BROWSERS_REAPED_TOTAL.inc(counts[key], reason=key)
+            for key in ('profile', 'shm'):
+                if counts[key]:
+                    self.temp_removed[key] = self.temp_removed.get(key, 0) + counts[key]
+                    BROWSER_TEMP_REMOVED_TOTAL.inc(counts[key], kind=key)
+            self.browser_processes = len(browsers)
+            self.last_sweep = now
+        BROWSERS_LIVE.set(len(self.live_drivers()))
+        BROWSER_PROCESSES.set(len(browsers))
+        return counts
+
+    def _orphan_reason(self, proc: _Process, processes: Dict[int, _Process]) -> Optional[str]:
+        """Browser dışındaki ilk ataya göre: bizim (leaked), init'e kalmış (orphan) veya başkasının (None)"""
+        ancestor = processes.get(proc.ppid)
+        while ancestor is not None and (ancestor.is_browser or ancestor.comm == 'chromedriver'):
+            ancestor = processes.get(ancestor.ppid)
+        owner = ancestor.pid if ancestor is not None else 0
+        if owner == os.getpid():
+            return 'leaked'
+        if owner in (0, 1):
+            return 'orphan'
+        return None
+
+    def _reap_zombies(self, browsers: List[_Process]) -> int:
+        reaped = 0
+        for proc in browsers:
+            if proc.state != 'Z' or proc.ppid != os.getpid():
+                continue
+            try:
+                if os.waitpid(proc.pid, os.WNOHANG)[0] == proc.pid:
+                    reaped += 1
+            except ChildProcessError:
+                pass  # subprocess.Popen kendisi topladı
+        return reaped
+
+    def _terminate(self, pids: List[int]):
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            remaining = []
+            for pid in pids:
+                try:
+                    os.kill(pid, sig)
+                    remaining.append(pid)
+                except (ProcessLookupError, PermissionError):
+                    continue
+            deadline = time.monotonic() + TERMINATE_GRACE_SECONDS
+            while remaining and time.monotonic() < deadline:
+                remaining = [pid for pid in remaining if self._alive(pid)]
+                if remaining:
+                    time.sleep(0.1)
+            pids = remaining
+            if not pids:
+                return
+
+    def _alive(self, pid: int) -> bool:
+        """Process hâlâ çalışıyor mu (kendi zombi çocuğumuzsa toplanır)"""
+        try:
+            if os.waitpid(pid, os.WNOHANG)[0] == pid:
+                return False
+        except ChildProcessError:
+            pass
+        try:
+            state = Path(self.proc_root, str(pid), 'stat').read_text().rsplit(')', 1)[1].split()[0]
+        except OSError:
+            return False
+        return state != 'Z'
+
+    def _remove_temp_profiles(self, in_use: Set[str], now: float) -> int:
+        removed = 0
+        for entry in self.temp_dir.iterdir():
+            if not entry.name.startswith(TEMP_PREFIXES) or str(entry) in in_use:
+                continue
+            try:
+                if not entry.is_dir() or now - entry.stat().st_mtime < self.ttl:
+                    continue
+            except OSError:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            removed += 1
+        if removed:
+            logger.info(f"🧹 {removed} terk edilmiş geçici Chrome profili silindi ({self.temp_dir})")
+        return removed
+
+    def _remove_shm(self, browsers: List[_Process], now: float) -> int:
+        if not self.shm_dir.is_dir():
+            return 0
+        open_files: Set[str] = set()
+        for proc in browsers:
+            try:
+                for fd in os.scandir(Path(self.proc_root, str(proc.pid), 'fd')):
+                    open_files.add(os.readlink(fd.path))
+                for line in Path(self.proc_root, str(proc.pid), 'maps').read_text().splitlines():
+                    if str(self.shm_dir) in line:
+                        open_files.add(line.split(None, 5)[-1])
+            except OSError:
+                continue
+        removed = 0
+        for entry in self.shm_dir.iterdir():
+            if not entry.name.startswith(TEMP_PREFIXES) or str(entry) in open_files:
+                continue
+            try:
+                if now - entry.stat().st_mtime < self.ttl:
+                    continue
+                entry.unlink()
+                removed += 1
+            except OSError:
+                continue
+        if removed:
+            logger.info(f"🧹 {removed} sahipsiz /dev/shm dosyası silindi")
+        return removed
+
+    def snapshot(self) -> Dict:
+        """/health için: canlı ve toplanan browser sayıları"""
+        live = len(self.live_drivers())
+        with self._lock:
+            return {
+                'live': live,
+                'browser_processes': self.browser_processes,
+                'reaped': dict(self.reaped),
+                'temp_removed': dict(self.temp_removed),
+                'last_sweep': self.last_sweep,
+                'ttl_seconds': self.ttl,
+            }
+
+
+# Process genelinde paylaşılan browser supervisor'ı
+browser_supervisor = BrowserSupervisor()
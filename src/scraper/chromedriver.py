@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from loguru import logger
+
+from src.config.settings import settings
+
+_lock = threading.Lock()
+_resolved: Optional[str] = None
+# CHROMEDRIVER_PATH Chrome ile uyumsuz çıktı: bu process'te atlanır
+_pinned_failed = False
+
+
+def _usable(path: str) -> bool:
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def chromedriver_path() -> str:
+    """chromedriver binary yolu: process içinde bir kez çözülür
+
+    Sıra: CHROMEDRIVER_PATH (uyumsuz çıkmadıysa), önbellek dosyası (CHROMEDRIVER_CACHE_FILE, Docker
+    build'de yazılır), son çare ChromeDriverManager().install() (sürüm kontrolü
+    ve gerekirse indirme). Bulunan yol önbellek dosyasına yazılır; sonraki
+    process'ler ağa çıkmadan başlar.
+    """
+    global _resolved
+    if _resolved is not None:
+        return _resolved
+    with _lock:
+        if _resolved is not None:
+            return _resolved
+
+        if not _pinned_failed and _usable(settings.chromedriver_path):
+            _resolved = settings.chromedriver_path
+            return _resolved
+
+        cache_file = Path(settings.chromedriver_cache_file)
+        try:
+            cached = cache_file.read_text(encoding='utf-8').strip()
+        except OSError:
+            cached = ""
+        if _usable(cached):
+            _resolved = cached
+            logger.debug(f"chromedriver önbellekten: {cached}")
+            return _resolved
+
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        started = time.perf_counter()
+        path = ChromeDriverManager().install()
+        logger.info(f"chromedriver çözüldü ({time.perf_counter() - started:.1f}s): {path}")
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_file.with_suffix('.tmp')
+            tmp_path.write_text(path, encoding='utf-8')
+            tmp_path.replace(cache_file)
+        except OSError as e:
+            logger.warning(f"chromedriver yolu önbelleğe yazılamadı ({cache_file}): {e}")
+        _resolved = path
+        return _resolved
+
+
+def invalidate():
+    """Çözülen yol Chrome sürümüyle uyuşmuyor: sonraki çağrı yeniden çözsün
+
+    Uyuşmayan yol CHROMEDRIVER_PATH ise aynı binary'yi tekrar denemek anlamsız;
+    process'in geri kalanında atlanır ve webdriver-manager ile çözülür.
+    """
+    global _resolved, _pinned_failed
+    with _lock:
+        if _resolved is not None and _resolved == settings.chromedriver_path:
+            logger.warning(f"CHROMEDRIVER_PATH ({_resolved}) Chrome sürümüyle uyumsuz, webdriver-manager ile çözülecek")
+            _pinned_failed = True
+        _resolved = None
+        try:
+            Path(settings.chromedriver_cache_file).unlink()
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    # Docker build: python -m src.scraper.chromedriver
+    print(chromedriver_path())
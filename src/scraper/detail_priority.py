@@ -0,0 +1,162 @@
+import heapq
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime
+from urllib.parse import parse_qsl, urlsplit
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+from src.config.settings import settings
+from src.utils.helpers import is_banking_related
+
+# Faz 2 media durumu (ad_data['media_status'])
+MEDIA_RESOLVED = "resolved"
+MEDIA_CACHED = "cached"
+MEDIA_UNRESOLVED = "unresolved"
+MEDIA_NO_DETAIL = "no_detail_url"
+
+# Skor ağırlıkları
+WHITELIST_POINTS = 100
+BANKING_POINTS = 50
+RECENCY_WINDOW_DAYS = 30  # Son 30 günde gösterilen reklama gün başına 1 puan
+
+LAST_SHOWN_FORMATS = ("%m/%d/%Y", "%Y-%m-%d", "%d/%m/%Y")
+
+# BANKING_KEYWORDS env boşsa kullanılır
+DEFAULT_BANKING_KEYWORDS = ["banka", "kredi", "hesap", "kart", "faiz"]
+
+
+def parse_shown_date(value: str) -> Optional[datetime]:
+    for fmt in LAST_SHOWN_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), fmt)
+        except (ValueError, AttributeError):
+            continue
+    return None
+
+
+def bank_name_pattern(names: Iterable[str]) -> Optional[Pattern]:
+    """Banka isimleri için kelime sınırlı regex ("teb" → "TEB A.Ş." eşleşir, "tebrikler" eşleşmez)"""
+    names = [re.escape(name.strip()) for name in names if name and name.strip()]
+    if not names:
+        return None
+    return re.compile(r'\b(?:' + '|'.join(names) + r')\b', re.IGNORECASE)
+
+
+def score_ad(metadata: Dict,
+             keywords: List[str],
+             whitelist: Optional[List[str]] = None,
+             now: Optional[datetime] = None,
+             bank_names: Optional[Pattern] = None) -> int:
+    """Detay sayfası önceliği: whitelist > bankacılık eşleşmesi > yakın zamanda gösterilme
+
+    keywords reklam metni + advertiser'da aranır; bank_names sadece advertiser
+    adında, tam kelime olarak.
+    """
+    advertiser = (metadata.get('advertiser_name') or '').upper()
+    score = 0
+
+    if whitelist and any(name.upper() in advertiser for name in whitelist if name):
+        score += WHITELIST_POINTS
+
+    is_banking, _ = is_banking_related(f"{metadata.get('ad_text', '')} {advertiser}", keywords)
+    if is_banking or (bank_names is not None and bank_names.search(advertiser)):
+        score += BANKING_POINTS
+
+    last_shown = parse_shown_date(metadata.get('last_shown') or '')
+    if last_shown:
+        age_days = ((now or datetime.now()) - last_shown).days
+        score += max(0, RECENCY_WINDOW_DAYS - max(age_days, 0))
+
+    return score
+
+
+class DetailQueue:
+    """Faz 2 için öncelik kuyruğu (heapq)
+
+    Eşit skorda listing sırası korunur (scrape_index). Zaman bütçesi bittiğinde
+    kuyrukta kalanlar drain() ile 'unresolved' olarak döner.
+    """
+
+    def __init__(self, whitelist: Optional[List[str]] = None):
+        # Boş keyword her metinle eşleşir, filtrele
+        self.keywords = [k for k in settings.banking_keywords if k.strip()] or DEFAULT_BANKING_KEYWORDS
+        # Banka isimleri de sinyal, ama alt dize olarak değil ("param" ⊂ "parametre")
+        self.bank_names = bank_name_pattern(settings.turkish_banks)
+        self.whitelist = whitelist
+        self._heap: List[Tuple[int, int, Dict]] = []
+        self._now = datetime.now()
+
+    def push(self, metadata: Dict):
+        score = score_ad(metadata, self.keywords, self.whitelist, self._now, self.bank_names)
+        metadata['priority_score'] = score
+        heapq.heappush(self._heap, (-score, metadata.get('scrape_index', 0), metadata))
+
+    def extend(self, items: Iterable[Dict]):
+        for metadata in items:
+            self.push(metadata)
+
+    def pop(self) -> Dict:
+        return heapq.heappop(self._heap)[2]
+
+    def drain(self) -> List[Dict]:
+        """Kalan öğeleri öncelik sırasıyla boşalt"""
+        items = []
+        while self._heap:
+            items.append(self.pop())
+        return items
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+def signed_url_expired(url: str, now: Optional[float] = None) -> bool:
+    """İmzalı CDN URL'sinin x-expires (unix zamanı) parametresi geçmişte mi"""
+    try:
+        params = dict(parse_qsl(urlsplit(url).query))
+        return float(params['x-expires']) <= (now if now is not None else time.time())
+    except (KeyError, ValueError):
+        return False
+
+
+class ResolvedMediaCache:
+    """ad_id → detay sayfasından çözülmüş media (LRU + TTL)
+
+    Keep-alive scraper'larda saatlerce yaşar; imzalı CDN URL'leri expire
+    olduğu için ttl_seconds'tan eski veya x-expires'ı geçmiş kayıt miss sayılır
+    (detay sayfası tekrar açılır).
+    """
+
+    def __init__(self, max_entries: int = 2000, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = settings.media_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        # ad_id → (eklenme zamanı, media_data)
+        self._items: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+
+    def _expired(self, stored_at: float, media_data: Dict) -> bool:
+        now = time.time()
+        if self.ttl_seconds and now - stored_at >= self.ttl_seconds:
+            return True
+        return any(signed_url_expired(url, now) for url in media_data.get('media_urls') or [] if isinstance(url, str))
+
+    def get(self, ad_id: Optional[str]) -> Optional[Dict]:
+        if not ad_id or ad_id not in self._items:
+            return None
+        stored_at, media_data = self._items[ad_id]
+        if self._expired(stored_at, media_data):
+            del self._items[ad_id]
+            return None
+        self._items.move_to_end(ad_id)
+        return media_data
+
+    def put(self, ad_id: Optional[str], media_data: Dict):
+        # Sadece media bulunan sonuçlar cache'lenir (boş sonuç tekrar denenmeli)
+        if not ad_id or not media_data.get('media_urls'):
+            return
+        self._items[ad_id] = (time.time(), dict(media_data))
+        self._items.move_to_end(ad_id)
+        while len(self._items) > self.max_entries:
+            self._items.popitem(last=False)
+
+    def __contains__(self, ad_id: str) -> bool:
+        return self.get(ad_id) is not None
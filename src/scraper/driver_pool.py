@@ -0,0 +1,154 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+from loguru import logger
+
+from src.config.settings import settings
+from src.scraper.tiktok_selenium_scraper import TikTokSeleniumScraper
+from src.utils.circuit_breaker import breakers
+from src.utils.proxy_manager import ProxyPool, proxy_pool as default_proxy_pool
+
+
+class PooledDriver:
+    """Pool'daki tek browser: profil slot'u, scraper ve bağlı proxy'de yapılan job sayısı"""
+
+    def __init__(self, slot: int, scraper: TikTokSeleniumScraper):
+        self.slot = slot
+        self.scraper = scraper
+        self.jobs_on_proxy = 0
+
+    @property
+    def identity(self) -> str:
+        return self.scraper.identity
+
+
+class DriverPool:
+    """Sabit sayıda keep-alive Chrome; her biri bir proxy'ye bağlı
+
+    checkout() en iyi egress'e sahip boş browser'ı verir (proxy varsa en hızlı
+    sağlıklı proxy, yoksa circuit breaker'ı kapalı kimlik). checkin() sonrası
+    proxy_rotation_interval job dolduysa veya proxy sağlıksızsa browser başka
+    bir proxy'ye bağlanır. Proxy yoksa tüm browser'lar direkt bağlantı kullanır.
+    """
+
+    def __init__(self,
+                 size: int,
+                 headless: bool = True,
+                 proxies: Optional[ProxyPool] = None,
+                 rotation_interval: Optional[int] = None,
+                 first_slot: int = 0):
+        self.proxies = proxies if proxies is not None else default_proxy_pool
+        self.headless = headless
+        # Pool'un kullandığı profil slot'ları [first_slot, end_slot)
+        self.end_slot = first_slot + size
+        self.rotation_interval = rotation_interval or settings.proxy_rotation_interval
+        self._all: List[PooledDriver] = []
+        self._idle: List[PooledDriver] = []
+        self._idle_changed = threading.Condition()
+
+        # first_slot: pool dışındaki bir browser'ın profil slot'u ile çakışmasın
+        for slot in range(first_slot, first_slot + size):
+            proxy = self.proxies.choose(exclude=self._bound_identities())
+            scraper = TikTokSeleniumScraper(headless=headless, profile_slot=slot, keep_alive=True, proxy=proxy,
+                                            proxy_pool=self.proxies)
+            worker = PooledDriver(slot, scraper)
+            self._all.append(worker)
+            self._idle.append(worker)
+
+    def _bound_identities(self) -> List[str]:
+        return [worker.identity for worker in self._all]
+
+    def _score(self, worker: PooledDriver) -> tuple:
+        proxy = worker.scraper.proxy
+        if proxy is not None:
+            return self.proxies.rank(proxy)
+        breaker = breakers.get(worker.identity)
+        return (not breaker.available(), breaker.seconds_until_probe())
+
+    def checkout(self) -> PooledDriver:
+        """Boş browser al (yoksa bekle): en iyi proxy/kimlik önce"""
+        with self._idle_changed:
+            while not self._idle:
+                self._idle_changed.wait()
+            worker = min(self._idle, key=self._score)
+            self._idle.remove(worker)
+            return worker
+
+    def checkout_idle(self, limit: int) -> List[PooledDriver]:
+        """Beklemeden en fazla limit kadar boş browser al (boş yoksa boş liste)"""
+        with self._idle_changed:
+            workers = sorted(self._idle, key=self._score)[:max(0, limit)]
+            for worker in workers:
+                self._idle.remove(worker)
+            return workers
+
+    @contextmanager
+    def borrow(self, primary: TikTokSeleniumScraper, limit: int) -> Iterator[List[TikTokSeleniumScraper]]:
+        """primary'nin job'ına beklemeden en fazla limit boş browser ödünç ver
+
+        Ödünç browser'lar job boyunca primary'nin ad_id dedup registry'sini ve
+        deadline'ını paylaşır. İade edilirken kendi değerleri geri konur,
+        istatistikleri ve açtıkları detay sayfaları primary'ye eklenir.
+        headless ayarı farklı pool'dan browser verilmez.
+        """
+        workers = self.checkout_idle(limit) if self.headless == primary.headless else []
+        saved = []
+        for worker in workers:
+            scraper = worker.scraper
+            saved.append((scraper.seen_ads, scraper.deadline, scraper.detail_pages_opened))
+            scraper.stats.reset()
+            scraper.seen_ads = primary.seen_ads
+            scraper.deadline = primary.deadline
+        try:
+            yield [worker.scraper for worker in workers]
+        finally:
+            for worker, (seen_ads, deadline, detail_pages) in zip(workers, saved):
+                scraper = worker.scraper
+                primary.stats.merge(scraper.stats)
+                primary.detail_pages_opened += scraper.detail_pages_opened - detail_pages
+                scraper.seen_ads, scraper.deadline = seen_ads, deadline
+                scraper.checkpoint = None
+                self.checkin(worker)
+
+    def checkin(self, worker: PooledDriver):
+        """Browser'ı pool'a geri ver, gerekirse proxy'sini döndür"""
+        worker.jobs_on_proxy += 1
+        self._maybe_rotate(worker)
+        with self._idle_changed:
+            self._idle.append(worker)
+            self._idle_changed.notify()
+
+    def _maybe_rotate(self, worker: PooledDriver):
+        proxy = worker.scraper.proxy
+        if proxy is None or len(self.proxies) < 2:
+            return
+        healthy = self.proxies.is_healthy(proxy)
+        if healthy and worker.jobs_on_proxy < self.rotation_interval:
+            return
+        others = [identity for identity in self._bound_identities() if identity != worker.identity]
+        replacement = self.proxies.choose(exclude=others + [worker.identity])
+        if replacement is None or replacement.identity == proxy.identity:
+            return
+        if self.proxies.rank(replacement) >= self.proxies.rank(proxy) and not self.proxies.is_healthy(replacement):
+            return  # Sağlıksız proxy'ye geçmektense mevcut kalsın
+        reason = "sağlıksız" if not healthy else f"{worker.jobs_on_proxy} job"
+        logger.info(f"🔀 slot-{worker.slot}: {proxy.identity} → {replacement.identity} ({reason})")
+        worker.scraper.bind_proxy(replacement, self.proxies)
+        worker.jobs_on_proxy = 0
+
+    def warm(self) -> int:
+        """Tüm browser'ları şimdi başlat (servis açılışı); başlatılabilen sayısını döndür"""
+        started = 0
+        for worker in self._all:
+            if worker.scraper.setup_driver():
+                started += 1
+            else:
+                logger.warning(f"slot-{worker.slot} browser ısıtılamadı")
+        return started
+
+    def shutdown(self):
+        for worker in self._all:
+            worker.scraper.shutdown()
+
+    def __len__(self) -> int:
+        return len(self._all)
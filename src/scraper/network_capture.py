@@ -0,0 +1,148 @@
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from src.utils.media_urls import classify_media_url
+
+# Browser tarafında video kaynağı kabul edilen URL işaretleri (JS RegExp olarak da kullanılır)
+VIDEO_URL_JS_PATTERN = r"\.(mp4|webm|mov|m4v)([?#/]|$)|/video/|mime_type=video"
+
+# Performance log ön filtresi: json.loads'tan önce ham mesajda aranır.
+# requestWillBeSent de dahil: resource profile ile bloklanan video istekleri
+# response üretmez ama URL'leri bu mesajda görünür.
+_RESPONSE_METHOD = '"Network.responseReceived"'
+_REQUEST_METHOD = '"Network.requestWillBeSent"'
+_VIDEO_HINT = re.compile(r"video|\.mp4|\.webm|\.mov|\.m4v", re.IGNORECASE)
+
+# Sayfa içinde çalışır: PerformanceObserver (resource timing) + <video> src kontrolü.
+# İlk uygun URL'de veya timeout'ta callback'i çağırır; Python tarafı polling yapmaz.
+_WATCH_SCRIPT = """
+const pattern = new RegExp(arguments[0], 'i');
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const found = [];
+let finished = false;
+let observer = null;
+let poll = null;
+let timer = null;
+
+function finish() {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearInterval(poll);
+    clearTimeout(timer);
+    done(found);
+}
+function consider(url, initiator) {
+    if (!url || url.startsWith('blob:') || found.includes(url)) return;
+    if (initiator === 'video' || pattern.test(url)) {
+        found.push(url);
+        finish();
+    }
+}
+function scanVideos() {
+    document.querySelectorAll('video, video source').forEach(
+        v => consider(v.currentSrc || v.src, 'video'));
+}
+
+try {
+    observer = new PerformanceObserver(list => list.getEntries().forEach(
+        e => consider(e.name, e.initiatorType)));
+    observer.observe({type: 'resource', buffered: true});
+} catch (e) {
+    performance.getEntriesByType('resource').forEach(e => consider(e.name, e.initiatorType));
+}
+scanVideos();
+poll = setInterval(scanVideos, 250);
+timer = setTimeout(finish, timeoutMs);
+"""
+
+
+class NetworkCapture:
+    """Detay sayfasında video URL yakalama
+
+    Filtreleme browser tarafında yapılır: sayfa içi PerformanceObserver sadece
+    video kaynaklarını döndürür ve ilk eşleşmede biter. Performance log sadece
+    tamamlayıcı olarak bir kez boşaltılır ve yalnızca video işareti taşıyan
+    Network.responseReceived / requestWillBeSent mesajları JSON parse edilir.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.parsed_messages = 0
+        self.skipped_messages = 0
+
+    def wait_for_video(self, timeout_seconds: float) -> List[str]:
+        """İlk video kaynağı görünene kadar bekle (en fazla timeout_seconds)
+
+        Script timeout'u sadece bu çağrı için uzatılır: pool/keep-alive
+        driver'daki sonraki execute_async_script'ler eski değerle çalışır.
+        """
+        timeout_ms = int(max(timeout_seconds, 0) * 1000)
+        try:
+            previous_timeout = self.driver.timeouts.script
+        except Exception as e:
+            logger.debug(f"Script timeout okunamadı: {e}")
+            previous_timeout = None
+        try:
+            self.driver.set_script_timeout(timeout_seconds + 5)
+            urls = self.driver.execute_async_script(_WATCH_SCRIPT, VIDEO_URL_JS_PATTERN, timeout_ms) or []
+        except Exception as e:
+            logger.debug(f"Sayfa içi video watcher çalışmadı: {e}")
+            return []
+        finally:
+            if previous_timeout is not None:
+                try:
+                    self.driver.set_script_timeout(previous_timeout)
+                except Exception as e:
+                    logger.debug(f"Script timeout geri yüklenemedi: {e}")
+        return [url for url in urls if classify_media_url(url).is_video]
+
+    def drain_performance_log(self) -> List[str]:
+        """Performance log buffer'ını boşalt ve video response URL'lerini döndür"""
+        try:
+            logs = self.driver.get_log('performance')
+        except Exception as e:
+            logger.debug(f"Performance log okunamadı: {e}")
+            return []
+        return self.parse_performance_logs(logs)
+
+    def parse_performance_logs(self, logs: Iterable[Dict[str, Any]]) -> List[str]:
+        """Sadece video işaretli response/request mesajlarını parse et"""
+        video_urls = []
+        for entry in logs:
+            raw = entry.get('message', '')
+            if (_RESPONSE_METHOD not in raw and _REQUEST_METHOD not in raw) or not _VIDEO_HINT.search(raw):
+                self.skipped_messages += 1
+                continue
+            self.parsed_messages += 1
+            url = self._video_url_from_message(raw)
+            if url:
+                video_urls.append(url)
+        return video_urls
+
+    def capture(self, timeout_seconds: float) -> List[str]:
+        """Watcher + log boşaltma; imzası farklı aynı medya tek sayılır"""
+        video_urls = self.wait_for_video(timeout_seconds)
+        video_urls.extend(self.drain_performance_log())
+        unique = list({classify_media_url(url).canonical: url for url in video_urls}.values())
+        logger.debug(
+            f"Network capture: {len(unique)} video URL "
+            f"(parse edilen log: {self.parsed_messages}, atlanan: {self.skipped_messages})"
+        )
+        return unique
+
+    @staticmethod
+    def _video_url_from_message(raw: str) -> Optional[str]:
+        try:
+            params = json.loads(raw)['message']['params']
+            response = params.get('response') or params['request']
+        except (ValueError, KeyError, TypeError):
+            return None
+        url = response.get('url', '')
+        if classify_media_url(url, response.get('mimeType', '')).is_video:
+            return url
+        return None
@@ -0,0 +1,87 @@
+import json
+from typing import Any, Dict, Iterable, List, Tuple
+
+from loguru import logger
+
+PROFILE_METADATA_ONLY = "metadata-only"
+PROFILE_MEDIA_URL_DISCOVERY = "media-url-discovery"
+PROFILE_FULL = "full"
+
+# Network.setBlockedURLs wildcard pattern'leri ('*' destekli)
+IMAGE_PATTERNS = [
+    "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*", "*.ico*",
+    "*~tplv-*",  # TikTok CDN image dönüşümleri (uzantısız .image URL'leri)
+]
+MEDIA_PATTERNS = [
+    "*.mp4*", "*.webm*", "*.mov*", "*.m4v*", "*.m4s*", "*.mp3*",
+    "*/video/tos/*", "*mime_type=video*",
+]
+FONT_PATTERNS = ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"]
+TRACKER_PATTERNS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*connect.facebook.net*", "*analytics.tiktok.com*", "*mon.tiktokv.com*",
+    "*mcs.tiktokv.com*", "*hotjar.com*", "*sentry.io*",
+]
+
+# Sayfa DOM'u ve API XHR'ları her profilde açık kalır. Video/img src
+# attribute'ları istek bloklansa da DOM'da durduğu için URL keşfi çalışır.
+# media-url-discovery görselleri açık bırakır: detay sayfası video yoksa
+# thumbnail <img>'e düşer ve lazy-load eden player'lar poster yüklenmesini bekler.
+PROFILES: Dict[str, List[str]] = {
+    PROFILE_METADATA_ONLY: IMAGE_PATTERNS + MEDIA_PATTERNS + FONT_PATTERNS + TRACKER_PATTERNS,
+    PROFILE_MEDIA_URL_DISCOVERY: MEDIA_PATTERNS + FONT_PATTERNS + TRACKER_PATTERNS,
+    PROFILE_FULL: [],
+}
+
+# Bloklanan istek başına tahmini byte (CDP resource type → ortalama boyut)
+TYPICAL_RESOURCE_BYTES = {
+    "Image": 45_000,
+    "Media": 900_000,
+    "Font": 35_000,
+    "Script": 60_000,
+    "XHR": 2_000,
+    "Fetch": 2_000,
+    "Ping": 500,
+    "Other": 10_000,
+}
+
+
+def apply_resource_profile(driver, profile: str) -> bool:
+    """Aktif tab için profile ait URL bloklarını uygula (sonraki istekler için geçerli)"""
+    if profile not in PROFILES:
+        logger.warning(f"Bilinmeyen resource profile: {profile}, '{PROFILE_FULL}' kullanılıyor")
+        profile = PROFILE_FULL
+    try:
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': PROFILES[profile]})
+        return True
+    except Exception as e:
+        logger.debug(f"Resource profile uygulanamadı ({profile}): {e}")
+        return False
+
+
+def summarize_page_weight(logs: Iterable[Dict[str, Any]]) -> Tuple[int, int, int]:
+    """Performance log'dan (alınan byte, bloklanan istek, tahmini kazanılan byte)
+
+    Network.setBlockedURLs ile engellenen istekler Network.loadingFailed
+    (blockedReason='inspector') olarak görünür; sadece bu iki mesaj parse edilir.
+    """
+    received = 0
+    blocked = 0
+    saved = 0
+    for entry in logs:
+        raw = entry.get('message', '')
+        if 'Network.loadingFinished' in raw:
+            try:
+                received += int(json.loads(raw)['message']['params'].get('encodedDataLength', 0))
+            except (ValueError, KeyError, TypeError):
+                continue
+        elif 'Network.loadingFailed' in raw and '"inspector"' in raw:
+            try:
+                params = json.loads(raw)['message']['params']
+            except (ValueError, KeyError, TypeError):
+                continue
+            if params.get('blockedReason') != 'inspector':
+                continue
+            blocked += 1
+            saved += TYPICAL_RESOURCE_BYTES.get(params.get('type', 'Other'), TYPICAL_RESOURCE_BYTES['Other'])
+    return received, blocked, saved
@@ -1,23 +1,42 @@
 import requests
 import time
 import json
-from typing import List, Dict, Optional, Any
+import math
+import threading
+from collections import deque
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from loguru import logger
-from datetime import datetime
+from datetime import datetime, timedelta
 import re
 from pathlib import Path
 
 from src.config.settings import settings
 from src.models.ad_model import TikTokAd, MediaType, AdStatus, ScrapingResult
 from src.utils.helpers import is_banking_related, clean_text, safe_sleep, create_filename_safe
+from src.utils.media_urls import classify_media_url
+from src.utils.deadline import Deadline
+from src.utils.checkpoint import JobCheckpoint
+from src.utils.metrics import (
+    phase_timer, SCRAPE_JOBS_TOTAL, ADS_SCRAPED_TOTAL, ADS_PER_SECOND,
+    DETAIL_PAGES_PER_AD, CACHE_HITS_TOTAL, JOB_PEAK_BROWSER_RSS_MB
+)
 
 from src.scraper.tiktok_selenium_scraper import TikTokSeleniumScraper
+from src.scraper.driver_pool import DriverPool
+from src.scraper.time_windows import TimeWindow
 
 class TikTokAdScraper:
     """TikTok Ad Library Scraper - Selenium ile Türkiye odaklı"""
     
-    def __init__(self, headless: bool = True):
-        self.selenium_scraper = TikTokSeleniumScraper(headless=headless)
+    def __init__(self,
+                 headless: bool = True,
+                 selenium_scraper: Optional[TikTokSeleniumScraper] = None,
+                 driver_pool: Optional[DriverPool] = None):
+        # selenium_scraper: daemon gibi uzun yaşayan process'lerde açık driver paylaşılır
+        self.selenium_scraper = selenium_scraper or TikTokSeleniumScraper(headless=headless)
+        # driver_pool: çok region'lı job'lar ek browser'ları bu (ısınmış) pool'dan ödünç alır
+        self.driver_pool = driver_pool
         self.scraped_ads = []
         self.seen_ad_hashes = set()  # Duplicate detection için
         
@@ -26,7 +45,15 @@ class TikTokAdScraper:
                    max_results: int = 200, 
                    search_type: str = "keyword",
                    advertiser_blacklist: Optional[List[str]] = None,
-                   advertiser_whitelist: Optional[List[str]] = None) -> ScrapingResult:
+                   advertiser_whitelist: Optional[List[str]] = None,
+                   deadline_seconds: Optional[float] = None,
+                   region: Optional[str] = None,
+                   days_back: int = 30,
+                   job_id: Optional[str] = None,
+                   start_time: Optional[datetime] = None,
+                   end_time: Optional[datetime] = None,
+                   partition: Optional[bool] = None,
+                   regions: Optional[List[str]] = None) -> ScrapingResult:
         """TikTok'ta reklam ara - Selenium ile
         
         Args:
@@ -35,29 +62,89 @@ class TikTokAdScraper:
             search_type: "keyword" = genel arama, "advertiser" = şirket adı araması
             advertiser_blacklist: Hariç tutulacak advertiser'lar (örn: ['QNB', 'ING'])
             advertiser_whitelist: Sadece dahil edilecek advertiser'lar (örn: ['GARANTI', 'AKBANK'])
+            deadline_seconds: Bu süre dolmadan eldeki sonuçlarla dön (truncated=True)
+            region: Ülke kodu (varsayılan settings.tiktok_country)
+            days_back: Kaç gün geriye gidilecek
+            job_id: Verilirse keyword bazında checkpoint tutulur; aynı job_id ile
+                yeniden çalıştırılan job tamamlanmış keyword'leri atlar
+            start_time / end_time: Verilirse days_back yerine tek zaman penceresi aranır
+                (batch'te paralel dağıtılan pencereler)
+            partition: days_back geçmiş reklam yoğunluğuna göre pencerelere bölünür
+                (None: days_back >= time_window_partition_min_days ise)
+            regions: Birden fazla ülke; region'lar browser pool'unda paralel aranır,
+                ad_id dedup ve max_results bütçesi region'lar arasında ortaktır
         """
         result = ScrapingResult()
+        regions = list(dict.fromkeys(regions or [region or settings.tiktok_country]))
+        region = regions[0]
+        window = None
+        if start_time or end_time:
+            end_time = end_time or datetime.now()
+            start_time = start_time or end_time - timedelta(days=days_back)
+            window = TimeWindow(start=start_time, end=end_time,
+                                label=f"{start_time:%Y%m%d%H%M}-{end_time:%Y%m%d%H%M}")
+        if partition is None:
+            partition = days_back >= settings.time_window_partition_min_days
+        params = {
+            'keywords': list(keywords or []), 'max_results': max_results, 'search_type': search_type,
+            'region': region, 'days_back': days_back, 'partition': partition,
+            'window': window.label if window else None,
+        }
+        checkpoints: List[JobCheckpoint] = []
+        if job_id and len(regions) == 1:
+            checkpoints.append(JobCheckpoint(job_id, params=params))
+        self.selenium_scraper.checkpoint = checkpoints[0] if checkpoints else None
+        detail_pages_before = self.selenium_scraper.detail_pages_opened
+        self.selenium_scraper.stats.reset()
+        self.selenium_scraper.seen_ads.reset()
+        self.selenium_scraper.deadline = Deadline(deadline_seconds, reserve=settings.deadline_reserve_seconds)
+        # Bölünen zaman pencereleri bu pool'dan ödünç alınan browser'larda paralel aranır
+        self.selenium_scraper.driver_pool = self.driver_pool
         
-        try:
-            logger.info(f"Selenium ile TikTok scraping başlatılıyor... Keywords: {keywords}, Search type: {search_type}")
-            
+        def search(selenium_scraper: TikTokSeleniumScraper, search_region: str, max_ads: int) -> List[Dict]:
+            selenium_scraper.setup_error = None
+            ads = search_with(selenium_scraper, search_region, max_ads)
+            # Selenium araması kurulum hatasını yutup boş liste döner: job başarısız sayılsın
+            if selenium_scraper.setup_error:
+                result.add_error(f"WebDriver kurulamadı ({search_region}): {selenium_scraper.setup_error}")
+            return ads
+        
+        def search_with(selenium_scraper: TikTokSeleniumScraper, search_region: str, max_ads: int) -> List[Dict]:
             # Keywords parametresini kullan
             if keywords and len(keywords) > 0:
                 if search_type == "keyword":
                     # KEYWORD SEARCH: Reklam içeriğinde ara (daha geniş)
-                    logger.info(f"KEYWORD araması: {keywords}")
-                    raw_ads_data = self.selenium_scraper.search_ads_by_keyword(keywords, max_results)
-                else:
-                    # ADVERTISER SEARCH: Şirket adında ara (dar)
-                    logger.info(f"ADVERTISER araması: {keywords}")
-                    raw_ads_data = self.selenium_scraper.search_ads_by_advertiser(keywords, max_results)
+                    logger.info(f"KEYWORD araması ({search_region}): {keywords}")
+                    return selenium_scraper.search_ads_by_keyword(
+                        keywords, max_ads, priority_advertisers=advertiser_whitelist,
+                        region=search_region, days_back=days_back, window=window, partition=partition
+                    )
+                # ADVERTISER SEARCH: Şirket adında ara (dar)
+                logger.info(f"ADVERTISER araması ({search_region}): {keywords}")
+                return selenium_scraper.search_ads_by_advertiser(
+                    keywords, max_ads, priority_advertisers=advertiser_whitelist,
+                    region=search_region, days_back=days_back, window=window, partition=partition
+                )
+            # Keywords yoksa tüm bankaları ara (fallback)
+            return selenium_scraper.search_banking_ads(max_ads)
+        
+        try:
+            logger.info(f"Selenium ile TikTok scraping başlatılıyor... Keywords: {keywords}, Search type: {search_type}, "
+                        f"Regions: {regions}")
+            
+            if len(regions) == 1:
+                raw_ads_data = search(self.selenium_scraper, region, max_results)
+                for ad_data in raw_ads_data:
+                    ad_data.setdefault('region', region)
             else:
-                # Keywords yoksa tüm bankaları ara (fallback)
-                raw_ads_data = self.selenium_scraper.search_banking_ads(max_results)
+                raw_ads_data, checkpoints = self._search_regions(
+                    regions, search, max_results, job_id, params, result
+                )
             
             logger.info(f"Raw data alındı: {len(raw_ads_data)} reklam")
             
             # Reklamları işle ve filtrele
+            timer = phase_timer('processing', self.selenium_scraper.stats.record_phase)
             filtered_count = 0
             for ad_data in raw_ads_data:
                 try:
@@ -123,6 +210,7 @@ class TikTokAdScraper:
                     if ad_hash in self.seen_ad_hashes:
                         logger.debug(f"Reklam duplicate nedeniyle atlandı: {ad.advertiser_name}")
                         filtered_count += 1
+                        CACHE_HITS_TOTAL.inc(cache='ad_hash')
                         
                         # #region agent log
                         try:
@@ -163,11 +251,15 @@ class TikTokAdScraper:
                     else:
                         result.text_ads += 1
                     
+                    if ad.media_status == 'unresolved':
+                        result.unresolved_ads += 1
+                    
                 except Exception as e:
                     logger.error(f"Reklam işlenirken hata: {e}")
                     result.failed_ads += 1
                     result.add_error(f"Reklam işleme hatası: {str(e)}")
             
+            timer.stop()
             if filtered_count > 0:
                 logger.info(f"Filtre ile {filtered_count} reklam hariç tutuldu")
             logger.info(f"Scraping tamamlandı. Toplam: {result.total_ads}, Banking: {result.banking_ads}")
@@ -177,8 +269,125 @@ class TikTokAdScraper:
             result.add_error(f"Selenium scraping hatası: {str(e)}")
         
         result.complete()
+        result.apply_performance(self.selenium_scraper.stats.summary())
+        self.selenium_scraper.deadline = Deadline()
+        self.selenium_scraper.checkpoint = None
+        self.selenium_scraper.driver_pool = None
+        for checkpoint in checkpoints:
+            result.resumed_units += checkpoint.resumed_units
+            result.failed_units.extend(checkpoint.failed_units)
+        # Eksiksiz biten job'ın checkpoint'leri silinir; kısmi job sonraki çalıştırmada devam eder
+        if not result.truncated and not result.failed_units and not result.errors:
+            for checkpoint in checkpoints:
+                checkpoint.clear()
+        result.duplicates_avoided = self.selenium_scraper.seen_ads.duplicates_avoided
+        detail_pages = self.selenium_scraper.detail_pages_opened - detail_pages_before
+        self._record_job_metrics(result, search_type, detail_pages)
         return result
     
+    def _search_regions(self,
+                        regions: List[str],
+                        search: Callable[[TikTokSeleniumScraper, str, int], List[Dict]],
+                        max_results: int,
+                        job_id: Optional[str],
+                        params: Dict[str, Any],
+                        result: ScrapingResult) -> Tuple[List[Dict], List[JobCheckpoint]]:
+        """Region'ları browser pool'unda paralel ara
+        
+        Ana scraper + (region_workers - 1) pool browser'ı sıradaki region'ı alır.
+        Ek browser'lar önce çağıranın pool'undan (API'nin ısınmış pool'u) beklemeden
+        ödünç alınır; boş browser yoksa region'lar daha az browser'la aranır. Pool
+        verilmemişse geçici bir pool, çağıranın pool slot'larından sonra açılır.
+        Her region kalan ortak bütçenin bitmemiş region'lara düşen payını
+        alır; erken biten region'ın kullanmadığı bütçe sonrakilere kalır.
+        ad_id dedup registry'si ve deadline tüm browser'larda ortaktır.
+        Checkpoint region başına tutulur (job_id:region).
+        """
+        primary = self.selenium_scraper
+        worker_count = min(len(regions), max(1, settings.region_workers))
+        pool = self.driver_pool
+        temporary = None
+        if worker_count > 1 and (pool is None or pool.headless != primary.headless):
+            first_slot = primary.profile_slot + 1
+            if pool is not None:
+                first_slot = max(first_slot, pool.end_slot)
+            pool = temporary = DriverPool(worker_count - 1, headless=primary.headless, first_slot=first_slot)
+        
+        pending = deque(regions)
+        lock = threading.Lock()
+        budget = {'collected': 0, 'reserved': 0}
+        all_ads: List[Dict] = []
+        checkpoints: List[JobCheckpoint] = []
+        
+        def run(selenium_scraper: TikTokSeleniumScraper):
+            while True:
+                with lock:
+                    if not pending:
+                        return
+                    search_region = pending.popleft()
+                    remaining = max_results - budget['collected'] - budget['reserved']
+                    quota = max(0, math.ceil(remaining / (len(pending) + 1)))
+                    budget['reserved'] += quota
+                timing = {'quota': quota, 'ads': 0, 'duration_seconds': 0.0, 'identity': selenium_scraper.identity}
+                ads: List[Dict] = []
+                if quota:
+                    checkpoint = None
+                    if job_id:
+                        checkpoint = JobCheckpoint(f"{job_id}:{search_region}", params={**params, 'region': search_region})
+                        with lock:
+                            checkpoints.append(checkpoint)
+                    selenium_scraper.checkpoint = checkpoint
+                    started = time.perf_counter()
+                    try:
+                        ads = search(selenium_scraper, search_region, quota)
+                    except Exception as e:
+                        logger.error(f"Region {search_region} hatası: {e}")
+                        timing['error'] = str(e)
+                        # Hatalı region'ın checkpoint'i silinmesin, job tekrar denendiğinde devam etsin
+                        result.add_error(f"Region {search_region} hatası: {e}")
+                    finally:
+                        selenium_scraper.checkpoint = None
+                    timing['duration_seconds'] = round(time.perf_counter() - started, 3)
+                for ad_data in ads:
+                    ad_data['region'] = search_region
+                timing['ads'] = len(ads)
+                logger.info(f"🌍 {search_region}: {len(ads)} reklam ({timing['duration_seconds']:.1f}s, bütçe {quota})")
+                with lock:
+                    budget['reserved'] -= quota
+                    budget['collected'] += len(ads)
+                    all_ads.extend(ads)
+                    result.region_timings[search_region] = timing
+        
+        try:
+            with pool.borrow(primary, worker_count - 1) if worker_count > 1 else nullcontext([]) as helpers:
+                if len(helpers) < worker_count - 1:
+                    logger.info(f"🌍 Pool'da {len(helpers)} boş browser var, region'lar {len(helpers) + 1} browser ile aranacak")
+                threads = [threading.Thread(target=run, args=(scraper,), name=f"region-{index}", daemon=True)
+                           for index, scraper in enumerate([primary] + helpers)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            if temporary is not None:
+                temporary.shutdown()
+        # Rapor ve çıktı sırası istekteki region sırası
+        order = {search_region: index for index, search_region in enumerate(regions)}
+        result.region_timings = dict(sorted(result.region_timings.items(), key=lambda item: order[item[0]]))
+        all_ads.sort(key=lambda ad_data: order[ad_data['region']])
+        return all_ads, checkpoints
+    
+    def _record_job_metrics(self, result: ScrapingResult, search_type: str, detail_pages: int):
+        """Job seviyesindeki metrikleri güncelle (/metrics endpoint'i için)"""
+        SCRAPE_JOBS_TOTAL.inc(search_type=search_type)
+        ADS_SCRAPED_TOTAL.inc(result.total_ads)
+        if result.duration_seconds:
+            ADS_PER_SECOND.observe(result.total_ads / result.duration_seconds)
+        if result.total_ads:
+            DETAIL_PAGES_PER_AD.observe(detail_pages / result.total_ads)
+        if result.peak_browser_rss_mb:
+            JOB_PEAK_BROWSER_RSS_MB.observe(result.peak_browser_rss_mb)
+    
     def _compute_ad_hash(self, ad: 'TikTokAd') -> str:
         """Reklam içeriğinden unique hash oluştur (duplicate detection için)"""
         import hashlib
@@ -186,7 +395,8 @@ class TikTokAdScraper:
         # Hash için kullanılacak alanlar
         advertiser = (ad.advertiser_name or "").strip().lower()
         text = (ad.ad_text or "").strip().lower()
-        media = tuple(sorted(ad.media_urls)) if ad.media_urls else ()
+        # İmzalı CDN URL'leri her istekte değişir, canonical form kullan
+        media = tuple(sorted(classify_media_url(url).canonical for url in ad.media_urls)) if ad.media_urls else ()
         
         # Birleştir ve hash'le
         content = f"{advertiser}|{text}|{media}"
@@ -206,10 +416,10 @@ class TikTokAdScraper:
             elif raw_media_type == 'image':
                 media_type = MediaType.IMAGE
             elif media_urls:  # URL varsa ama type yoksa, URL'den tahmin et
-                first_url = media_urls[0].lower()
-                if any(ext in first_url for ext in ['.mp4', '.mov', '.avi', 'video']):
+                url_type = classify_media_url(media_urls[0]).media_type
+                if url_type == 'video':
                     media_type = MediaType.VIDEO
-                elif any(ext in first_url for ext in ['.jpg', '.jpeg', '.png', '.gif', 'image']):
+                elif url_type == 'image':
                     media_type = MediaType.IMAGE
                 else:
                     # TikTok CDN URL'leri genelde video
@@ -231,10 +441,12 @@ class TikTokAdScraper:
                 ad_text=ad_text,
                 media_type=media_type,
                 media_urls=media_urls,
+                media_status=ad_data.get('media_status', 'resolved'),
                 is_banking_ad=is_banking,
                 banking_keywords_found=found_keywords,
                 scraped_at=datetime.now(),
                 source_url=ad_data.get('ad_url', ''),
+                region=ad_data.get('region'),
                 raw_data=ad_data
             )
             
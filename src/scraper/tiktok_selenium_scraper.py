@@ -8,31 +8,90 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException
 import time
 import json
+import math
 import re
+import threading
 import requests
-from urllib.parse import quote
+from urllib.parse import quote, urlsplit, parse_qs
+from collections import deque
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 from loguru import logger
 
 from src.config.settings import settings
-from src.utils.helpers import safe_sleep, clean_text
-def check_url_content_type(url: str, timeout: int = 2) -> str:
+from src.utils.helpers import clean_text
+from src.utils.debug_artifacts import DebugArtifactManager, TRIGGER_BAN, TRIGGER_FAILURE, TRIGGER_SAMPLE
+from src.utils.metrics import (
+    phase_timer, BAN_DETECTIONS_TOTAL, DETAIL_PAGES_TOTAL, CACHE_HITS_TOTAL, BROWSER_RSS_BYTES, BROWSER_RECYCLES_TOTAL
+)
+from src.utils.job_stats import JobStats
+from src.utils.seen_registry import SeenAdRegistry
+from src.utils.deadline import Deadline
+from src.utils.media_urls import classify_media_url
+from src.utils.rate_limiter import rate_limiter
+from src.utils.circuit_breaker import DIRECT_IDENTITY, breakers
+from src.utils.proxy_manager import Proxy, ProxyPool, proxy_pool as default_proxy_pool
+from src.utils.checkpoint import JobCheckpoint
+from src.scraper.network_capture import NetworkCapture
+from src.scraper.browser_profile import PersistentProfile
+from src.scraper import chromedriver
+from src.scraper.browser_memory import driver_pid, js_heap_used, process_tree_rss
+from src.scraper.browser_supervisor import browser_supervisor
+from src.scraper.time_windows import TimeWindow, ad_density, density_key, plan_windows
+from src.scraper.detail_priority import (
+    DetailQueue, ResolvedMediaCache, MEDIA_CACHED, MEDIA_NO_DETAIL, MEDIA_RESOLVED, MEDIA_UNRESOLVED
+)
+from src.scraper.resource_profiles import (
+    PROFILE_FULL, PROFILE_METADATA_ONLY, apply_resource_profile, summarize_page_weight
+)
+
+# Deadline altında adım başına tahmini süreler (saniye)
+SEARCH_MIN_SECONDS = 20       # Sayfa + autocomplete + sonuç bekleme
+VIEW_MORE_SECONDS = 13        # Buton arama + 10s yükleme
+METADATA_RESERVE_SECONDS = 5  # View more sonrası kart keşfi + metadata için ayrılan
+DETAIL_PAGE_SECONDS = 8       # İlk tahmin, gözlenen sürelerle güncellenir
+MEDIA_PROBE_SECONDS = 2
+
+# Arama sayfasındaki advertiser/keyword input'u
+SEARCH_INPUT_SELECTOR = "input[placeholder*='Advertiser'], input[placeholder*='advertiser'], input[placeholder*='keyword']"
+
+BAN_INDICATORS = [
+    "access denied",
+    "blocked",
+    "captcha",
+    "verify you are human",
+    "unusual traffic",
+    "forbidden",
+    "temporarily unavailable"
+]
+
+# Sayfa sağlığı tek execute_script ile: body text Python'a taşınmadan tarayıcıda taranır
+PAGE_STATE_SCRIPT = """
+const text = ((document.body && document.body.innerText) || '').toLowerCase();
+return {
+    url: location.href,
+    ready: document.readyState,
+    text_length: text.trim().length,
+    has_search_input: !!document.querySelector(arguments[1]),
+    ban_indicator: arguments[0].find(i => text.includes(i)) || null
+};
+"""
+
+def check_url_content_type(url: str, timeout: int = 2, proxies: Optional[Dict[str, str]] = None) -> str:
     """
     URL'nin Content-Type'ını HEAD request ile kontrol et
     Returns: 'video', 'image', or 'unknown'
     
     NOT: Defensive coding - hata durumunda 'unknown' döner
     """
+    timer = phase_timer('media_probe')
     try:
         # Kısa timeout (2s) - TikTok CDN bazen yavaş yanıt verir
-        response = requests.head(url, timeout=timeout, allow_redirects=True)
+        response = requests.head(url, timeout=timeout, allow_redirects=True, proxies=proxies)
         content_type = response.headers.get('Content-Type', '').lower()
         
         if 'video' in content_type or 'mp4' in content_type:
@@ -53,6 +112,8 @@ def check_url_content_type(url: str, timeout: int = 2) -> str:
     except Exception as e:
         logger.warning(f"❌ Content-Type kontrolü başarısız: {str(e)[:100]}")
         return 'unknown'
+    finally:
+        timer.stop()
 
 
 class NetworkVideoExtractor:
@@ -73,27 +134,12 @@ class NetworkVideoExtractor:
             logger.warning(f"Network monitoring başlatılamadı: {e}")
     
     def capture_network_requests(self, duration_seconds: int = 10) -> List[str]:
-        """Network isteklerini yakala ve video URL'lerini filtrele"""
-        video_urls = []
+        """Network isteklerini yakala ve video URL'lerini filtrele
         
+        En fazla duration_seconds bekler, ilk video kaynağı görüldüğünde hemen döner.
+        """
         try:
-            # Belirli süre boyunca network isteklerini topla
-            start_time = time.time()
-            
-            while time.time() - start_time < duration_seconds:
-                logs = self.driver.get_log('performance')
-                
-                for log in logs:
-                    try:
-                        message = json.loads(log['message'])
-                        self._process_network_message(message, video_urls)
-                    except (json.JSONDecodeError, KeyError):
-                        continue
-                
-                time.sleep(0.5)  # CPU kullanımını azalt
-            
-            # Duplicate'leri kaldır
-            unique_video_urls = list(set(video_urls))
+            unique_video_urls = NetworkCapture(self.driver).capture(duration_seconds)
             logger.info(f"Network'den {len(unique_video_urls)} video URL yakalandı")
             
             return unique_video_urls
@@ -131,38 +177,10 @@ class NetworkVideoExtractor:
             logger.debug(f"Network message processing error: {e}")
     
     def _is_video_url(self, url: str, mime_type: str = '') -> bool:
-        """URL'nin video olup olmadığını kontrol et"""
+        """URL'nin video olup olmadığını kontrol et (thumbnail/poster hariç)"""
         if not url or not isinstance(url, str):
             return False
-        
-        # URL pattern kontrolü
-        video_patterns = [
-            r'\.mp4',
-            r'\.mov',
-            r'\.avi',
-            r'\.webm',
-            r'\.m4v',
-            r'/video/',
-            r'video\.tiktok',
-            r'\.tiktokcdn\.',
-            r'\.ttwstatic\.',
-            r'\.tiktokv\.',
-            r'\.musical\.ly'
-        ]
-        
-        # MIME type kontrolü
-        if mime_type:
-            if 'video' in mime_type.lower():
-                return True
-        
-        # URL pattern kontrolü
-        for pattern in video_patterns:
-            if re.search(pattern, url, re.IGNORECASE):
-                # Thumbnail/poster image'ları exclude et
-                if not re.search(r'(thumb|poster|preview|cover)(?!nail)', url, re.IGNORECASE):
-                    return True
-        
-        return False
+        return classify_media_url(url, mime_type or '').is_video
     
     def extract_video_from_detail_page(self, ad_element, max_wait: int = 15) -> Optional[str]:
         """Reklam detay sayfasına gidip video URL çıkar"""
@@ -269,29 +287,8 @@ class NetworkVideoExtractor:
         if not video_urls:
             return None
         
-        # Priority order
-        priorities = [
-            (r'\.mp4', 10),           # MP4 format priority
-            (r'\.webm', 8),           # WebM format
-            (r'\.mov', 6),            # MOV format
-            (r'/video/', 5),          # Video path'li URL'ler
-            (r'\.tiktokcdn\.', 8),    # TikTok CDN
-            (r'\.ttwstatic\.', 7),    # TikTok static
-            (r'high|hd|720|1080', 9), # Yüksek kalite işaretleri
-        ]
-        
-        scored_urls = []
-        
-        for url in video_urls:
-            score = 0
-            for pattern, points in priorities:
-                if re.search(pattern, url, re.IGNORECASE):
-                    score += points
-            
-            # Daha uzun URL'ler genelde daha detaylı (parameter'lar vs.)
-            score += min(len(url) // 100, 3)
-            
-            scored_urls.append((score, url))
+        # Skor: format (mp4 > webm > mov), CDN, kalite işaretleri ve URL uzunluğu
+        scored_urls = [(classify_media_url(url).quality, url) for url in video_urls]
         
         # En yüksek skorlu URL'i döndür
         scored_urls.sort(reverse=True, key=lambda x: x[0])
@@ -303,14 +300,328 @@ class NetworkVideoExtractor:
 class TikTokSeleniumScraper:
     """Selenium ile TikTok Ad Library Scraper"""
     
-    def __init__(self, headless: bool = True):
+    def __init__(self,
+                 headless: bool = True,
+                 base_url: Optional[str] = None,
+                 profile_slot: int = 0,
+                 seen_registry: Optional[SeenAdRegistry] = None,
+                 keep_alive: bool = False,
+                 identity: Optional[str] = None,
+                 proxy: Optional[Proxy] = None,
+                 proxy_pool: Optional[ProxyPool] = None):
         self.headless = headless
+        # keep_alive: driver job'lar arasında açık kalır (daemon), shutdown() ile kapanır
+        self.keep_alive = keep_alive
         self.driver = None
-        self.base_url = "https://library.tiktok.com"
+        # base_url: benchmark/offline testler için local sunucuya yönlendirilebilir
+        self.base_url = (base_url or settings.tiktok_base_url).rstrip('/')
         self.scraped_ads = []
+        self.artifacts = DebugArtifactManager()
+        self.detail_pages_opened = 0
+        self.stats = JobStats()
+        # Keyword'ler ve paralel worker'lar arası ad_id dedup (job başında reset edilir)
+        self.seen_ads = seen_registry if seen_registry is not None else SeenAdRegistry()
+        self.resource_profile = PROFILE_FULL
+        # Kalıcı profil: HTTP cache + cookie/localStorage çalıştırmalar arasında korunur
+        self.profile_slot = profile_slot
+        self.profile = PersistentProfile(slot=profile_slot) if settings.persistent_profile_enabled else None
+        # Session mode: yüklü arama sayfası sonraki keyword'lerde yeniden kullanılır
+        self._search_session_key = None
+        # Bölünen zaman pencereleri için ek browser ödünç alınan DriverPool (TikTokAdScraper job süresince bağlar)
+        self.driver_pool = None
+        # ad_id → detay sayfasından çözülmüş media (job'lar arası)
+        self.media_cache = ResolvedMediaCache()
+        # Job deadline'ı (TikTokAdScraper.search_ads her job'da yeniler)
+        self.deadline = Deadline()
+        self._detail_page_estimate = DETAIL_PAGE_SECONDS
+        # Egress kimliği (IP/proxy) ve process genelinde paylaşılan circuit breaker'ı
+        self.proxy = proxy
+        # Proxy'nin sağlık skorlarını tutan pool (DriverPool'a enjekte edilen pool veya global)
+        self.proxy_pool = proxy_pool if proxy_pool is not None else default_proxy_pool
+        self.identity = identity or (proxy.identity if proxy else DIRECT_IDENTITY)
+        self.breaker = breakers.get(self.identity)
+        # Job checkpoint (TikTokAdScraper.search_ads job_id ile açar) ve aktif arama biriminin durumu
+        self.checkpoint: Optional[JobCheckpoint] = None
+        self._unit_claims: List[str] = []
+        self._unit_error: Optional[Exception] = None
+        # Bellek: driver açıldığından beri yüklenen sayfa ve son ölçüm (byte)
+        self.pages_since_launch = 0
+        self.last_rss: Optional[int] = None
+        self.last_js_heap: Optional[int] = None
+        # Son setup_driver hatası (başarılı kurulumda None); job sonucu hataya çevrilir
+        self.setup_error: Optional[str] = None
+        
+    def _phase(self, name: str):
+        """Faz zamanlayıcısı başlat (metrics histogram'ına ve job istatistiklerine yazar)"""
+        return phase_timer(name, self.stats.record_phase)
+    
+    def _sleep(self, seconds: float):
+        """Bekleme - uyku süresi job istatistiklerinde ayrı tutulur, deadline'ı aşmaz"""
+        self.stats.sleep(self.deadline.clamp(seconds))
+    
+    def _wait(self, timeout: float) -> WebDriverWait:
+        """Deadline'a göre kısaltılmış WebDriverWait"""
+        return WebDriverWait(self.driver, max(self.deadline.clamp(timeout), 0.1))
+    
+    def _throttle(self, url: str):
+        """Host'un token bucket'ından token al (deadline'a kadar bekler)"""
+        timeout = None if self.deadline.unlimited else self.deadline.remaining()
+        if not rate_limiter.acquire(url, timeout=timeout, sleep=self.stats.sleep):
+            self.stats.mark_truncated('rate_limit')
+            raise TimeoutException(f"Rate limit: deadline içinde token alınamadı ({urlsplit(url).hostname})")
+    
+    def _navigate(self, url: str):
+        """driver.get - rate limit'e tabi; deadline varsa page load timeout kalan süreyle sınırlanır
+        
+        Sayfa yükleme süresi / hatası bağlı proxy'nin sağlık skoruna yazılır.
+        """
+        self._throttle(url)
+        if not self.deadline.unlimited:
+            self.driver.set_page_load_timeout(max(self.deadline.remaining(), 1.0))
+        started = time.perf_counter()
+        try:
+            self.driver.get(url)
+        except Exception:
+            self.proxy_pool.record_failure(self.proxy)
+            raise
+        self.proxy_pool.record_page_load(self.proxy, time.perf_counter() - started)
+        self.pages_since_launch += 1
+        self._sample_memory()
+    
+    def _sample_memory(self):
+        """Chrome process ağacı RSS'i ve JS heap'i ölç, job tepe değerlerine yaz"""
+        self.last_rss = process_tree_rss(driver_pid(self.driver))
+        self.last_js_heap = js_heap_used(self.driver)
+        self.stats.record_memory(self.last_rss, self.last_js_heap)
+        if self.last_rss is not None:
+            BROWSER_RSS_BYTES.set(self.last_rss, slot=str(self.profile_slot))
+    
+    def _recycle_reason(self) -> Optional[str]:
+        """Driver yeniden başlatılmalıysa nedeni (rss / js_heap / pages)"""
+        mb = 1024 * 1024
+        if settings.browser_rss_limit_mb and (self.last_rss or 0) >= settings.browser_rss_limit_mb * mb:
+            return 'rss'
+        if settings.js_heap_limit_mb and (self.last_js_heap or 0) >= settings.js_heap_limit_mb * mb:
+            return 'js_heap'
+        if settings.browser_recycle_pages and self.pages_since_launch >= settings.browser_recycle_pages:
+            return 'pages'
+        return None
+    
+    def _maybe_recycle(self, sample: bool = True) -> bool:
+        """Bellek/sayfa sınırı aşıldıysa driver'ı kapatıp taze aç
+        
+        Güvenli noktalarda çağrılır: arama birimleri arası (önceki birim checkpoint'e
+        yazılmış) ve Faz 2'de detay sayfaları arası (ad_id'ler sahiplenilmiş, detay
+        sayfaları URL ile açılıyor). Kalıcı profilin session'ı shutdown'da kaydedilir;
+        yeni driver aynı profil ve proxy ile açılır. Yeni driver kurulamazsa False.
+        """
+        if self.driver is None:
+            return True
+        if sample:
+            self._sample_memory()
+        reason = self._recycle_reason()
+        if reason is None:
+            return True
+        logger.info(f"♻️ Browser yeniden başlatılıyor ({reason}): RSS {(self.last_rss or 0) // (1024 * 1024)} MB, "
+                    f"JS heap {(self.last_js_heap or 0) // (1024 * 1024)} MB, {self.pages_since_launch} sayfa")
+        BROWSER_RECYCLES_TOTAL.inc(reason=reason)
+        self.stats.record_recycle()
+        self.shutdown()
+        if not self.setup_driver():
+            logger.error(f"❌ Browser yeniden başlatılamadı: {self.setup_error}")
+            return False
+        return True
+    
+    def bind_proxy(self, proxy: Optional[Proxy], proxy_pool: Optional[ProxyPool] = None):
+        """Browser'ı başka bir proxy'ye bağla (açık driver kapatılır, sonraki setup_driver yeni proxy ile açar)"""
+        if proxy_pool is not None:
+            self.proxy_pool = proxy_pool
+        identity = proxy.identity if proxy else DIRECT_IDENTITY
+        if identity == self.identity:
+            return
+        self.shutdown()
+        self.proxy = proxy
+        # Proxy'nin sağlık skorlarını tutan pool (DriverPool'a enjekte edilen pool veya global)
+        self.proxy_pool = proxy_pool if proxy_pool is not None else default_proxy_pool
+        self.identity = identity
+        self.breaker = breakers.get(identity)
+        logger.info(f"🔀 Browser proxy'si değişti: {identity}")
+    
+    def _out_of_time(self, step: str, estimated_seconds: float) -> bool:
+        """Adım deadline'a sığmıyorsa job'ı truncated işaretle"""
+        if self.deadline.allows(estimated_seconds):
+            return False
+        self.stats.mark_truncated(step)
+        logger.warning(f"⏱️ Deadline: '{step}' adımı atlanıyor (kalan {self.deadline.remaining():.1f}s)")
+        return True
+    
+    def _await_identity(self) -> bool:
+        """Circuit breaker açıksa backoff bitene kadar bekle, sonra ucuz probe ile doğrula
+        
+        Bekleme deadline'a veya circuit_max_wait_seconds'a sığmıyorsa False (job kısmi sonuçla döner).
+        """
+        waited = 0.0
+        while True:
+            wait = self.breaker.seconds_until_probe()
+            if wait > 0:
+                if (waited + wait > settings.circuit_max_wait_seconds or
+                        not self.deadline.allows(wait + SEARCH_MIN_SECONDS)):
+                    self.stats.mark_truncated('circuit_open')
+                    logger.warning(f"🔌 Circuit açık ({self.identity}), {wait:.0f}s backoff bekleme bütçesini aşıyor")
+                    return False
+                logger.warning(f"🔌 Circuit açık ({self.identity}): {wait:.0f}s backoff, sonra probe")
+                self._sleep(wait)
+                waited += wait
+            if not self.breaker.needs_probe():
+                return True
+            self.breaker.record_probe(self._probe_identity())
+    
+    def _probe_identity(self) -> bool:
+        """Ucuz sağlık kontrolü: library ana sayfası metadata-only profil ile, tek page state okuması"""
+        try:
+            self._search_session_key = None
+            self._use_resource_profile(PROFILE_METADATA_ONLY)
+            self._navigate(self.base_url)
+            self._wait(10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            state = self._page_state()
+            healthy = bool(state) and not state.get('ban_indicator') and state.get('text_length', 0) >= 100
+        except Exception as e:
+            logger.debug(f"Probe hatası: {e}")
+            healthy = False
+        logger.info(f"🔌 Probe ({self.identity}): {'sağlıklı, circuit kapandı' if healthy else 'başarısız'}")
+        return healthy
+    
+    def _scrape_search(self, url: str, **kwargs) -> List[Dict]:
+        """Circuit breaker'a tabi arama: breaker bu aramada açıldıysa toparlanınca bir kez tekrar dene"""
+        ads = self._scrape_ads_from_url(url, **kwargs)
+        if not self.breaker.available() and self._await_identity():
+            logger.info(f"🔁 Kimlik toparlandı, '{kwargs.get('search_keyword')}' tekrar aranıyor")
+            ads = self._scrape_ads_from_url(url, **kwargs)
+        return ads
+    
+    def _resume_from_checkpoint(self) -> List[Dict]:
+        """Checkpoint'teki reklamları döndür; ad_id'leri ve çözülmüş media'yı geri yükle"""
+        if self.checkpoint is None:
+            return []
+        for ad_id in self.checkpoint.seen_ad_ids:
+            self.seen_ads.claim(ad_id)
+        for ad_id, media_data in self.checkpoint.media.items():
+            self.media_cache.put(ad_id, media_data)
+        return list(self.checkpoint.ads)
+    
+    def _run_unit(self, unit: str, url: str, **kwargs) -> List[Dict]:
+        """Tek arama birimi (keyword/advertiser)
         
+        Hata veya driver çökmesinde taze driver ile max_retries kadar tekrar denenir.
+        Başarılı birim checkpoint'e yazılır; deadline ile kısalan birim yazılmaz
+        (yeniden başlatılan job onu tekrar arar). Birim başlamadan önce bellek
+        veya sayfa sınırını aşan driver yeniden başlatılır.
+        """
+        ads: List[Dict] = []
+        if not self._maybe_recycle():
+            if self.checkpoint is not None:
+                self.checkpoint.record_failure(unit)
+            return ads
+        for attempt in range(settings.max_retries + 1):
+            self._unit_claims = []
+            self._unit_error = None
+            truncated_before = list(self.stats.truncated_steps)
+            ads = self._scrape_search(url, **kwargs)
+            
+            if self._unit_error is None and self._driver_alive():
+                if (self.checkpoint is not None and not self.deadline.expired()
+                        and self.stats.truncated_steps == truncated_before):
+                    media = {ad['ad_id']: self.media_cache.get(ad['ad_id']) for ad in ads
+                             if ad.get('ad_id') and ad.get('media_status') == MEDIA_RESOLVED
+                             and ad['ad_id'] in self.media_cache}
+                    self.checkpoint.record_unit(unit, ads, self._unit_claims, media)
+                return ads
+            
+            if attempt == settings.max_retries or self._out_of_time('unit_retry', SEARCH_MIN_SECONDS):
+                break
+            logger.warning(f"🔁 '{unit}' başarısız ({self._unit_error or 'driver yanıt vermiyor'}), "
+                           f"taze driver ile tekrar deneniyor ({attempt + 1}/{settings.max_retries})")
+            # Tekrar denemede bu birimin reklamları duplicate sayılmasın
+            self.seen_ads.forget(self._unit_claims)
+            self.shutdown()
+            if not self.setup_driver():
+                break
+        
+        logger.error(f"❌ '{unit}' tamamlanamadı, eldeki {len(ads)} reklamla devam ediliyor")
+        if self.checkpoint is not None:
+            self.checkpoint.record_failure(unit)
+        return ads
+    
+    def _use_resource_profile(self, profile: str):
+        """Sonraki sayfa yüklemeleri için resource profile uygula (aynı profil tekrar gönderilmez)"""
+        if profile != self.resource_profile and apply_resource_profile(self.driver, profile):
+            self.resource_profile = profile
+    
+    def _page_state(self) -> Dict:
+        """Ban / boş sayfa / search input kontrolü (tek WebDriver komutu)"""
+        try:
+            return self.driver.execute_script(PAGE_STATE_SCRIPT, BAN_INDICATORS, SEARCH_INPUT_SELECTOR) or {}
+        except Exception as e:
+            logger.warning(f"Sayfa durumu okunamadı: {e}")
+            return {}
+    
+    @staticmethod
+    def _search_session_key_for(url: str) -> tuple:
+        """Aynı arama sayfası sayılacak URL parametreleri (tarih aralığı, bugünden gün ofsetleri olarak)"""
+        params = parse_qs(urlsplit(url).query)
+        try:
+            end_ms = int(params['end_time'][0])
+            span_days = round((end_ms - int(params['start_time'][0])) / 86_400_000)
+            # Zaman pencereleri aynı uzunlukta olsa da farklı aralıklar
+            end_offset_days = round((time.time() * 1000 - end_ms) / 86_400_000)
+        except (KeyError, ValueError, IndexError):
+            span_days = end_offset_days = None
+        return (urlsplit(url).path, params.get('region', [''])[0], params.get('query_type', [''])[0],
+                params.get('sort_type', [''])[0], span_days, end_offset_days)
+    
+    def _can_reuse_search_page(self, url: str) -> Optional[Dict]:
+        """Session mode: yüklü sayfa bu arama için sağlıklıysa page state döndür, değilse None"""
+        if not settings.search_session_mode or self._search_session_key is None:
+            return None
+        if self._search_session_key != self._search_session_key_for(url):
+            return None
+        state = self._page_state()
+        healthy = (
+            state.get('ready') == 'complete'
+            and state.get('has_search_input')
+            and not state.get('ban_indicator')
+            and state.get('url', '').startswith(f"{self.base_url}/ads")
+            and '/detail' not in state.get('url', '')
+        )
+        if not healthy:
+            logger.info(f"♻️ Arama sayfası yeniden kullanılamıyor, tam yükleme yapılacak (state={state})")
+            return None
+        return state
+    
+    def _record_page_weight(self, page: str, network_logs: List[Dict]):
+        """Boşaltılan performance log'dan sayfa ağırlığını job istatistiklerine yaz"""
+        received, blocked, saved = summarize_page_weight(network_logs)
+        self.stats.record_page_weight(page, self.resource_profile, received, blocked, saved)
+        if blocked:
+            logger.debug(f"{page} ({self.resource_profile}): {blocked} istek bloklandı, ~{saved // 1024} KB kazanıldı")
+
+    def _driver_alive(self) -> bool:
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+    
     def setup_driver(self):
         """Chrome WebDriver kurulumu - Modern Selenium ile Network Logging"""
+        if self.keep_alive and self.driver is not None:
+            if self._driver_alive():
+                logger.debug("Açık WebDriver yeniden kullanılıyor (keep_alive)")
+                return True
+            logger.warning("Açık WebDriver yanıt vermiyor, yeniden başlatılıyor")
+            self.shutdown()
+        
+        timer = self._phase('browser_startup')
         try:
             chrome_options = Options()
             
@@ -339,18 +650,42 @@ class TikTokSeleniumScraper:
                 'profile.default_content_settings.popups': 0,
             })
             
+            if self.proxy is not None:
+                if self.proxy.has_credentials:
+                    logger.warning(f"Chrome proxy credential desteklemiyor, {self.proxy.identity} IP whitelist'li olmalı")
+                chrome_options.add_argument(self.proxy.chrome_argument)
+            
+            persistent = self.profile is not None and self.profile.acquire()
+            if persistent:
+                self.profile.apply(chrome_options)
+            
             # Performance logging için modern approach
             chrome_options.set_capability('goog:loggingPrefs', {
-                'performance': 'ALL',
-                'browser': 'ALL'
+                'performance': 'ALL'
+            })
+            # Sadece Network domain'i loglansın (Page/Tracing event'leri browser tarafında elenir)
+            chrome_options.add_experimental_option('perfLoggingPrefs', {
+                'enableNetwork': True,
+                'enablePage': False,
             })
             
-            # WebDriver oluştur - Modern syntax
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(
-                service=service, 
-                options=chrome_options
-            )
+            # WebDriver oluştur - chromedriver yolu process başına bir kez çözülür (önbellekli)
+            try:
+                self.driver = webdriver.Chrome(service=Service(chromedriver.chromedriver_path()), options=chrome_options)
+            except SessionNotCreatedException:
+                # Önbellekteki chromedriver güncellenen Chrome ile uyumsuz
+                logger.warning("chromedriver Chrome sürümüyle uyumsuz, yeniden çözülüyor")
+                chromedriver.invalidate()
+                self.driver = webdriver.Chrome(service=Service(chromedriver.chromedriver_path()), options=chrome_options)
+            
+            # Reaper bu driver'ı canlı sayar; scraper kapatılmadan çöpe giderse sahipsiz kalır
+            browser_supervisor.register(self)
+            # WebDriver komut sayacı (job istatistikleri için)
+            self.stats.instrument_driver(self.driver)
+            self.resource_profile = PROFILE_FULL
+            self.pages_since_launch = 0
+            self.last_rss = self.last_js_heap = None
+            self._search_session_key = None
             
             # Chrome DevTools Protocol komutlarını aktifleştir
             self.driver.execute_cdp_cmd('Network.enable', {})
@@ -358,25 +693,63 @@ class TikTokSeleniumScraper:
             self.driver.execute_cdp_cmd('Runtime.enable', {})
             
             # Network events'leri dinlemeye başla
-            self.driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': True})
-            
-            logger.info("Chrome WebDriver hazırlandı (Network logging AKTIF)")
+            # Kalıcı profilde static asset'ler (JS bundle, CSS) cache'ten gelsin
+            self.driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': not persistent})
+            if persistent:
+                self.profile.restore_session(self.driver)
+            
+            timer.stop()
+            profile_state = (
+                f"profil slot-{self.profile.slot} {'sıcak' if self.profile.warm else 'soğuk'}"
+                if persistent else "geçici profil"
+            )
+            logger.info(f"Chrome WebDriver hazırlandı (Network logging AKTIF, {profile_state}, {timer.elapsed:.1f}s)")
+            self.setup_error = None
             return True
             
         except Exception as e:
             logger.error(f"WebDriver kurulum hatası: {e}")
+            self.setup_error = f"{type(e).__name__}: {e}"
+            # Yarım oluşturulmuş driver ve profil slot kilidi sonraki denemeye kalmasın
+            if self.driver is not None:
+                try:
+                    self.driver.quit()
+                except Exception as quit_error:
+                    logger.debug(f"Yarım driver kapatılamadı: {quit_error}")
+                self.driver = None
+            if self.profile is not None:
+                self.profile.release()
             return False
     def close_driver(self):
-        """WebDriver'ı kapat"""
+        """WebDriver'ı kapat (keep_alive modunda açık bırakılır)"""
+        if self.keep_alive:
+            if self.driver and self.profile is not None and self.profile.active:
+                self.profile.save_session(self.driver)
+            return
+        self.shutdown()
+    
+    def shutdown(self):
+        """WebDriver'ı keep_alive'dan bağımsız olarak kapat"""
         if self.driver:
-            self.driver.quit()
+            if self.profile is not None and self.profile.active:
+                self.profile.save_session(self.driver)
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.debug(f"WebDriver quit hatası: {e}")
+            self.driver = None
+            self._search_session_key = None
             logger.info("WebDriver kapatıldı")
+        if self.profile is not None:
+            self.profile.release()
     
     def build_search_url(self, 
                         advertiser_name: str = "",
                         keyword: str = "",
                         region: str = "TR",
-                        days_back: int = 30) -> str:
+                        days_back: int = 30,
+                        start_time: Optional[datetime] = None,
+                        end_time: Optional[datetime] = None) -> str:
         """TikTok Ad Library arama URL'i oluştur
         
         Args:
@@ -384,11 +757,12 @@ class TikTokSeleniumScraper:
             keyword: Genel keyword (reklam içeriğinde arar) - advertiser_name yerine kullanılabilir
             region: Ülke kodu
             days_back: Kaç gün geriye gidilecek
+            start_time / end_time: Verilirse days_back yerine bu aralık (zaman penceresi) kullanılır
         """
         
         # Tarih aralığı hesapla (Unix timestamp milisaniye)
-        end_time = datetime.now()
-        start_time = end_time - timedelta(days=days_back)
+        end_time = end_time or datetime.now()
+        start_time = start_time or end_time - timedelta(days=days_back)
         
         start_timestamp = int(start_time.timestamp() * 1000)
         end_timestamp = int(end_time.timestamp() * 1000)
@@ -416,13 +790,21 @@ class TikTokSeleniumScraper:
         logger.debug(f"🔗 Build URL: BOŞ sayfa (adv_name yok) → UI'da yazılacak: '{search_term}'")
         return final_url
     
-    def search_ads_by_advertiser(self, advertiser_names: List[str], max_ads: int = 100) -> List[Dict]:
-        """Reklam veren adlarına göre reklam ara"""
-        all_ads = []
+    def search_ads_by_advertiser(self,
+                                 advertiser_names: List[str],
+                                 max_ads: int = 100,
+                                 priority_advertisers: Optional[List[str]] = None,
+                                 region: str = "TR",
+                                 days_back: int = 30,
+                                 window: Optional[TimeWindow] = None,
+                                 partition: bool = False) -> List[Dict]:
+        """Reklam veren adlarına göre reklam ara (window/partition: bkz. _search_term)"""
+        all_ads = self._resume_from_checkpoint()
         
         if not self.setup_driver():
-            logger.error("WebDriver kurulamadı")
-            return []
+            # Checkpoint'ten geri yüklenen reklamlar kaybolmasın
+            logger.error(f"WebDriver kurulamadı, checkpoint'teki {len(all_ads)} reklamla dönülüyor")
+            return all_ads
         
         try:
             # Eğer sadece bir advertiser aranıyorsa, tüm max_ads'i ondan al
@@ -436,29 +818,35 @@ class TikTokSeleniumScraper:
             
             logger.info(f"Her advertiser için maksimum {max_ads_per_search} reklam aranacak")
             
+            searched = 0
             for advertiser in advertiser_names:
+                unit = f"advertiser:{advertiser}"
+                if self.checkpoint is not None and self.checkpoint.is_done(unit):
+                    searched += 1
+                    logger.info(f"📌 '{advertiser}' checkpoint'te tamamlanmış, atlanıyor")
+                    continue
+                if self._out_of_time('searches', SEARCH_MIN_SECONDS) or not self._await_identity():
+                    break
+                searched += 1
                 logger.info(f"'{advertiser}' reklamları aranıyor...")
                 
-                # BOŞ URL oluştur (adv_name parametresi olmadan)
-                search_url = self.build_search_url(advertiser_name=advertiser)
-                logger.info(f"URL: {search_url}")
-                
                 # Kalan reklam sayısını hesapla
                 remaining_ads = max_ads - len(all_ads)
                 current_max = min(max_ads_per_search, remaining_ads)
                 
-                # UI interaction için advertiser name'i geç
-                ads = self._scrape_ads_from_url(search_url, max_ads_per_search=current_max, search_keyword=advertiser)
+                ads = self._search_term('advertiser', advertiser, current_max, region, days_back,
+                                        window=window, partition=partition,
+                                        priority_advertisers=priority_advertisers)
                 all_ads.extend(ads)
                 
                 logger.info(f"'{advertiser}' için {len(ads)} reklam bulundu (Toplam: {len(all_ads)})")
                 
-                # Rate limiting
-                safe_sleep(3, 5)
-                
                 if len(all_ads) >= max_ads:
                     break
+                
+                # Rate limiting: sonraki aramanın _navigate/_throttle çağrısında (token bucket)
             
+            self.stats.record_completion('searches', searched, len(advertiser_names))
             logger.info(f"Toplam {len(all_ads)} reklam scrape edildi")
             
         except Exception as e:
@@ -469,21 +857,34 @@ class TikTokSeleniumScraper:
         
         return all_ads
     
-    def search_ads_by_keyword(self, keywords: List[str], max_ads: int = 100) -> List[Dict]:
+    def search_ads_by_keyword(self,
+                              keywords: List[str],
+                              max_ads: int = 100,
+                              priority_advertisers: Optional[List[str]] = None,
+                              region: str = "TR",
+                              days_back: int = 30,
+                              window: Optional[TimeWindow] = None,
+                              partition: bool = False) -> List[Dict]:
         """Keyword'lere göre reklam ara (advertiser name değil, genel arama)
         
         Args:
             keywords: Aranacak keyword'ler (örn: ["banka", "kredi"])
             max_ads: Maksimum reklam sayısı
+            priority_advertisers: Detay sayfası önceliği verilecek advertiser'lar (whitelist)
+            region: Ülke kodu
+            days_back: Kaç gün geriye gidilecek
+            window: Verilirse days_back yerine sadece bu zaman penceresi aranır
+            partition: days_back geçmiş yoğunluğa göre pencerelere bölünür (driver_pool bağlıysa paralel aranır)
             
         Returns:
             Bulunan reklamların listesi
         """
-        all_ads = []
+        all_ads = self._resume_from_checkpoint()
         
         if not self.setup_driver():
-            logger.error("WebDriver kurulamadı")
-            return []
+            # Checkpoint'ten geri yüklenen reklamlar kaybolmasın
+            logger.error(f"WebDriver kurulamadı, checkpoint'teki {len(all_ads)} reklamla dönülüyor")
+            return all_ads
         
         try:
             # Her keyword için maksimum reklam sayısı
@@ -494,29 +895,35 @@ class TikTokSeleniumScraper:
             
             logger.info(f"Her keyword için maksimum {max_ads_per_search} reklam aranacak")
             
+            searched = 0
             for kw in keywords:
+                unit = f"keyword:{kw}"
+                if self.checkpoint is not None and self.checkpoint.is_done(unit):
+                    searched += 1
+                    logger.info(f"📌 '{kw}' checkpoint'te tamamlanmış, atlanıyor")
+                    continue
+                if self._out_of_time('searches', SEARCH_MIN_SECONDS) or not self._await_identity():
+                    break
+                searched += 1
                 logger.info(f"'{kw}' keyword'ü aranıyor...")
                 
-                # BOŞ URL oluştur (adv_name parametresi olmadan)
-                search_url = self.build_search_url(keyword=kw)
-                logger.info(f"URL: {search_url}")
-                
                 # Kalan reklam sayısını hesapla
                 remaining_ads = max_ads - len(all_ads)
                 current_max = min(max_ads_per_search, remaining_ads)
                 
-                # UI interaction için keyword'ü geç
-                ads = self._scrape_ads_from_url(search_url, max_ads_per_search=current_max, search_keyword=kw)
+                ads = self._search_term('keyword', kw, current_max, region, days_back,
+                                        window=window, partition=partition,
+                                        priority_advertisers=priority_advertisers)
                 all_ads.extend(ads)
                 
                 logger.info(f"'{kw}' için {len(ads)} reklam bulundu (Toplam: {len(all_ads)})")
                 
-                # Rate limiting
-                safe_sleep(3, 5)
-                
                 if len(all_ads) >= max_ads:
                     break
+                
+                # Rate limiting: sonraki aramanın _navigate/_throttle çağrısında (token bucket)
             
+            self.stats.record_completion('searches', searched, len(keywords))
             logger.info(f"Toplam {len(all_ads)} reklam scrape edildi")
             
         except Exception as e:
@@ -527,6 +934,136 @@ class TikTokSeleniumScraper:
         
         return all_ads
     
+    def _search_term(self,
+                     search_type: str,
+                     term: str,
+                     max_ads: int,
+                     region: str,
+                     days_back: int,
+                     window: Optional[TimeWindow] = None,
+                     partition: bool = False,
+                     priority_advertisers: Optional[List[str]] = None) -> List[Dict]:
+        """Tek keyword/advertiser araması
+        
+        partition=True ise aralık geçmiş reklam yoğunluğuna göre pencerelere
+        bölünür: her pencerenin "View more" zinciri kısa kalır. driver_pool
+        bağlıysa pencereler pool'dan ödünç alınan boş browser'larda paralel,
+        değilse en yeniden eskiye sırayla aranır. Her pencere ayrı checkpoint
+        birimidir. Bulunan reklamlar terimin yoğunluk geçmişine yazılır.
+        """
+        key = density_key(search_type, term, region)
+        if window is not None:
+            windows, units = [window], [f"{search_type}:{term}@{window.label}"]
+        elif partition:
+            windows = self._window_plan(key, days_back)
+            units = [f"{search_type}:{term}@{w.label}" for w in windows]
+        else:
+            windows, units = [TimeWindow.last_days(days_back)], [f"{search_type}:{term}"]
+        
+        pending: List[Tuple[TimeWindow, str]] = []
+        for current, unit in zip(windows, units):
+            if self.checkpoint is not None and self.checkpoint.is_done(unit):
+                logger.info(f"📌 '{unit}' checkpoint'te tamamlanmış, atlanıyor")
+                continue
+            pending.append((current, unit))
+        
+        def search_window(scraper: 'TikTokSeleniumScraper', current: TimeWindow, unit: str, budget: int) -> List[Dict]:
+            # BOŞ URL oluştur (adv_name parametresi olmadan)
+            search_url = scraper.build_search_url(region=region, start_time=current.start, end_time=current.end,
+                                                  **{'keyword' if search_type == 'keyword' else 'advertiser_name': term})
+            logger.info(f"URL ({current.label}): {search_url}")
+            # UI interaction için keyword / advertiser name'i geç
+            found = scraper._run_unit(unit, search_url, max_ads_per_search=budget, search_keyword=term,
+                                      priority_advertisers=priority_advertisers)
+            if scraper._unit_error is None and not scraper.deadline.expired():
+                ad_density.record(key, current, found, saturated=len(found) >= budget)
+            if len(windows) > 1:
+                logger.info(f"'{term}' [{current.label}]: {len(found)} reklam")
+            return found
+        
+        workers = min(len(pending), max(1, settings.time_window_workers))
+        if workers > 1 and self.driver_pool is not None:
+            with self.driver_pool.borrow(self, workers - 1) as helpers:
+                if helpers:
+                    return self._search_windows_parallel([self] + helpers, pending, max_ads, search_window)
+        
+        ads: List[Dict] = []
+        for index, (current, unit) in enumerate(pending):
+            if len(ads) >= max_ads:
+                break
+            # İlk pencere için kontrolleri çağıran döngü yaptı
+            if index and (self._out_of_time('searches', SEARCH_MIN_SECONDS) or not self._await_identity()):
+                break
+            ads.extend(search_window(self, current, unit, max_ads - len(ads)))
+        return ads
+    
+    def _search_windows_parallel(self, scrapers: List['TikTokSeleniumScraper'],
+                                 pending: List[Tuple[TimeWindow, str]], max_ads: int, search_window) -> List[Dict]:
+        """Pencereleri browser'lara dağıt: her browser sıradaki pencereyi alır
+        
+        Her pencere kalan ortak bütçenin bitmemiş pencerelere düşen payını alır;
+        erken biten pencerenin kullanmadığı bütçe sonrakilere kalır. Sonuçlar
+        pencere sırasıyla (en yeniden eskiye) birleştirilir.
+        """
+        queue = deque(enumerate(pending))
+        lock = threading.Lock()
+        budget = {'collected': 0, 'reserved': 0}
+        found_by_window: Dict[int, List[Dict]] = {}
+        logger.info(f"🪟 {len(pending)} pencere {len(scrapers)} browser'da paralel aranıyor")
+        
+        def run(scraper: 'TikTokSeleniumScraper'):
+            if scraper is not self:
+                if not scraper.setup_driver():
+                    logger.warning(f"slot-{scraper.profile_slot} browser'ı kurulamadı, pencere almıyor")
+                    return
+                scraper.checkpoint = self.checkpoint
+            while True:
+                with lock:
+                    remaining = max_ads - budget['collected'] - budget['reserved']
+                    if not queue or remaining <= 0:
+                        return
+                    index, (current, unit) = queue.popleft()
+                    quota = math.ceil(remaining / (len(queue) + 1))
+                    budget['reserved'] += quota
+                found: List[Dict] = []
+                try:
+                    if scraper._out_of_time('searches', SEARCH_MIN_SECONDS) or not scraper._await_identity():
+                        return
+                    found = search_window(scraper, current, unit, quota)
+                except Exception as e:
+                    logger.error(f"Pencere {current.label} hatası: {e}")
+                    if self.checkpoint is not None:
+                        self.checkpoint.record_failure(unit)
+                finally:
+                    with lock:
+                        budget['reserved'] -= quota
+                        budget['collected'] += len(found)
+                        found_by_window[index] = found
+        
+        threads = [threading.Thread(target=run, args=(scraper,), name=f"window-{index}", daemon=True)
+                   for index, scraper in enumerate(scrapers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return [ad for index in sorted(found_by_window) for ad in found_by_window[index]]
+    
+    def _window_plan(self, key: str, days_back: int) -> List[TimeWindow]:
+        """Pencere planı: checkpoint'te varsa onu kullan, yoksa planla ve checkpoint'e yaz
+        
+        Tamamlanan her pencere yoğunluk geçmişini değiştirdiği için yeniden
+        planlama farklı etiketler üretir; resume eski birimleri tanımazdı.
+        """
+        saved = self.checkpoint.window_plan(key) if self.checkpoint is not None else None
+        if saved is not None:
+            return [TimeWindow(**window) for window in saved]
+        windows = plan_windows(days_back, [key])
+        if self.checkpoint is not None:
+            self.checkpoint.record_window_plan(key, [
+                {'start': w.start.isoformat(), 'end': w.end.isoformat(), 'label': w.label} for w in windows
+            ])
+        return windows
+    
     def search_banking_ads(self, max_ads: int = 100) -> List[Dict]:
         """Türk bankalarının reklamlarını ara (keyword-based)"""
         
@@ -535,95 +1072,98 @@ class TikTokSeleniumScraper:
         
         return self.search_ads_by_keyword(banking_keywords, max_ads)
     
-    def _scrape_ads_from_url(self, url: str, max_ads_per_search: int = 3, search_keyword: str = "") -> List[Dict]:
+    def _scrape_ads_from_url(self,
+                             url: str,
+                             max_ads_per_search: int = 3,
+                             search_keyword: str = "",
+                             priority_advertisers: Optional[List[str]] = None) -> List[Dict]:
         """Belirli URL'den reklamları scrape et - UI Interaction versiyonu
         
         Args:
             url: Base TikTok Ad Library URL (region, dates dahil)
             max_ads_per_search: Maksimum reklam sayısı
             search_keyword: Aranacak advertiser name (autocomplete için)
+            priority_advertisers: Faz 2'de öne alınacak advertiser'lar
         """
         ads = []
+        self.artifacts.start_trace(search_keyword)
         
         try:
-            # BOŞS sayfayı aç (adv_name parametresi OLMADAN - autocomplete için!)
-            self.driver.get(url)
+            timer = self._phase('page_load')
+            # SESSION MODE: Önceki keyword'ün arama sayfası sağlıklıysa yeniden yükleme
+            page_state = self._can_reuse_search_page(url)
+            if page_state:
+                logger.info(f"♻️ Yüklü arama sayfası yeniden kullanılıyor, search field'a yazılıyor: '{search_keyword}'")
+                # Yeni arama library API'sine istek atar, navigation gibi sayılır
+                self._throttle(url)
+            else:
+                # BOŞS sayfayı aç (adv_name parametresi OLMADAN - autocomplete için!)
+                self._search_session_key = None
+                self._use_resource_profile(settings.listing_resource_profile)
+                self._navigate(url)
+                
+                # Sayfanın yüklenmesini UZUN BEKLE (8-9 saniye sürebilir!)
+                self._wait(15).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "body"))
+                )
+                
+                logger.info(f"Sayfa yüklendi (15s), search field'a yazılıyor: '{search_keyword}'")
+                self._sleep(3)
+                page_state = self._page_state()
+            timer.stop()
             
-            # Sayfanın yüklenmesini UZUN BEKLE (8-9 saniye sürebilir!)
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            # BAN DETECTION: TikTok bizi engelledi mi kontrol et
+            indicator = page_state.get('ban_indicator')
+            if indicator:
+                BAN_DETECTIONS_TOTAL.inc(indicator=indicator)
+                self.breaker.record_ban(indicator)
+                self.proxy_pool.record_ban(self.proxy)
+                self._search_session_key = None
+                logger.error(f"🚫 TikTok BAN DETECTED: '{indicator}' found in page! "
+                             f"Circuit açıldı ({self.identity}), {self.breaker.seconds_until_probe():.0f}s backoff")
+                # Screenshot kaydet
+                self.artifacts.capture(self.driver, TRIGGER_BAN, 'ban', screenshot=True)
+                return []
             
-            logger.info(f"Sayfa yüklendi (15s), search field'a yazılıyor: '{search_keyword}'")
-            time.sleep(3)
+            # Boş sayfa kontrolü (art arda tekrarlanırsa circuit açılır)
+            if page_state and page_state.get('text_length', 0) < 100:
+                logger.warning(f"⚠️ Sayfa neredeyse boş (len={page_state.get('text_length')}). Possible ban or loading issue.")
+                self.breaker.record_anomaly()
+            else:
+                self.breaker.record_success()
             
-            # BAN DETECTION: TikTok bizi engelledi mi kontrol et
-            try:
-                page_text = self.driver.find_element(By.TAG_NAME, "body").text.lower()
-                ban_indicators = [
-                    "access denied",
-                    "blocked",
-                    "captcha",
-                    "verify you are human",
-                    "unusual traffic",
-                    "forbidden",
-                    "temporarily unavailable"
-                ]
-                
-                for indicator in ban_indicators:
-                    if indicator in page_text:
-                        logger.error(f"🚫 TikTok BAN DETECTED: '{indicator}' found in page!")
-                        logger.error("Railway IP banned by TikTok. Restart service or wait 1-2 hours.")
-                        # Screenshot kaydet
-                        try:
-                            self.driver.save_screenshot('/app/ban_screenshot.png')
-                            logger.error("📸 Ban screenshot: /app/ban_screenshot.png")
-                        except:
-                            pass
-                        return []
-                
-                # Boş sayfa kontrolü
-                if len(page_text.strip()) < 100:
-                    logger.warning(f"⚠️ Sayfa neredeyse boş (len={len(page_text)}). Possible ban or loading issue.")
-                    
-            except Exception as ban_check_err:
-                logger.warning(f"Ban detection hatası: {ban_check_err}")
+            # Sonraki keyword bu sayfayı yeniden kullanabilir (hata olursa aşağıda sıfırlanır)
+            self._search_session_key = self._search_session_key_for(url)
             
             # AUTOCOMPLETE INTERACTION: Search field'a yaz ve dropdown'dan seç
+            timer = self._phase('autocomplete')
             if search_keyword:
                 try:
                     # Search field'ı bul (input field)
-                    search_input = WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "input[placeholder*='Advertiser'], input[placeholder*='advertiser'], input[placeholder*='keyword']"))
+                    search_input = self._wait(10).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, SEARCH_INPUT_SELECTOR))
                     )
                     
                     # Field'ı temizle
                     search_input.clear()
-                    time.sleep(0.5)
+                    if search_input.get_attribute('value'):
+                        # Session mode: React kontrollü input clear() ile state'i güncellemeyebilir
+                        search_input.send_keys(Keys.CONTROL, 'a')
+                        search_input.send_keys(Keys.BACKSPACE)
+                    self._sleep(0.5)
                     
                     # Advertiser name'i YAVAŞÇA yaz (autocomplete trigger için)
                     logger.info(f"🔤 Search field'a yazılıyor: {search_keyword}")
                     for char in search_keyword:
                         search_input.send_keys(char)
-                        time.sleep(0.05)  # Her karakter arası 50ms bekle
+                        self._sleep(0.05)  # Her karakter arası 50ms bekle
                     
                     # Autocomplete dropdown'un açılmasını bekle
                     logger.info("⏳ Autocomplete dropdown bekleniyor (2 saniye)...")
-                    time.sleep(2)
+                    self._sleep(2)
                     
-                    # DEBUG: Autocomplete dropdown HTML'ini logla
-                    try:
-                        page_html = self.driver.page_source
-                        # Search field etrafındaki HTML'i kaydet
-                        logger.info("📸 DEBUG: Page HTML kaydediliyor...")
-                        with open('/app/autocomplete_debug.html', 'w', encoding='utf-8') as f:
-                            f.write(page_html)
-                        
-                        # Screenshot al
-                        self.driver.save_screenshot('/app/autocomplete_screenshot.png')
-                        logger.info("📸 Screenshot kaydedildi: /app/autocomplete_screenshot.png")
-                    except Exception as debug_err:
-                        logger.warning(f"Debug kayıt hatası: {debug_err}")
+                    # DEBUG: Autocomplete dropdown HTML'ini logla (sadece örneklenen aramalarda)
+                    self.artifacts.capture(self.driver, TRIGGER_SAMPLE, 'autocomplete', page_source=True, screenshot=True)
                     
                     # AUTOCOMPLETE DROPDOWN'DAN SEÇ
                     # Gerçek TikTok HTML yapısına göre selector'lar
@@ -658,15 +1198,11 @@ class TikTokSeleniumScraper:
                             before_click_value = ""
                         
                         # DEBUG: Screenshot (tıklama öncesi)
-                        try:
-                            self.driver.save_screenshot('/app/before_autocomplete_click.png')
-                            logger.info("📸 DEBUG: Tıklama öncesi screenshot: /app/before_autocomplete_click.png")
-                        except:
-                            pass
+                        self.artifacts.capture(self.driver, TRIGGER_SAMPLE, 'before_autocomplete_click', screenshot=True)
                         
                         for selector in dropdown_selectors:
                             try:
-                                suggestion = WebDriverWait(self.driver, 3).until(
+                                suggestion = self._wait(3).until(
                                     EC.element_to_be_clickable((By.XPATH, selector))
                                 )
                                 
@@ -719,7 +1255,7 @@ class TikTokSeleniumScraper:
                                         raise
                                 
                                 # DEBUG: Tıklama sonrası search field değeri kontrolü
-                                time.sleep(1)  # Kısa bekle (değer güncellensin)
+                                self._sleep(1)  # Kısa bekle (değer güncellensin)
                                 try:
                                     after_click_value = search_input.get_attribute('value') or ""
                                     logger.info(f"🔍 DEBUG: Tıklama sonrası search field değeri: '{after_click_value}'")
@@ -736,7 +1272,7 @@ class TikTokSeleniumScraper:
                                     logger.warning(f"⚠️ Search field değeri kontrol edilemedi: {value_check_err}")
                                 
                                 # DEBUG: Dropdown kapanma kontrolü
-                                time.sleep(1)
+                                self._sleep(1)
                                 try:
                                     dropdown_still_visible = self.driver.find_element(By.XPATH, "//div[contains(@class, 'exact_field_label')]")
                                     logger.warning("⚠️ DEBUG: Dropdown hala görünür! Tıklama başarısız olabilir.")
@@ -744,15 +1280,11 @@ class TikTokSeleniumScraper:
                                     logger.info("✅ DEBUG: Dropdown kapandı, tıklama başarılı görünüyor!")
                                 
                                 # DEBUG: Screenshot (tıklama sonrası)
-                                try:
-                                    self.driver.save_screenshot('/app/after_autocomplete_click.png')
-                                    logger.info("📸 DEBUG: Tıklama sonrası screenshot: /app/after_autocomplete_click.png")
-                                except:
-                                    pass
+                                self.artifacts.capture(self.driver, TRIGGER_SAMPLE, 'after_autocomplete_click', screenshot=True)
                                 
                                 dropdown_clicked = True
                                 logger.info("🖱️ Autocomplete suggestion'a tıklandı!")
-                                time.sleep(1)  # Dropdown seçiminden sonra bekle
+                                self._sleep(1)  # Dropdown seçiminden sonra bekle
                                 break
                             except Exception as selector_err:
                                 logger.debug(f"Selector '{selector}' başarısız: {selector_err}")
@@ -761,13 +1293,13 @@ class TikTokSeleniumScraper:
                         if not dropdown_clicked:
                             logger.warning("⚠️ Autocomplete dropdown bulunamadı, Enter tuşu ile devam ediliyor...")
                             search_input.send_keys(Keys.ENTER)
-                            time.sleep(2)
+                            self._sleep(2)
                     
                     except Exception as dropdown_error:
                         logger.warning(f"Autocomplete dropdown hatası: {dropdown_error}")
                         # Fallback: Enter tuşuna bas
                         search_input.send_keys(Keys.ENTER)
-                        time.sleep(2)
+                        self._sleep(2)
                     
                 except Exception as search_input_error:
                     logger.warning(f"Search field interaction hatası: {search_input_error}")
@@ -775,7 +1307,9 @@ class TikTokSeleniumScraper:
                     pass
             
             # Artık URL parametresi ile gelmiyoruz, manuel search yaptık
-            time.sleep(2)
+            self._sleep(2)
+            timer.stop()
+            timer = self._phase('search_submit')
             
             # #region agent log
             # DEBUG: Sayfadaki tüm butonları logla
@@ -826,7 +1360,7 @@ class TikTokSeleniumScraper:
                 search_button = None
                 for selector in search_button_selectors:
                     try:
-                        search_button = WebDriverWait(self.driver, 3).until(
+                        search_button = self._wait(3).until(
                             EC.element_to_be_clickable((By.XPATH, selector))
                         )
                         logger.info(f"✅ Search butonu bulundu: {selector}")
@@ -851,11 +1385,7 @@ class TikTokSeleniumScraper:
                         before_search_url = ""
                     
                     # DEBUG: Screenshot (search öncesi)
-                    try:
-                        self.driver.save_screenshot('/app/before_search_click.png')
-                        logger.info("📸 DEBUG: Search öncesi screenshot: /app/before_search_click.png")
-                    except:
-                        pass
+                    self.artifacts.capture(self.driver, TRIGGER_SAMPLE, 'before_search_click', screenshot=True)
                     
                     logger.info("🔍 Search butonuna tıklıyorum (autocomplete selection sonrası)...")
                     
@@ -873,7 +1403,7 @@ class TikTokSeleniumScraper:
                             raise
                     
                     # DEBUG: Tıklama sonrası URL değişimi kontrolü
-                    time.sleep(2)  # URL değişimi için bekle
+                    self._sleep(2)  # URL değişimi için bekle
                     try:
                         after_search_url = self.driver.current_url
                         logger.info(f"🔍 DEBUG: Search sonrası URL: {after_search_url}")
@@ -891,7 +1421,7 @@ class TikTokSeleniumScraper:
                     logger.warning("⚠️ Search butonu bulunamadı, Enter tuşu ile devam ediliyor...")
                     # Fallback: Enter tuşu
                     try:
-                        search_input = self.driver.find_element(By.CSS_SELECTOR, "input[placeholder*='Advertiser'], input[placeholder*='keyword']")
+                        search_input = self.driver.find_element(By.CSS_SELECTOR, SEARCH_INPUT_SELECTOR)
                         search_input.send_keys(Keys.ENTER)
                         logger.info("⌨️ Enter tuşu ile search yapıldı")
                     except:
@@ -899,7 +1429,7 @@ class TikTokSeleniumScraper:
                 
                 # Sonuçların yüklenmesini UZUN BEKLE (8-9 saniye sürebilir!)
                 logger.info("⏳ Filtrelenmiş sonuçlar yükleniyor (10 saniye bekleniyor)...")
-                time.sleep(10)
+                self._sleep(10)
                 
                 # DEBUG: Search sonrası Total ads kontrolü
                 try:
@@ -919,11 +1449,7 @@ class TikTokSeleniumScraper:
                     logger.warning(f"⚠️ DEBUG: Total ads bulunamadı: {total_ads_err}")
                 
                 # DEBUG: Screenshot (search sonrası)
-                try:
-                    self.driver.save_screenshot('/app/after_search_click.png')
-                    logger.info("📸 DEBUG: Search sonrası screenshot: /app/after_search_click.png")
-                except:
-                    pass
+                self.artifacts.capture(self.driver, TRIGGER_SAMPLE, 'after_search_click', screenshot=True)
                 
                 # #region agent log
                 # DEBUG: Search'ten sonra durum
@@ -957,7 +1483,7 @@ class TikTokSeleniumScraper:
                 
             except Exception as e:
                 logger.warning(f"Search butonuna tıklanamadı (devam ediliyor): {e}")
-                time.sleep(3)
+                self._sleep(3)
                 
                 # #region agent log
                 # DEBUG: Search başarısız - buton bulunamadı
@@ -981,12 +1507,15 @@ class TikTokSeleniumScraper:
                     logger.debug(f"Debug log failed: {log_e}")
                 # #endregion
             
+            timer.stop()
+            
             # "VIEW MORE" BUTTON CLICKING: TikTok'un pagination stratejisi
+            timer = self._phase('view_more')
             logger.info(f"'View more' butonu ile daha fazla reklam yükleniyor (hedef: {max_ads_per_search})...")
             
             # İlk scroll (View more butonunu görmek için)
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(3)
+            self._sleep(3)
             
             # View more butonuna basarak reklam yükleme
             view_more_clicks = 0
@@ -1002,6 +1531,10 @@ class TikTokSeleniumScraper:
                         logger.info(f"✅ Hedef reklam sayısına ulaşıldı: {current_ad_count} >= {max_ads_per_search}")
                         break
                     
+                    # Deadline: yüklü kartlarla devam et, metadata için süre bırak
+                    if self._out_of_time('view_more', VIEW_MORE_SECONDS + METADATA_RESERVE_SECONDS):
+                        break
+                    
                     # View more butonunu bul
                     view_more_selectors = [
                         "//span[@class='loading_more_text']",  # Ana selector
@@ -1014,7 +1547,7 @@ class TikTokSeleniumScraper:
                     view_more_button = None
                     for selector in view_more_selectors:
                         try:
-                            view_more_button = WebDriverWait(self.driver, 3).until(
+                            view_more_button = self._wait(3).until(
                                 EC.element_to_be_clickable((By.XPATH, selector))
                             )
                             if view_more_button:
@@ -1040,7 +1573,7 @@ class TikTokSeleniumScraper:
                     
                     # Yeni reklamların yüklenmesini bekle (kullanıcı 7-8 saniye dedi, güvenli olması için 10)
                     logger.info("⏳ Yeni reklamlar yükleniyor (10 saniye bekleniyor)...")
-                    time.sleep(10)
+                    self._sleep(10)
                     
                     # Yeni reklamlar yüklendi mi kontrol et
                     new_ad_count = len(self.driver.find_elements(By.CSS_SELECTOR, '.ad_card, div[class*="ad_card"]'))
@@ -1075,35 +1608,31 @@ class TikTokSeleniumScraper:
                     
                     # View more butonu için tekrar scroll
                     self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
+                    self._sleep(2)
                     
                 except Exception as e:
                     logger.warning(f"View more tıklama hatası: {e}")
                     break
             
-            logger.info(f"🎉 View more işlemi tamamlandı: {view_more_clicks} tıklama yapıldı")
+            timer.stop()
+            logger.info(f"🎉 View more işlemi tamamlandı: {view_more_clicks} tıklama yapıldı ({timer.elapsed:.1f}s)")
             
-            # DEBUG: Screenshot + Network logs kaydet
+            # DEBUG: Screenshot + Network logs kaydet (sadece örneklenen aramalarda)
             try:
-                screenshot_path = '/app/debug_screenshot.png'
-                self.driver.save_screenshot(screenshot_path)
-                logger.info(f"Screenshot kaydedildi: {screenshot_path}")
-                
-                # Network logs (performance logs)
+                # Performance log buffer'ını her durumda boşalt (chromedriver'da birikmesin)
                 network_logs = self.driver.get_log('performance')
-                import json
-                network_path = '/app/debug_network.json'
-                with open(network_path, 'w') as f:
-                    json.dump(network_logs, f, indent=2)
-                logger.info(f"Network logs kaydedildi: {network_path} ({len(network_logs)} entries)")
+                self._record_page_weight('listing', network_logs)
+                self.artifacts.capture(self.driver, TRIGGER_SAMPLE, 'after_view_more', screenshot=True, network_logs=network_logs)
             except Exception as debug_e:
                 logger.warning(f"Debug dosyaları kaydedilemedi: {debug_e}")
             
             # Reklam kartlarını bul
-            ad_elements = self._find_ad_elements()
+            with self._phase('card_discovery'):
+                ad_elements = self._find_ad_elements()
             
             if not ad_elements:
                 logger.warning("Reklam bulunamadı, sayfa yapısı değişmiş olabilir")
+                self._search_session_key = None  # Sonraki keyword temiz sayfayla başlasın
                 return []
             
             logger.info(f"{len(ad_elements)} reklam elementi bulundu")
@@ -1130,12 +1659,27 @@ class TikTokSeleniumScraper:
             
             # YENI STRATEJİ: 2-fazlı extraction
             # Faz 1: Önce TÜM metadata'yı topla (stale element önlemek için)
-            logger.info(f"📊 Faz 1: {len(ad_elements[:max_ads_per_search])} reklam için metadata toplanıyor...")
+            # Önceki keyword'lerde görülen ad_id'ler atlanır, bütçeye sayılmaz
+            logger.info(f"📊 Faz 1: en fazla {max_ads_per_search} yeni reklam için metadata toplanıyor...")
             metadata_list = []
-            for i, ad_element in enumerate(ad_elements[:max_ads_per_search]):
+            duplicates = 0
+            timer = self._phase('metadata')
+            for i, ad_element in enumerate(ad_elements):
+                if len(metadata_list) >= max_ads_per_search:
+                    break
+                if self.deadline.expired():
+                    self.stats.mark_truncated('metadata')
+                    break
                 try:
                     # Sadece metadata al (advertiser, dates, ad_url) - detay sayfasına gitme!
                     metadata = self._extract_ad_metadata(ad_element)
+                    if not self.seen_ads.claim(metadata.get('ad_id')):
+                        duplicates += 1
+                        CACHE_HITS_TOTAL.inc(cache='ad_id')
+                        logger.debug(f"↺ Metadata {i}: ad_id {metadata.get('ad_id')} daha önce görüldü, atlandı")
+                        continue
+                    if metadata.get('ad_id'):
+                        self._unit_claims.append(metadata['ad_id'])
                     metadata['scrape_index'] = i
                     metadata['scraped_at'] = datetime.now().isoformat()
                     metadata_list.append(metadata)
@@ -1144,39 +1688,94 @@ class TikTokSeleniumScraper:
                     logger.warning(f"Metadata {i} çıkarma hatası: {e}")
                     continue
             
-            logger.info(f"✅ Faz 1 tamamlandı: {len(metadata_list)} metadata toplandı")
-            
-            # Faz 2: Her metadata için detay sayfasından video çek
-            logger.info(f"🎥 Faz 2: {len(metadata_list)} reklam için video çekiliyor...")
-            for i, metadata in enumerate(metadata_list):
+            timer.stop()
+            self.stats.record_completion('metadata', len(metadata_list), min(len(ad_elements) - duplicates, max_ads_per_search))
+            logger.info(f"✅ Faz 1 tamamlandı: {len(metadata_list)} metadata toplandı ({duplicates} duplicate atlandı)")
+            
+            # Faz 2: Detay sayfalarından video çek - öncelik sırasıyla
+            # (whitelist, bankacılık eşleşmesi, last_shown yakınlığı). Media'sı cache'te
+            # olan reklamlar detay sayfası açılmadan çözülür.
+            queue = DetailQueue(whitelist=priority_advertisers)
+            for metadata in metadata_list:
+                cached_media = self.media_cache.get(metadata.get('ad_id'))
+                if cached_media:
+                    ad_data = metadata.copy()
+                    ad_data.update(cached_media)
+                    ad_data['media_status'] = MEDIA_CACHED
+                    ads.append(ad_data)
+                    CACHE_HITS_TOTAL.inc(cache='media')
+                    self.stats.mark_ad_ready()
+                else:
+                    queue.push(metadata)
+            
+            total = len(queue)
+            logger.info(f"🎥 Faz 2: {total} reklam için video çekiliyor ({len(ads)} cache'ten)...")
+            budget = settings.detail_phase_budget_seconds
+            phase_started = time.monotonic()
+            i = 0
+            while queue:
+                if budget and time.monotonic() - phase_started >= budget:
+                    logger.warning(f"⏱️ Faz 2 bütçesi ({budget}s) doldu, {len(queue)} reklam unresolved kalacak")
+                    self.stats.mark_truncated('detail_pages')
+                    break
+                if self._out_of_time('detail_pages', self._detail_page_estimate):
+                    break
+                # Detay sayfaları arası güvenli nokta: _navigate her sayfada bellek ölçtü
+                if not self._maybe_recycle(sample=False):
+                    self._unit_error = RuntimeError(f"Browser yeniden başlatılamadı: {self.setup_error}")
+                    break
+                metadata = queue.pop()
+                i += 1
                 try:
                     ad_data = metadata.copy()
                     
                     # Detay sayfasından video çek
                     ad_url = metadata.get('ad_url', '')
                     if ad_url and '/ads/detail/' in ad_url:
+                        detail_started = time.monotonic()
                         media_data = self._extract_video_from_detail_page(ad_url)
+                        # Detay sayfası süre tahmini (deadline kontrolü için)
+                        self._detail_page_estimate = 0.7 * self._detail_page_estimate + 0.3 * (time.monotonic() - detail_started)
                         ad_data.update(media_data)
-                        logger.info(f"✅ [{i+1}/{len(metadata_list)}] Video: {ad_data.get('advertiser_name', 'Unknown')} - {media_data.get('media_type')}")
+                        ad_data['media_status'] = MEDIA_RESOLVED
+                        self.media_cache.put(metadata.get('ad_id'), media_data)
+                        logger.info(f"✅ [{i}/{total}] Video (skor {metadata['priority_score']}): {ad_data.get('advertiser_name', 'Unknown')} - {media_data.get('media_type')}")
                     else:
-                        logger.warning(f"⚠️ [{i+1}/{len(metadata_list)}] Ad URL yok, video skip")
+                        logger.warning(f"⚠️ [{i}/{total}] Ad URL yok, video skip")
                         ad_data['media_type'] = 'text'
                         ad_data['media_urls'] = []
+                        ad_data['media_status'] = MEDIA_NO_DETAIL
                     
                     ads.append(ad_data)
+                    self.stats.mark_ad_ready()
                     
                 except Exception as e:
-                    logger.warning(f"Reklam {i+1} video extraction hatası: {e}")
-                    # Metadata'yı yine de ekle (video olmadan)
+                    logger.warning(f"Reklam {i} video extraction hatası: {e}")
+                    # Metadata'yı yine de ekle (video olmadan, sonra tekrar denenebilir)
                     metadata['media_type'] = 'text'
                     metadata['media_urls'] = []
+                    metadata['media_status'] = MEDIA_UNRESOLVED
                     ads.append(metadata)
                     continue
             
+            self.stats.record_completion('detail_pages', total - len(queue), total)
+            
+            # Bütçe dışında kalanlar: metadata ile dön, media sonra çözülebilir
+            for metadata in queue.drain():
+                metadata['media_type'] = 'text'
+                metadata['media_urls'] = []
+                metadata['media_status'] = MEDIA_UNRESOLVED
+                ads.append(metadata)
+            
+            # Çıktı listing sırasında kalsın
+            ads.sort(key=lambda ad: ad.get('scrape_index', 0))
+            
             logger.info(f"✅ Faz 2 tamamlandı: {len(ads)} reklam işlendi")
             
         except Exception as e:
             logger.error(f"URL scraping hatası: {e}")
+            self._search_session_key = None
+            self._unit_error = e
         
         return ads
     
@@ -1184,18 +1783,18 @@ class TikTokSeleniumScraper:
         """Sayfadaki reklam elementlerini bul - TikTok güncel yapısı"""
         try:
             # Önce sayfanın tam yüklenmesini bekle - UZUN BEKLE (TikTok yavaş yüklenebilir)
-            WebDriverWait(self.driver, 15).until(
+            self._wait(15).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
             # JavaScript'in çalışması ve reklamların yüklenmesi için kısa bekle
             # (Çünkü _scrape_ads_from_url zaten agresif scroll yaptı)
             logger.info("Reklamların DOM'a yüklenmesini bekliyorum...")
-            time.sleep(2)
+            self._sleep(2)
             
             # Scroll to top to ensure we catch all elements
             self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(1)
+            self._sleep(1)
             logger.info("Elementleri arıyorum...")
             
             # #region agent log
@@ -1305,15 +1904,8 @@ class TikTokSeleniumScraper:
             
             logger.warning("Hiçbir reklam elementi bulunamadı")
             # Debug için sayfa kaynağını kaydet
-            try:
-                page_source = self.driver.page_source
-                debug_path = Path(__file__).parent.parent.parent / 'debug_page_source.html'
-                with open(debug_path, 'w', encoding='utf-8') as f:
-                    f.write(page_source)
-                logger.info(f"Debug: Sayfa kaynağı '{debug_path}' dosyasına kaydedildi")
-            except Exception as debug_e:
-                logger.debug(f"Debug dosyası kaydedilemedi: {debug_e}")
-                return []
+            self.artifacts.capture(self.driver, TRIGGER_FAILURE, 'no_ad_elements', page_source=True)
+            return []
             
         except Exception as e:
             logger.error(f"Element bulma hatası: {e}")
@@ -1414,12 +2006,12 @@ class TikTokSeleniumScraper:
                 arguments[0].dispatchEvent(new MouseEvent('mouseenter', {bubbles: true}));
             """, video_player)
             
-            time.sleep(1)
+            self._sleep(1)
             
             # Click et
             self.driver.execute_script("arguments[0].click();", video_player)
             
-            time.sleep(2)
+            self._sleep(2)
             
         except Exception as e:
             logger.debug(f"Video trigger hatası: {e}")
@@ -1534,7 +2126,7 @@ class TikTokSeleniumScraper:
                 if href:
                     # Tam URL yap
                     if href.startswith('/'):
-                        href = f"https://library.tiktok.com{href}"
+                        href = f"{self.base_url}{href}"
                     data['ad_url'] = href
                     
                     # Ad ID'yi URL'den çıkar
@@ -1549,7 +2141,7 @@ class TikTokSeleniumScraper:
                         href = link_elem.get_attribute('href')
                         if href and 'ad_id=' in href:
                             if href.startswith('/'):
-                                href = f"https://library.tiktok.com{href}"
+                                href = f"{self.base_url}{href}"
                             data['ad_url'] = href
                             ad_id = href.split('ad_id=')[1].split('&')[0]
                             data['ad_id'] = ad_id
@@ -1583,12 +2175,16 @@ class TikTokSeleniumScraper:
             return data
         
         current_url = self.driver.current_url
+        timer = self._phase('detail_page')
+        DETAIL_PAGES_TOTAL.inc()
+        self.detail_pages_opened += 1
         
         try:
             # Detay sayfasına git
             logger.info(f"📄 Detay sayfasına gidiliyor: {ad_url[:80]}...")
-            self.driver.get(ad_url)
-            time.sleep(3)  # Sayfa yüklensin
+            self._use_resource_profile(settings.detail_resource_profile)
+            self._navigate(ad_url)
+            self._sleep(3)  # Sayfa yüklensin
             
             # Video elementini bul
             video_selectors = [
@@ -1605,7 +2201,7 @@ class TikTokSeleniumScraper:
                         sources = self.driver.find_elements(By.CSS_SELECTOR, selector)
                         for source in sources:
                             src = source.get_attribute('src')
-                            if src and ('.mp4' in src.lower() or 'video' in src.lower()):
+                            if src and classify_media_url(src).media_type == 'video':
                                 data['media_urls'].append(src)
                                 data['media_type'] = 'video'
                                 data['video_found'] = True
@@ -1617,7 +2213,7 @@ class TikTokSeleniumScraper:
                         for video in videos:
                             # Önce src attribute
                             src = video.get_attribute('src')
-                            if src and ('.mp4' in src.lower() or 'video' in src.lower()):
+                            if src and classify_media_url(src).media_type == 'video':
                                 data['media_urls'].append(src)
                                 data['media_type'] = 'video'
                                 data['video_found'] = True
@@ -1628,7 +2224,7 @@ class TikTokSeleniumScraper:
                             try:
                                 source = video.find_element(By.TAG_NAME, 'source')
                                 src = source.get_attribute('src')
-                                if src and ('.mp4' in src.lower() or 'video' in src.lower()):
+                                if src and classify_media_url(src).media_type == 'video':
                                     data['media_urls'].append(src)
                                     data['media_type'] = 'video'
                                     data['video_found'] = True
@@ -1648,7 +2244,7 @@ class TikTokSeleniumScraper:
                     imgs = self.driver.find_elements(By.CSS_SELECTOR, selector)
                     for img in imgs:
                         src = img.get_attribute('src')
-                        if src and ('ibyteimg' in src or 'tiktokcdn' in src):
+                        if src and classify_media_url(src).is_tiktok_cdn:
                             data['media_urls'].append(src)
                             data['media_type'] = 'image'
                             logger.info(f"📷 IMAGE bulundu (detay sayfası): {src[:80]}...")
@@ -1663,10 +2259,13 @@ class TikTokSeleniumScraper:
         finally:
             # Ana sayfaya geri dön
             try:
-                self.driver.get(current_url)
-                time.sleep(2)
+                self._record_page_weight('detail', self.driver.get_log('performance'))
+                self._use_resource_profile(settings.listing_resource_profile)
+                self._navigate(current_url)
+                self._sleep(2)
             except:
                 pass
+            timer.stop()
         
         return data
 
@@ -1729,7 +2328,7 @@ class TikTokSeleniumScraper:
                             sources = video.find_elements(By.TAG_NAME, 'source')
                             for source in sources:
                                 src = source.get_attribute('src')
-                                if src and ('ibyteimg.com' in src or '.mp4' in src.lower() or 'video' in src.lower()):
+                                if src and (classify_media_url(src).is_tiktok_cdn or classify_media_url(src).media_type == 'video'):
                                     video_url = src
                                     logger.info(f"✅ Video URL <source> tag'inden bulundu: {src[:100]}...")
                                     break
@@ -1739,7 +2338,7 @@ class TikTokSeleniumScraper:
                         # 2. Video tag'inin src attribute'ü (ikinci seçenek)
                         if not video_url:
                             src = video.get_attribute('src')
-                            if src and ('ibyteimg.com' in src or '.mp4' in src.lower() or 'video' in src.lower()):
+                            if src and (classify_media_url(src).is_tiktok_cdn or classify_media_url(src).media_type == 'video'):
                                 # URL'nin gerçekten video olup olmadığını kontrol et
                                 if not src.endswith('.jpg') and not src.endswith('.jpeg') and not src.endswith('.png'):
                                     video_url = src
@@ -1749,7 +2348,7 @@ class TikTokSeleniumScraper:
                         if not video_url:
                             for attr in ['data-src', 'data-video-url', 'data-url', 'data-video']:
                                 src = video.get_attribute(attr)
-                                if src and 'ibyteimg.com' in src:
+                                if src and classify_media_url(src).is_tiktok_cdn:
                                     if not src.endswith(('.jpg', '.jpeg', '.png', '.gif')):
                                         video_url = src
                                         logger.info(f"✅ Video URL {attr} attribute'ünden bulundu: {src[:100]}...")
@@ -1759,7 +2358,7 @@ class TikTokSeleniumScraper:
                         # NOT: Poster thumbnail'dir, gerçek video DEĞİL!
                         if not video_url:
                             poster = video.get_attribute('poster')
-                            if poster and 'ibyteimg.com' in poster:
+                            if poster and classify_media_url(poster).is_tiktok_cdn:
                                 # Poster'ı KULLANMA - media_type'ı image yap
                                 logger.warning(f"⚠️ Sadece poster (thumbnail/image) bulundu, gerçek video yok: {poster[:100]}...")
                                 # Poster'ı media_urls'e ekle ama media_type'ı image yap
@@ -1823,8 +2422,9 @@ class TikTokSeleniumScraper:
                                     logger.info(f"✅ Image URL bulundu: {src[:100]}...")
                                     # #region agent log
                                     try:
-                                        looks_like_video = ('video' in src.lower() or '.mp4' in src.lower())
-                                        looks_like_thumb = bool(re.search(r'(thumb|poster|preview|cover|ibyteimg)', src, re.IGNORECASE))
+                                        src_info = classify_media_url(src)
+                                        looks_like_video = src_info.media_type == 'video'
+                                        looks_like_thumb = src_info.is_thumbnail or 'ibyteimg' in src_info.tokens
                                         with open("/app/debug.log", "a", encoding="utf-8") as f:
                                             f.write(json.dumps({
                                                 "sessionId": "debug-session",
@@ -1864,7 +2464,7 @@ class TikTokSeleniumScraper:
                                 media_url = url_match.group(1).strip()
                                 # Placeholder SVG'leri ve base64'leri filtrele
                                 # TikTok CDN: ibyteimg.com VE tiktokcdn.com (her ikisi de TikTok'a ait)
-                                is_tiktok_cdn = 'ibyteimg.com' in media_url or 'tiktokcdn.com' in media_url
+                                is_tiktok_cdn = classify_media_url(media_url).is_tiktok_cdn
                                 if (media_url and 
                                     media_url != 'none' and 
                                     not media_url.startswith('data:image/svg+xml') and
@@ -1875,7 +2475,17 @@ class TikTokSeleniumScraper:
                                     # STRATEJI: .video_player → %95 video thumbnail'ıdır
                                     # Content-Type kontrolü OPSIYONEL (hata olursa class'a güven)
                                     try:
-                                        actual_type = check_url_content_type(media_url, timeout=2)
+                                        # Deadline yakınsa HEAD atla → class'a güven
+                                        # CDN bucket'ında token yoksa da HEAD atla
+                                        if (self._out_of_time('media_probe', MEDIA_PROBE_SECONDS) or
+                                                not rate_limiter.acquire(media_url, timeout=MEDIA_PROBE_SECONDS,
+                                                                         sleep=self.stats.sleep)):
+                                            actual_type = 'unknown'
+                                        else:
+                                            actual_type = check_url_content_type(
+                                                media_url, timeout=MEDIA_PROBE_SECONDS,
+                                                proxies=self.proxy.requests_proxies if self.proxy else None
+                                            )
                                         
                                         if actual_type == 'video':
                                             data['media_type'] = 'video'
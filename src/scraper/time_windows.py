@@ -0,0 +1,150 @@
+import json
+import math
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from loguru import logger
+from pydantic import BaseModel
+
+from src.config.settings import settings
+from src.scraper.detail_priority import parse_shown_date
+
+# Yeni gözlemin günlük yoğunluk ortalamasındaki ağırlığı
+DENSITY_EMA_ALPHA = 0.3
+# Limitte kesilen aramada gerçek yoğunluk gözlenenden fazla; pencereler bu oranla daraltılır
+SATURATION_FACTOR = 2.0
+MAX_HISTORY_DAYS = 120
+
+
+class TimeWindow(BaseModel):
+    """Arama URL'inin start_time–end_time aralığı"""
+
+    start: datetime
+    end: datetime
+    # Plan anına göre gün ofsetleri (checkpoint/job id'lerinde kullanılır, örn. "0-7d")
+    label: str = ""
+
+    @classmethod
+    def last_days(cls, days_back: int, now: Optional[datetime] = None) -> "TimeWindow":
+        end = now or datetime.now()
+        return cls(start=end - timedelta(days=days_back), end=end, label=f"0-{days_back}d")
+
+    @property
+    def days(self) -> float:
+        return (self.end - self.start).total_seconds() / 86400
+
+
+def density_key(search_type: str, term: str, region: str) -> str:
+    return f"{search_type}:{term.strip().lower()}:{region}"
+
+
+class AdDensityHistory:
+    """Arama terimi başına gün ofsetine göre (0 = bugün) ortalama reklam/gün
+
+    Her aramanın sonucu last_shown tarihine göre günlere dağıtılır (tarih
+    okunamayan reklamlar pencereye eşit yayılır) ve EMA ile birleştirilir.
+    Process'ler arası kilit yok: son yazan kazanır, plan için yeterli.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.ad_density_path)
+        self._lock = threading.Lock()
+        self._data: Optional[Dict[str, Dict[str, float]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        if self._data is None:
+            try:
+                self._data = json.loads(self.path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps(self._data, ensure_ascii=False), encoding='utf-8')
+            tmp_path.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Reklam yoğunluk geçmişi yazılamadı ({self.path}): {e}")
+
+    def daily(self, key: str) -> Dict[int, float]:
+        with self._lock:
+            return {int(day): value for day, value in self._load().get(key, {}).items()}
+
+    def record(self, key: str, window: TimeWindow, ads: List[Dict], saturated: bool = False,
+               now: Optional[datetime] = None):
+        """Penceredeki reklamları gün ofsetlerine dağıtıp geçmişe ekle"""
+        now = now or datetime.now()
+        first_day = max(0, int((now - window.end).total_seconds() // 86400))
+        last_day = min(MAX_HISTORY_DAYS, max(first_day + 1, math.ceil((now - window.start).total_seconds() / 86400)))
+        days = range(first_day, last_day)
+
+        observed = {day: 0.0 for day in days}
+        undated = 0
+        for ad in ads:
+            shown = parse_shown_date(ad.get('last_shown') or '')
+            day = (now - shown).days if shown else None
+            if day in observed:
+                observed[day] += 1
+            else:
+                undated += 1
+        factor = SATURATION_FACTOR if saturated else 1.0
+        with self._lock:
+            history = self._load().setdefault(key, {})
+            for day in days:
+                value = (observed[day] + undated / len(days)) * factor
+                previous = history.get(str(day))
+                history[str(day)] = value if previous is None else previous + DENSITY_EMA_ALPHA * (value - previous)
+            self._save()
+
+
+def plan_windows(days_back: int,
+                 keys: Iterable[str] = (),
+                 target_ads: Optional[int] = None,
+                 now: Optional[datetime] = None,
+                 history: Optional[AdDensityHistory] = None) -> List[TimeWindow]:
+    """days_back aralığını beklenen reklam sayısı ~target_ads olan pencerelere böl
+
+    Yoğun (genelde yakın) günler dar, seyrek günler geniş pencere alır. Geçmiş
+    yoksa time_window_default_days'lik eşit pencereler kullanılır. Pencereler
+    en yeniden eskiye sıralıdır.
+    """
+    now = now or datetime.now()
+    target_ads = target_ads or settings.time_window_target_ads
+    history = history or ad_density
+    max_windows = max(1, settings.time_window_max_windows)
+
+    daily: Dict[int, float] = {}
+    for key in keys:
+        for day, value in history.daily(key).items():
+            daily[day] = daily.get(day, 0.0) + value
+
+    if daily:
+        mean = sum(daily.values()) / len(daily)
+        expected = [daily.get(day, mean) for day in range(days_back)]
+        # Pencere sayısı max_windows'u geçmesin
+        target = max(target_ads, sum(expected) / max_windows)
+        bounds, accumulated = [0], 0.0
+        for day, value in enumerate(expected):
+            accumulated += value
+            if accumulated >= target and day + 1 < days_back:
+                bounds.append(day + 1)
+                accumulated = 0.0
+        bounds.append(days_back)
+    else:
+        count = min(max_windows, math.ceil(days_back / max(1, settings.time_window_default_days)))
+        width = math.ceil(days_back / count)
+        bounds = list(range(0, days_back, width)) + [days_back]
+
+    windows = [
+        TimeWindow(start=now - timedelta(days=older), end=now - timedelta(days=newer), label=f"{newer}-{older}d")
+        for newer, older in zip(bounds, bounds[1:])
+    ]
+    logger.info(f"🗓️ {days_back} gün {len(windows)} pencereye bölündü: {[w.label for w in windows]}")
+    return windows
+
+
+# Process genelinde paylaşılan yoğunluk geçmişi
+ad_density = AdDensityHistory()
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from loguru import logger
+
+from src.config.settings import settings
+
+
+def _safe_name(job_id: str) -> str:
+    name = re.sub(r'[^A-Za-z0-9_.-]+', '_', job_id).strip('_')[:80] or "job"
+    # Farklı job_id'ler aynı dosya adına düşmesin
+    return f"{name}-{hashlib.md5(job_id.encode('utf-8')).hexdigest()[:8]}"
+
+
+class JobCheckpoint:
+    """Çok keyword'lü job'ın diskteki ilerlemesi
+
+    Her arama birimi (keyword / advertiser) bittiğinde birimin reklamları,
+    sahiplenilen ad_id'ler ve çözülmüş media atomik olarak yazılır. Aynı
+    job_id ve parametrelerle yeniden başlatılan job tamamlanmış birimleri
+    atlar. Zaman penceresi planları da saklanır: yeniden başlatılan job
+    (yoğunluk geçmişi bu arada değişmiş olsa bile) aynı pencereleri arar.
+    Job eksiksiz bittiğinde checkpoint silinir.
+    """
+
+    def __init__(self, job_id: str, params: Optional[Dict[str, Any]] = None, base_dir: Optional[str] = None):
+        self.job_id = job_id
+        self.params = params or {}
+        self.path = Path(base_dir or settings.checkpoint_path) / f"{_safe_name(job_id)}.json"
+
+        self.done_units: List[str] = []
+        self.ads: List[Dict] = []
+        self.seen_ad_ids: List[str] = []
+        self.media: Dict[str, Dict] = {}
+        self.failed_units: List[str] = []
+        # Arama terimi (density_key) → planlanan pencereler [{'start', 'end', 'label'}]
+        self.window_plans: Dict[str, List[Dict[str, str]]] = {}
+        self.resumed_units = 0
+        # Paralel aranan pencereler aynı checkpoint'e yazar
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        if data.get('params') != self.params:
+            logger.warning(f"Checkpoint '{self.job_id}' farklı parametrelerle oluşturulmuş, yeniden başlanıyor")
+            return
+        self.done_units = data.get('done_units', [])
+        self.ads = data.get('ads', [])
+        self.seen_ad_ids = data.get('seen_ad_ids', [])
+        self.media = data.get('media', {})
+        self.window_plans = data.get('window_plans', {})
+        self.resumed_units = len(self.done_units)
+        if self.done_units:
+            logger.info(f"📌 Checkpoint '{self.job_id}': {len(self.done_units)} birim, {len(self.ads)} reklam geri yüklendi")
+
+    def is_done(self, unit: str) -> bool:
+        return unit in self.done_units
+
+    def record_unit(self, unit: str, ads: List[Dict], ad_ids: Iterable[str], media: Dict[str, Dict]):
+        """Tamamlanan birimi ekle ve diske yaz"""
+        with self._lock:
+            if unit in self.done_units:
+                return
+            self.done_units.append(unit)
+            self.ads.extend(ads)
+            self.seen_ad_ids.extend(ad_id for ad_id in ad_ids if ad_id)
+            self.media.update(media)
+            if unit in self.failed_units:
+                self.failed_units.remove(unit)
+            self._save()
+
+    def window_plan(self, key: str) -> Optional[List[Dict[str, str]]]:
+        return self.window_plans.get(key)
+
+    def record_window_plan(self, key: str, windows: List[Dict[str, str]]):
+        """İlk planlanan pencereleri yaz (sonraki planlar yok sayılır)"""
+        with self._lock:
+            if key in self.window_plans:
+                return
+            self.window_plans[key] = windows
+            self._save()
+
+    def record_failure(self, unit: str):
+        """Tekrar denemeleri tükenen birim (checkpoint'te kalır, sonraki çalıştırma tekrar dener)"""
+        with self._lock:
+            if unit not in self.failed_units:
+                self.failed_units.append(unit)
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            tmp_path.write_text(json.dumps({
+                'job_id': self.job_id,
+                'params': self.params,
+                'saved_at': time.time(),
+                'done_units': self.done_units,
+                'ads': self.ads,
+                'seen_ad_ids': self.seen_ad_ids,
+                'media': self.media,
+                'window_plans': self.window_plans,
+            }, ensure_ascii=False, default=str), encoding='utf-8')
+            tmp_path.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Checkpoint yazılamadı ({self.path}): {e}")
+
+    def clear(self):
+        """Job eksiksiz bitti: checkpoint dosyasını sil"""
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
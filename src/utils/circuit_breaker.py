@@ -0,0 +1,148 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from src.config.settings import settings
+from src.utils.metrics import CIRCUIT_OPENS_TOTAL, CIRCUIT_STATE
+
+DIRECT_IDENTITY = "direct"
+
+# Breaker durumları (CIRCUIT_STATE gauge değerleri)
+STATE_CLOSED = "closed"
+STATE_HALF_OPEN = "half_open"
+STATE_OPEN = "open"
+STATE_VALUES = {STATE_CLOSED: 0, STATE_HALF_OPEN: 1, STATE_OPEN: 2}
+
+
+class CircuitBreaker:
+    """Egress kimliği (IP/proxy) başına circuit breaker
+
+    Ban göstergesi breaker'ı hemen, art arda boş sayfa anomalileri eşik
+    aşılınca açar. Açık breaker backoff süresi dolana kadar dispatch'i
+    durdurur; sonra tek bir ucuz probe'a izin verilir (half-open). Probe
+    başarılıysa kapanır, değilse backoff ikiye katlanarak tekrar açılır.
+    """
+
+    def __init__(self,
+                 identity: str = DIRECT_IDENTITY,
+                 anomaly_threshold: Optional[int] = None,
+                 base_backoff: Optional[float] = None,
+                 max_backoff: Optional[float] = None):
+        self.identity = identity
+        self.anomaly_threshold = anomaly_threshold or settings.circuit_anomaly_threshold
+        self.base_backoff = base_backoff if base_backoff is not None else settings.circuit_base_backoff_seconds
+        self.max_backoff = max_backoff if max_backoff is not None else settings.circuit_max_backoff_seconds
+
+        self._lock = threading.Lock()
+        self.state = STATE_CLOSED
+        self.anomalies = 0
+        self.consecutive_opens = 0  # Başarılı probe'a kadar; backoff üssü
+        self.open_until = 0.0
+        self.last_reason: Optional[str] = None
+        self._set_state(STATE_CLOSED)
+
+    def _set_state(self, state: str):
+        self.state = state
+        CIRCUIT_STATE.set(STATE_VALUES[state], identity=self.identity)
+
+    def _open(self, reason: str):
+        self.consecutive_opens += 1
+        backoff = min(self.base_backoff * 2 ** (self.consecutive_opens - 1), self.max_backoff)
+        self.open_until = time.monotonic() + backoff
+        self.anomalies = 0
+        self.last_reason = reason
+        self._set_state(STATE_OPEN)
+        CIRCUIT_OPENS_TOTAL.inc(identity=self.identity, reason=reason)
+
+    def record_ban(self, indicator: str):
+        """Ban göstergesi: breaker hemen açılır"""
+        with self._lock:
+            self._open(f"ban:{indicator}")
+
+    def record_anomaly(self):
+        """Boş sayfa vb. anomali: eşik aşılırsa breaker açılır"""
+        with self._lock:
+            self.anomalies += 1
+            if self.anomalies >= self.anomaly_threshold:
+                self._open("anomaly")
+
+    def record_success(self):
+        """Sağlıklı sayfa: anomali sayacı sıfırlanır"""
+        with self._lock:
+            self.anomalies = 0
+            if self.state == STATE_HALF_OPEN:
+                self.consecutive_opens = 0
+                self._set_state(STATE_CLOSED)
+
+    def seconds_until_probe(self) -> float:
+        """Probe'a kadar beklenecek süre (kapalı/half-open ise 0)"""
+        with self._lock:
+            if self.state != STATE_OPEN:
+                return 0.0
+            return max(self.open_until - time.monotonic(), 0.0)
+
+    def available(self) -> bool:
+        """Dispatch edilebilir mi (kapalı veya probe zamanı gelmiş)"""
+        return self.seconds_until_probe() <= 0
+
+    def needs_probe(self) -> bool:
+        """Backoff doldu: iş göndermeden önce ucuz probe gerekli mi"""
+        with self._lock:
+            if self.state == STATE_OPEN and time.monotonic() >= self.open_until:
+                self._set_state(STATE_HALF_OPEN)
+            return self.state == STATE_HALF_OPEN
+
+    def record_probe(self, healthy: bool):
+        """Probe sonucu: başarılıysa kapat, değilse daha uzun backoff ile tekrar aç"""
+        with self._lock:
+            if healthy:
+                self.consecutive_opens = 0
+                self.anomalies = 0
+                self._set_state(STATE_CLOSED)
+            else:
+                self._open("probe_failed")
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'identity': self.identity,
+                'state': self.state,
+                'retry_in_seconds': round(max(self.open_until - time.monotonic(), 0.0), 1)
+                if self.state == STATE_OPEN else 0.0,
+                'consecutive_opens': self.consecutive_opens,
+                'last_reason': self.last_reason,
+            }
+
+
+class BreakerRegistry:
+    """Process genelinde kimlik → breaker (tüm scraper/worker'lar paylaşır)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, identity: Optional[str] = None) -> CircuitBreaker:
+        identity = identity or DIRECT_IDENTITY
+        with self._lock:
+            breaker = self._breakers.get(identity)
+            if breaker is None:
+                breaker = self._breakers[identity] = CircuitBreaker(identity)
+            return breaker
+
+    def healthiest(self, identities: Iterable[str]) -> Optional[str]:
+        """Dispatch için en uygun kimlik: kapalı olanlar önce, yoksa probe'u en yakın olan"""
+        candidates = list(identities)
+        if not candidates:
+            return None
+        return min(candidates, key=lambda identity: (
+            not self.get(identity).available(), self.get(identity).seconds_until_probe()
+        ))
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [breaker.snapshot() for breaker in breakers]
+
+
+# Global registry
+breakers = BreakerRegistry()
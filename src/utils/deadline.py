@@ -0,0 +1,43 @@
+import math
+import time
+from typing import Optional
+
+
+class Deadline:
+    """Job için mutlak bitiş zamanı
+
+    Her bekleme, pagination döngüsü ve detay sayfası adımı kalan süreye göre
+    küçülür. seconds=None sınırsız deadline'dır; tüm kontroller eski davranışı
+    korur. reserve, sonuçları işleyip döndürmek için ayrılan süredir.
+    """
+
+    def __init__(self, seconds: Optional[float] = None, reserve: float = 0.0):
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.expires_at = self.started + max(seconds - reserve, 0.0) if seconds else None
+
+    @property
+    def unlimited(self) -> bool:
+        return self.expires_at is None
+
+    def remaining(self) -> float:
+        """Kalan süre (saniye); sınırsızsa inf"""
+        if self.expires_at is None:
+            return math.inf
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def allows(self, estimated_seconds: float) -> bool:
+        """Tahmini bu kadar sürecek bir adım deadline'dan önce biter mi"""
+        return self.remaining() >= estimated_seconds
+
+    def clamp(self, seconds: float) -> float:
+        """Bekleme/timeout süresini kalan süreyle sınırla"""
+        return max(min(seconds, self.remaining()), 0.0)
+
+    def __repr__(self) -> str:
+        if self.unlimited:
+            return "Deadline(unlimited)"
+        return f"Deadline(remaining={self.remaining():.1f}s)"
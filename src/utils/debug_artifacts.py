@@ -0,0 +1,149 @@
+import gzip
+import json
+import random
+import threading
+import queue
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List, Optional
+from loguru import logger
+
+from src.config.settings import settings
+from src.utils.helpers import create_filename_safe
+
+# Artifact tetikleyicileri
+TRIGGER_FAILURE = "failure"
+TRIGGER_BAN = "ban"
+TRIGGER_SAMPLE = "sample"
+
+
+class DebugArtifactManager:
+    """Debug artifact'larını (page source, screenshot, network log) bütçeli kaydet
+
+    Artifact'lar sadece tetikleyici varsa alınır (hata, ban, örnekleme),
+    sıkıştırılır ve arka plan thread'inde diske yazılır. Toplam boyut
+    bütçeyi aşarsa en eski dosyalar silinir.
+    """
+
+    def __init__(self,
+                 base_dir: Optional[str] = None,
+                 max_bytes: Optional[int] = None,
+                 sample_rate: Optional[float] = None,
+                 enabled: Optional[bool] = None):
+        self.base_dir = Path(base_dir or settings.debug_artifacts_path)
+        self.max_bytes = max_bytes if max_bytes is not None else settings.debug_artifacts_max_mb * 1024 * 1024
+        self.sample_rate = sample_rate if sample_rate is not None else settings.debug_artifacts_sample_rate
+        self.enabled = enabled if enabled is not None else settings.debug_artifacts_enabled
+
+        self._sampled = False
+        self._label = "run"
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start_trace(self, label: str) -> bool:
+        """Yeni arama için örnekleme kararı ver (keyword başına bir kez)"""
+        self._label = create_filename_safe(label or "run", max_length=30)
+        self._sampled = self.enabled and self.sample_rate > 0 and random.random() < self.sample_rate
+        if self._sampled:
+            logger.debug(f"Debug artifact örneklemesi aktif: {self._label}")
+        return self._sampled
+
+    def should_capture(self, trigger: str) -> bool:
+        """Bu tetikleyici için artifact alınmalı mı"""
+        if not self.enabled:
+            return False
+        if trigger == TRIGGER_SAMPLE:
+            return self._sampled
+        return trigger in (TRIGGER_FAILURE, TRIGGER_BAN)
+
+    def capture(self,
+                driver,
+                trigger: str,
+                name: str,
+                page_source: bool = False,
+                screenshot: bool = False,
+                network_logs: Optional[List[Any]] = None) -> bool:
+        """Driver'dan artifact al ve yazma kuyruğuna ekle
+
+        Driver'dan veri okuma senkron yapılır; sıkıştırma ve disk I/O
+        arka plan thread'inde yapılır.
+        """
+        if not self.should_capture(trigger):
+            return False
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        prefix = f"{timestamp}_{trigger}_{self._label}_{create_filename_safe(name, max_length=30)}"
+
+        try:
+            if page_source and driver is not None:
+                self._enqueue(f"{prefix}.html.gz", driver.page_source.encode('utf-8'), compress=True)
+            if screenshot and driver is not None:
+                # PNG zaten sıkıştırılmış, tekrar gzip'leme
+                self._enqueue(f"{prefix}.png", driver.get_screenshot_as_png(), compress=False)
+            if network_logs is not None:
+                payload = json.dumps(network_logs, separators=(',', ':')).encode('utf-8')
+                self._enqueue(f"{prefix}.network.json.gz", payload, compress=True)
+        except Exception as e:
+            logger.warning(f"Debug artifact alınamadı ({name}): {e}")
+            return False
+
+        logger.info(f"📸 Debug artifact kuyruğa alındı: {prefix} (trigger={trigger})")
+        return True
+
+    def flush(self, timeout: float = 10.0):
+        """Bekleyen yazma işlemlerinin bitmesini bekle"""
+        if self._writer is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _enqueue(self, filename: str, data: bytes, compress: bool):
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="debug-artifact-writer", daemon=True)
+                self._writer.start()
+        self._queue.put((filename, data, compress))
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+
+            filename, data, compress = item
+            try:
+                self.base_dir.mkdir(parents=True, exist_ok=True)
+                if compress:
+                    data = gzip.compress(data, compresslevel=6)
+                (self.base_dir / filename).write_bytes(data)
+                self._enforce_budget()
+            except Exception as e:
+                logger.warning(f"Debug artifact yazılamadı ({filename}): {e}")
+
+    def _enforce_budget(self):
+        """Toplam boyut bütçeyi aşıyorsa en eski dosyaları sil"""
+        files = []
+        total = 0
+        for path in self.base_dir.iterdir():
+            if not path.is_file():
+                continue
+            stat = path.stat()
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+                logger.debug(f"Debug artifact bütçe nedeniyle silindi: {path.name}")
+            except OSError:
+                continue
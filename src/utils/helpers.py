@@ -84,5 +84,3 @@ def create_filename_safe(text: str, max_length: int = 50) -> str:
         text = text[:max_length]
     
     return text or "untitled"
-
-logger.info("Helper functions loaded")
@@ -0,0 +1,316 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from loguru import logger
+from pydantic import BaseModel
+
+from src.config.settings import settings
+
+# Job durumları
+STATE_QUEUED = "queued"
+STATE_LEASED = "leased"
+STATE_DONE = "done"
+STATE_DEAD = "dead"  # Dead-letter: max_attempts tükendi
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    queue TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    visible_at REAL NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_dispatch ON jobs (queue, state, visible_at, created_at);
+"""
+
+
+class QueuedJob(BaseModel):
+    """Kuyruktaki job satırı"""
+
+    id: str
+    queue: str
+    payload: Dict[str, Any]
+    state: str
+    attempts: int
+    max_attempts: int
+    lease_owner: Optional[str] = None
+    lease_expires: Optional[float] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+
+
+def owner_prefix(name: str) -> str:
+    """Bu host'taki aynı rol (api / batch) process'lerinin ortak lease öneki"""
+    return f"{name}@{socket.gethostname()}:"
+
+
+def worker_owner(name: str) -> str:
+    """Lease sahibi kimliği: host + pid + process başına benzersiz id"""
+    return f"{owner_prefix(name)}{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+def _owner_dead(owner: str, prefix: str) -> bool:
+    """Lease sahibi process bu host'ta artık çalışmıyor mu
+
+    Kendi pid'imiz önceki (aynı pid ile yeniden başlamış) process'tir. pid'i
+    okunamayan veya durumu bilinemeyen sahip canlı sayılır: lease'i
+    visibility timeout ile düşer.
+    """
+    try:
+        pid = int(owner[len(prefix):].split('-', 1)[0])
+    except ValueError:
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False
+    return False
+
+
+class JobQueue:
+    """SQLite tabanlı kalıcı job kuyruğu
+
+    Job'lar lease ile alınır; lease sahibi heartbeat ile süresini uzatır.
+    Heartbeat gelmezse (process çöktü) visibility timeout sonunda job tekrar
+    dağıtılır. Her lease bir deneme sayılır, max_attempts tükenen job dead
+    durumuna düşer. Aynı id ile tekrar enqueue edilen job yeni iş açmaz
+    (N8N retry'ları idempotent).
+    """
+
+    def __init__(self, path: Optional[str] = None, visibility_timeout: Optional[float] = None):
+        self.path = Path(path or settings.job_queue_path)
+        self.visibility_timeout = visibility_timeout or settings.job_visibility_timeout_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """BEGIN IMMEDIATE: lease seçimi ve güncellemesi process'ler arası atomik"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> QueuedJob:
+        data = dict(row)
+        data['payload'] = json.loads(data['payload'])
+        data['result'] = json.loads(data['result']) if data['result'] is not None else None
+        return QueuedJob(**data)
+
+    def enqueue(self,
+                payload: Dict[str, Any],
+                queue: str = "default",
+                job_id: Optional[str] = None,
+                max_attempts: Optional[int] = None) -> QueuedJob:
+        """Job ekle; id zaten varsa mevcut job döner"""
+        job_id = job_id or uuid.uuid4().hex
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO jobs (id, queue, payload, state, max_attempts, visible_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, queue, json.dumps(payload, ensure_ascii=False, default=str), STATE_QUEUED,
+                 max_attempts or settings.job_max_attempts, now, now, now),
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row)
+
+    def lease(self, queue: str, owner: str, visibility_timeout: Optional[float] = None) -> Optional[QueuedJob]:
+        """Sıradaki görünür job'ı (veya lease'i düşmüş job'ı) al"""
+        timeout = visibility_timeout or self.visibility_timeout
+        now = time.time()
+        with self._transaction() as conn:
+            while True:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE queue = ? AND ("
+                    "(state = ? AND visible_at <= ?) OR (state = ? AND lease_expires < ?)"
+                    ") ORDER BY created_at LIMIT 1",
+                    (queue, STATE_QUEUED, now, STATE_LEASED, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                if row['attempts'] >= row['max_attempts']:
+                    # Lease'i düşmüş (process çöktü) ve denemesi tükenmiş job
+                    conn.execute(
+                        "UPDATE jobs SET state = ?, lease_owner = NULL, error = COALESCE(error, ?), updated_at = ? "
+                        "WHERE id = ?",
+                        (STATE_DEAD, "lease süresi doldu, deneme hakkı tükendi", now, row['id']),
+                    )
+                    logger.error(f"☠️ Job {row['id']} dead-letter'a taşındı ({row['attempts']} deneme)")
+                    continue
+                if row['state'] == STATE_LEASED:
+                    logger.warning(f"Job {row['id']} lease'i düştü ({row['lease_owner']}), tekrar dağıtılıyor")
+                conn.execute(
+                    "UPDATE jobs SET state = ?, attempts = attempts + 1, lease_owner = ?, lease_expires = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    (STATE_LEASED, owner, now + timeout, now, row['id']),
+                )
+                row = conn.execute("SELECT * FROM jobs WHERE id = ?", (row['id'],)).fetchone()
+                return self._to_job(row)
+
+    def heartbeat(self, job_id: str, owner: str, visibility_timeout: Optional[float] = None) -> bool:
+        """Lease süresini uzat; lease artık bizde değilse False"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND state = ? AND lease_owner = ?",
+                (now + (visibility_timeout or self.visibility_timeout), now, job_id, STATE_LEASED, owner),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, owner: str, result: Any = None) -> bool:
+        """Job'ı başarıyla bitir (sadece lease sahibi)"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET state = ?, result = ?, error = NULL, lease_owner = NULL, lease_expires = NULL, "
+                "updated_at = ? WHERE id = ? AND state = ? AND lease_owner = ?",
+                (STATE_DONE, json.dumps(result, ensure_ascii=False, default=str), now, job_id, STATE_LEASED, owner),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: str, owner: str, error: str, retry_delay: float = 0.0) -> Optional[str]:
+        """Denemeyi başarısız say: hak varsa retry_delay sonra tekrar görünür, yoksa dead
+
+        Yeni durumu döndürür (lease bizde değilse None).
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND state = ? AND lease_owner = ?",
+                (job_id, STATE_LEASED, owner),
+            ).fetchone()
+            if row is None:
+                return None
+            state = STATE_DEAD if row['attempts'] >= row['max_attempts'] else STATE_QUEUED
+            conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, lease_owner = NULL, lease_expires = NULL, visible_at = ?, "
+                "updated_at = ? WHERE id = ?",
+                (state, error, now + retry_delay, now, job_id),
+            )
+        if state == STATE_DEAD:
+            logger.error(f"☠️ Job {job_id} dead-letter'a taşındı: {error}")
+        return state
+
+    def release_owner(self, queue: str, owner_prefix: str) -> int:
+        """Bu host'ta ölmüş process'lerin lease'lerini visibility timeout beklemeden tekrar kuyruğa al (restart sonrası)
+
+        Aynı host'ta hâlâ çalışan process'lerin (ikinci uvicorn worker'ı, paralel
+        batch) lease'lerine dokunulmaz. Deneme sayısı sıfırlanmaz: sürekli çöken
+        job max_attempts sonra dead olur.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, lease_owner FROM jobs WHERE queue = ? AND state = ? AND lease_owner LIKE ?",
+                (queue, STATE_LEASED, f"{owner_prefix}%"),
+            ).fetchall()
+            dead = [row['id'] for row in rows if _owner_dead(row['lease_owner'], owner_prefix)]
+            for job_id in dead:
+                conn.execute(
+                    "UPDATE jobs SET state = ?, lease_owner = NULL, lease_expires = NULL, visible_at = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    (STATE_QUEUED, now, now, job_id),
+                )
+        if dead:
+            logger.info(f"♻️ Restart: {len(dead)} yarım kalan job tekrar kuyruğa alındı ({queue})")
+        return len(dead)
+
+    def requeue(self, job_id: str) -> bool:
+        """Dead-letter'daki job'ı deneme hakları sıfırlanmış olarak kuyruğa geri koy"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET state = ?, attempts = 0, visible_at = ?, updated_at = ? WHERE id = ? AND state = ?",
+                (STATE_QUEUED, now, now, job_id, STATE_DEAD),
+            )
+        return cursor.rowcount == 1
+
+    def get(self, job_id: str) -> Optional[QueuedJob]:
+        row = self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row is not None else None
+
+    def pending(self, queue: str) -> int:
+        """Henüz bitmemiş (queued + leased) job sayısı"""
+        row = self._connection().execute(
+            "SELECT COUNT(*) FROM jobs WHERE queue = ? AND state IN (?, ?)", (queue, STATE_QUEUED, STATE_LEASED)
+        ).fetchone()
+        return row[0]
+
+    def jobs(self, queue: str) -> List[QueuedJob]:
+        rows = self._connection().execute(
+            "SELECT * FROM jobs WHERE queue = ? ORDER BY created_at", (queue,)
+        ).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Kuyruk başına durum sayıları"""
+        result: Dict[str, Dict[str, int]] = {}
+        for row in self._connection().execute("SELECT queue, state, COUNT(*) FROM jobs GROUP BY queue, state"):
+            result.setdefault(row[0], {})[row[1]] = row[2]
+        return result
+
+    @contextmanager
+    def keep_leased(self, job: QueuedJob, owner: str, interval: Optional[float] = None) -> Iterator[threading.Event]:
+        """Blok süresince arka planda heartbeat gönder
+
+        Dönen event, lease kaybedilirse (başka worker devraldı) set edilir.
+        """
+        interval = interval or self.visibility_timeout / 3
+        stop = threading.Event()
+        lost = threading.Event()
+
+        def beat():
+            while not stop.wait(interval):
+                try:
+                    if not self.heartbeat(job.id, owner):
+                        logger.warning(f"Job {job.id} lease'i kaybedildi")
+                        lost.set()
+                        return
+                except sqlite3.Error as e:
+                    logger.warning(f"Heartbeat hatası ({job.id}): {e}")
+
+        thread = threading.Thread(target=beat, name=f"heartbeat-{job.id[:8]}", daemon=True)
+        thread.start()
+        try:
+            yield lost
+        finally:
+            stop.set()
+            thread.join()
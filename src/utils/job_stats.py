@@ -0,0 +1,190 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Sayfa yükleyen WebDriver komutları
+PAGE_LOAD_COMMANDS = {"get"}
+MB = 1024 * 1024
+
+
+class JobStats:
+    """Job başına performans sayaçları
+
+    Faz süreleri, WebDriver komut sayısı, CDP üzerinden alınan byte,
+    resource profile ile bloklanan istekler, yüklenen sayfa ve uyku/aktif süre ayrımı. Driver'a bir kez bağlanır,
+    her job başında reset() ile sıfırlanır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Yeni job için sayaçları sıfırla"""
+        with self._lock:
+            self.started = time.perf_counter()
+            self.phase_timings: Dict[str, float] = {}
+            self.webdriver_commands = 0
+            self.command_counts: Dict[str, int] = {}
+            self.cdp_bytes_received = 0
+            self.blocked_requests = 0
+            self.estimated_bytes_saved = 0
+            self.page_weights: List[Dict[str, Any]] = []
+            self.pages_loaded = 0
+            self.sleep_seconds = 0.0
+            self.first_ad_at = None
+            # Deadline: atlanan adımlar ve faz başına tamamlanma (done/total)
+            self.truncated_steps: List[str] = []
+            self.phase_completion: Dict[str, Dict[str, int]] = {}
+            # Bellek: tek browser'ın tepe RSS / JS heap'i (byte) ve limit nedeniyle yeniden başlatmalar
+            self.peak_browser_rss = 0
+            self.peak_js_heap = 0
+            self.browser_recycles = 0
+
+    def record_phase(self, phase: str, elapsed: float):
+        with self._lock:
+            self.phase_timings[phase] = self.phase_timings.get(phase, 0.0) + elapsed
+
+    def record_command(self, command: str):
+        with self._lock:
+            self.webdriver_commands += 1
+            self.command_counts[command] = self.command_counts.get(command, 0) + 1
+            if command in PAGE_LOAD_COMMANDS:
+                self.pages_loaded += 1
+
+    def mark_truncated(self, step: str):
+        """Deadline nedeniyle kısaltılan/atlanan adımı kaydet"""
+        with self._lock:
+            if step not in self.truncated_steps:
+                self.truncated_steps.append(step)
+
+    def record_completion(self, phase: str, done: int, total: int):
+        """Faz tamamlanma sayaçlarını topla (keyword'ler arası birikir)"""
+        with self._lock:
+            entry = self.phase_completion.setdefault(phase, {'done': 0, 'total': 0})
+            entry['done'] += done
+            entry['total'] += total
+
+    def mark_ad_ready(self):
+        """İlk reklamın hazır olduğu anı kaydet (time-to-first-ad)"""
+        if self.first_ad_at is None:
+            with self._lock:
+                if self.first_ad_at is None:
+                    self.first_ad_at = time.perf_counter()
+
+    def sleep(self, seconds: float):
+        """time.sleep + uyku süresini muhasebeleştir"""
+        if seconds <= 0:
+            return
+        time.sleep(seconds)
+        with self._lock:
+            self.sleep_seconds += seconds
+
+    def record_page_weight(self, page: str, profile: str, received: int, blocked: int, saved: int):
+        """Sayfa başına alınan byte ve resource profile ile kazanılan tahmini byte"""
+        with self._lock:
+            self.cdp_bytes_received += received
+            self.blocked_requests += blocked
+            self.estimated_bytes_saved += saved
+            self.page_weights.append({
+                'page': page,
+                'profile': profile,
+                'bytes_received': received,
+                'blocked_requests': blocked,
+                'estimated_bytes_saved': saved,
+            })
+
+    def record_memory(self, rss: Optional[int], js_heap: Optional[int]):
+        with self._lock:
+            self.peak_browser_rss = max(self.peak_browser_rss, rss or 0)
+            self.peak_js_heap = max(self.peak_js_heap, js_heap or 0)
+
+    def record_recycle(self):
+        with self._lock:
+            self.browser_recycles += 1
+
+    def merge(self, other: "JobStats"):
+        """Paralel çalışan başka bir browser'ın sayaçlarını bu job'a ekle (multi-region, paralel pencereler)"""
+        with other._lock:
+            snapshot = {
+                'phase_timings': dict(other.phase_timings),
+                'command_counts': dict(other.command_counts),
+                'page_weights': list(other.page_weights),
+                'truncated_steps': list(other.truncated_steps),
+                'phase_completion': {k: dict(v) for k, v in other.phase_completion.items()},
+                'first_ad_at': other.first_ad_at,
+            }
+            counters = (other.webdriver_commands, other.cdp_bytes_received, other.blocked_requests,
+                        other.estimated_bytes_saved, other.pages_loaded, other.sleep_seconds)
+            memory = (other.peak_browser_rss, other.peak_js_heap, other.browser_recycles)
+        with self._lock:
+            for phase, elapsed in snapshot['phase_timings'].items():
+                self.phase_timings[phase] = self.phase_timings.get(phase, 0.0) + elapsed
+            for command, count in snapshot['command_counts'].items():
+                self.command_counts[command] = self.command_counts.get(command, 0) + count
+            self.page_weights.extend(snapshot['page_weights'])
+            for step in snapshot['truncated_steps']:
+                if step not in self.truncated_steps:
+                    self.truncated_steps.append(step)
+            for phase, entry in snapshot['phase_completion'].items():
+                target = self.phase_completion.setdefault(phase, {'done': 0, 'total': 0})
+                target['done'] += entry['done']
+                target['total'] += entry['total']
+            if snapshot['first_ad_at'] is not None and (self.first_ad_at is None or snapshot['first_ad_at'] < self.first_ad_at):
+                self.first_ad_at = snapshot['first_ad_at']
+            self.webdriver_commands += counters[0]
+            self.cdp_bytes_received += counters[1]
+            self.blocked_requests += counters[2]
+            self.estimated_bytes_saved += counters[3]
+            self.pages_loaded += counters[4]
+            # Paralel uyku duvar saatini aşabilir; active_seconds summary'de 0'a kırpılır
+            self.sleep_seconds += counters[5]
+            # Tepe değerler browser başınadır (paralel browser'lar toplanmaz)
+            self.peak_browser_rss = max(self.peak_browser_rss, memory[0])
+            self.peak_js_heap = max(self.peak_js_heap, memory[1])
+            self.browser_recycles += memory[2]
+
+    def instrument_driver(self, driver):
+        """Driver'ın execute metodunu sayaçlı wrapper ile sar
+
+        Selenium'da find_element, get, execute_script, CDP komutları ve
+        WebElement çağrıları dahil tüm komutlar driver.execute'tan geçer.
+        """
+        if getattr(driver, '_job_stats_instrumented', False):
+            return driver
+
+        original_execute = driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.record_command(driver_command)
+            return original_execute(driver_command, params)
+
+        driver.execute = counting_execute
+        driver._job_stats_instrumented = True
+        return driver
+
+    def summary(self) -> Dict[str, Any]:
+        """ScrapingResult için performans özeti"""
+        with self._lock:
+            wall = time.perf_counter() - self.started
+            return {
+                'phase_timings': {k: round(v, 3) for k, v in self.phase_timings.items()},
+                'webdriver_commands': self.webdriver_commands,
+                'webdriver_command_counts': dict(self.command_counts),
+                'cdp_bytes_received': self.cdp_bytes_received,
+                'blocked_requests': self.blocked_requests,
+                'estimated_bytes_saved': self.estimated_bytes_saved,
+                'page_weights': list(self.page_weights),
+                'pages_loaded': self.pages_loaded,
+                'sleep_seconds': round(self.sleep_seconds, 3),
+                'active_seconds': round(max(wall - self.sleep_seconds, 0.0), 3),
+                'truncated': bool(self.truncated_steps),
+                'truncated_steps': list(self.truncated_steps),
+                'phase_completion': {k: dict(v) for k, v in self.phase_completion.items()},
+                'time_to_first_ad_seconds': (
+                    round(self.first_ad_at - self.started, 3) if self.first_ad_at is not None else None
+                ),
+                'peak_browser_rss_mb': round(self.peak_browser_rss / MB, 1) if self.peak_browser_rss else None,
+                'peak_js_heap_mb': round(self.peak_js_heap / MB, 1) if self.peak_js_heap else None,
+                'browser_recycles': self.browser_recycles,
+            }
@@ -0,0 +1,134 @@
+import re
+from functools import lru_cache
+from typing import FrozenSet, NamedTuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Tek geçişte tüm işaretleri bulan regex. Her pozisyonda lookahead ile
+# denendiği için örtüşen işaretler de (örn. "video.tiktokcdn.") yakalanır.
+_TOKEN_PATTERN = re.compile(
+    r"(?=(?P<mp4>\.mp4)"
+    r"|(?P<webm>\.webm)"
+    r"|(?P<mov>\.mov)"
+    r"|(?P<avi>\.avi)"
+    r"|(?P<m4v>\.m4v)"
+    r"|(?P<video_path>/video/)"
+    r"|(?P<tiktok_video_host>video\.tiktok)"
+    r"|(?P<video_word>video)"
+    r"|(?P<tiktokcdn>\.tiktokcdn\.)"
+    r"|(?P<tiktokcdn_host>tiktokcdn)"
+    r"|(?P<ttwstatic>\.ttwstatic\.)"
+    r"|(?P<tiktokv>\.tiktokv\.)"
+    r"|(?P<musically>\.musical\.ly)"
+    r"|(?P<ibyteimg>ibyteimg)"
+    r"|(?P<thumbnail>(?:thumb|poster|preview|cover)(?!nail))"
+    r"|(?P<high_quality>high|hd|720|1080)"
+    r"|(?P<image_ext>\.(?:jpe?g|png|gif|webp))"
+    r"|(?P<image_word>image))",
+    re.IGNORECASE,
+)
+
+VIDEO_EXT_TOKENS = frozenset({"mp4", "webm", "mov", "avi", "m4v"})
+# Network log'da video kabul edilen işaretler (eski NetworkVideoExtractor kuralları)
+VIDEO_URL_TOKENS = VIDEO_EXT_TOKENS | {
+    "video_path", "tiktok_video_host", "tiktokcdn", "ttwstatic", "tiktokv", "musically"
+}
+TIKTOK_CDN_TOKENS = frozenset({"ibyteimg", "tiktokcdn", "tiktokcdn_host"})
+
+# En iyi video URL seçimi için puanlar (her işaret bir kez sayılır)
+QUALITY_POINTS = {
+    "mp4": 10,
+    "webm": 8,
+    "mov": 6,
+    "video_path": 5,
+    "tiktokcdn": 8,
+    "ttwstatic": 7,
+    "high_quality": 9,
+}
+
+# İmzalı CDN URL'lerinde her istekte değişen parametreler
+SIGNATURE_PARAMS = frozenset({
+    "signature", "expires", "expire", "policy", "btag", "bti", "rc", "l",
+})
+_SIGNED_PATH_PREFIX = re.compile(r"^/[0-9a-f]{32}/[0-9a-f]{8}/", re.IGNORECASE)
+
+
+class MediaUrlInfo(NamedTuple):
+    """Medya URL sınıflandırma sonucu"""
+    media_type: str          # 'video', 'image' veya 'unknown'
+    quality: int             # Video URL seçimi için skor
+    canonical: str           # İmza parametreleri temizlenmiş URL (dedup için)
+    is_video: bool           # Network log'da video sayılır mı (thumbnail hariç)
+    is_thumbnail: bool
+    is_tiktok_cdn: bool      # ibyteimg / tiktokcdn
+    has_video_ext: bool      # .mp4 / .mov / .avi / .webm / .m4v
+    tokens: FrozenSet[str]
+
+
+_EMPTY = MediaUrlInfo("unknown", 0, "", False, False, False, False, frozenset())
+
+
+def _tokens(url: str) -> FrozenSet[str]:
+    found = set()
+    for match in _TOKEN_PATTERN.finditer(url):
+        found.add(match.lastgroup)
+    if "tiktok_video_host" in found:
+        found.add("video_word")
+    if "tiktokcdn" in found:
+        found.add("tiktokcdn_host")
+    return frozenset(found)
+
+
+def canonicalize_media_url(url: str) -> str:
+    """İmza/expire parametrelerini kaldırarak aynı medyanın farklı imzalı URL'lerini birleştir"""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    path = _SIGNED_PATH_PREFIX.sub("/", parts.path)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if k.lower() not in SIGNATURE_PARAMS and not k.lower().startswith("x-")]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+@lru_cache(maxsize=8192)
+def classify_media_url(url: str, mime_type: str = "") -> MediaUrlInfo:
+    """URL'yi tek regex geçişiyle sınıflandır (sonuçlar memoize edilir)
+
+    media_type önceliği: MIME type → video uzantısı/kelimesi → image uzantısı/kelimesi.
+    """
+    if not url or not isinstance(url, str):
+        return _EMPTY
+
+    tokens = _tokens(url)
+    mime = (mime_type or "").lower()
+
+    has_video_ext = bool(tokens & VIDEO_EXT_TOKENS)
+    is_thumbnail = "thumbnail" in tokens
+
+    if "video" in mime:
+        media_type = "video"
+    elif "image" in mime:
+        media_type = "image"
+    elif has_video_ext or "video_word" in tokens:
+        media_type = "video"
+    elif tokens & {"image_ext", "image_word"}:
+        media_type = "image"
+    else:
+        media_type = "unknown"
+
+    is_video = "video" in mime or (bool(tokens & VIDEO_URL_TOKENS) and not is_thumbnail)
+
+    quality = sum(points for token, points in QUALITY_POINTS.items() if token in tokens)
+    # Daha uzun URL'ler genelde daha detaylı (parameter'lar vs.)
+    quality += min(len(url) // 100, 3)
+
+    return MediaUrlInfo(
+        media_type=media_type,
+        quality=quality,
+        canonical=canonicalize_media_url(url),
+        is_video=is_video,
+        is_thumbnail=is_thumbnail,
+        is_tiktok_cdn=bool(tokens & TIKTOK_CDN_TOKENS),
+        has_video_ext=has_video_ext,
+        tokens=tokens,
+    )
@@ -0,0 +1,280 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Varsayılan histogram bucket'ları (saniye) - browser startup'tan detay sayfasına kadar
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _format_labels(labelnames: Tuple[str, ...], labelvalues: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Ortak metrik altyapısı (label'lı seri yönetimi)"""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: beklenen label'lar {self.labelnames}, gelen {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        with self._lock:
+            items = list(self._series.items())
+        for labelvalues, value in sorted(items):
+            lines.extend(self._render_series(labelvalues, value))
+        return lines
+
+    def _render_series(self, labelvalues, value) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Sadece artan sayaç"""
+
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._series.get(self._key(labels), 0.0)
+
+
+class Gauge(_Metric):
+    """Anlık değer"""
+
+    metric_type = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._series.get(self._key(labels), 0.0)
+
+
+class Histogram(_Metric):
+    """Bucket'lı dağılım (Prometheus histogram formatı)"""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [bucket sayıları..., +Inf sayısı, toplam, adet]
+                series = [0] * (len(self.buckets) + 1) + [0.0, 0]
+                self._series[key] = series
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return series[-1] if series else 0
+
+    def _render_series(self, labelvalues, series) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), series[:-2]):
+            cumulative += bucket_count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labelvalues, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, labelvalues)
+        lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+        lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrik kayıt defteri - /metrics endpoint'i için text format üretir"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry
+registry = MetricsRegistry()
+
+SCRAPE_PHASE_SECONDS = registry.histogram(
+    "tiktok_scrape_phase_seconds",
+    "Scrape fazlarının süresi (browser_startup, page_load, autocomplete, view_more, card_discovery, metadata, detail_page, media_probe)",
+    labelnames=("phase",),
+)
+SCRAPE_JOBS_TOTAL = registry.counter(
+    "tiktok_scrape_jobs_total", "Tamamlanan scrape job sayısı", labelnames=("search_type",)
+)
+ADS_SCRAPED_TOTAL = registry.counter(
+    "tiktok_ads_scraped_total", "Filtrelerden geçip sonuca eklenen reklam sayısı"
+)
+ADS_PER_SECOND = registry.histogram(
+    "tiktok_ads_per_second", "Job başına reklam/saniye",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0),
+)
+DETAIL_PAGES_TOTAL = registry.counter(
+    "tiktok_detail_pages_total", "Açılan reklam detay sayfası sayısı"
+)
+DETAIL_PAGES_PER_AD = registry.histogram(
+    "tiktok_detail_pages_per_ad", "Job başına reklam başına detay sayfası",
+    buckets=(0.0, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0),
+)
+BAN_DETECTIONS_TOTAL = registry.counter(
+    "tiktok_ban_detections_total", "Tespit edilen ban göstergesi sayısı", labelnames=("indicator",)
+)
+CACHE_HITS_TOTAL = registry.counter(
+    "tiktok_cache_hits_total", "Tekrar işlenmeden atlanan reklamlar", labelnames=("cache",)
+)
+CIRCUIT_STATE = registry.gauge(
+    "tiktok_circuit_state", "Egress kimliği başına circuit breaker durumu (0=closed, 1=half_open, 2=open)",
+    labelnames=("identity",),
+)
+CIRCUIT_OPENS_TOTAL = registry.counter(
+    "tiktok_circuit_opens_total", "Circuit breaker açılma sayısı", labelnames=("identity", "reason")
+)
+RATE_LIMIT_WAIT_SECONDS = registry.histogram(
+    "tiktok_rate_limit_wait_seconds", "Token bucket'tan token almak için beklenen süre", labelnames=("bucket",),
+    buckets=(0.0, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0),
+)
+BROWSER_RSS_BYTES = registry.gauge(
+    "tiktok_browser_rss_bytes", "Profil slot'u başına son ölçülen Chrome process ağacı RSS'i", labelnames=("slot",),
+)
+JOB_PEAK_BROWSER_RSS_MB = registry.histogram(
+    "tiktok_job_peak_browser_rss_mb", "Job başına tepe Chrome RSS'i (MB)",
+    buckets=(128, 256, 384, 512, 640, 768, 1024, 1536),
+)
+BROWSER_RECYCLES_TOTAL = registry.counter(
+    "tiktok_browser_recycles_total", "Bellek/sayfa sınırı nedeniyle yeniden başlatılan browser sayısı", labelnames=("reason",)
+)
+BROWSERS_LIVE = registry.gauge(
+    "tiktok_browsers_live", "Bu process'in takip ettiği açık browser sayısı"
+)
+BROWSER_PROCESSES = registry.gauge(
+    "tiktok_browser_processes", "Son taramada görülen chrome/chromedriver process sayısı (tüm ağaçlar)"
+)
+BROWSERS_REAPED_TOTAL = registry.counter(
+    "tiktok_browsers_reaped_total", "Öldürülen/toplanan sahipsiz browser process'leri", labelnames=("reason",)
+)
+BROWSER_TEMP_REMOVED_TOTAL = registry.counter(
+    "tiktok_browser_temp_removed_total", "Silinen terk edilmiş geçici profil dizini / /dev/shm dosyası", labelnames=("kind",)
+)
+STARTUP_SECONDS = registry.gauge(
+    "tiktok_startup_seconds", "Servis açılış fazlarının süresi (imports, job_queue, chromedriver, prewarm, ready)",
+    labelnames=("phase",),
+)
+
+
+class PhaseTimer:
+    """Faz süresini ölç ve histogram'a yaz
+
+    Context manager olarak veya start/stop ile kullanılabilir:
+        with phase_timer("page_load"): ...
+        timer = phase_timer("view_more"); ...; timer.stop()
+    """
+
+    __slots__ = ("phase", "started", "elapsed", "_listener")
+
+    def __init__(self, phase: str, listener: Optional[Callable[[str, float], None]] = None):
+        self.phase = phase
+        self.started = time.perf_counter()
+        self.elapsed: Optional[float] = None
+        self._listener = listener
+
+    def stop(self) -> float:
+        if self.elapsed is None:
+            self.elapsed = time.perf_counter() - self.started
+            SCRAPE_PHASE_SECONDS.observe(self.elapsed, phase=self.phase)
+            if self._listener is not None:
+                self._listener(self.phase, self.elapsed)
+        return self.elapsed
+
+    def __enter__(self) -> "PhaseTimer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+def phase_timer(phase: str, listener: Optional[Callable[[str, float], None]] = None) -> PhaseTimer:
+    """Yeni faz zamanlayıcısı başlat"""
+    return PhaseTimer(phase, listener)
+
+
+def render_metrics() -> str:
+    """Prometheus text exposition formatında tüm metrikler"""
+    return registry.render()
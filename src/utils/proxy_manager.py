@@ -1 +1,215 @@
- 
+import statistics
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from src.config.settings import settings
+from src.utils.circuit_breaker import breakers
+
+# Yeterli örnek birikmeden proxy sağlıksız sayılmaz
+MIN_SAMPLES = 5
+MIN_SUCCESS_RATE = 0.5
+MAX_BAN_RATE = 0.3
+
+
+class Proxy:
+    """Tek proxy: Chrome --proxy-server değeri ve requests proxies dict'i
+
+    identity (scheme://host:port, credential'sız) circuit breaker ve metrik
+    label'ı olarak kullanılır. Chrome --proxy-server credential kabul etmez;
+    kullanıcı adı/şifreli proxy'ler sadece requests (HEAD probe) tarafında
+    doğrulanır, browser için IP whitelist'li proxy kullanılmalı.
+    """
+
+    def __init__(self, url: str):
+        url = url.strip()
+        if "://" not in url:
+            url = f"http://{url}"
+        parts = urlsplit(url)
+        self.url = url
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.has_credentials = bool(parts.username)
+        self.identity = f"{self.scheme}://{self.host}:{self.port}"
+
+    @property
+    def chrome_argument(self) -> str:
+        return f"--proxy-server={self.identity}"
+
+    @property
+    def requests_proxies(self) -> Dict[str, str]:
+        return {'http': self.url, 'https': self.url}
+
+    def __repr__(self) -> str:
+        return f"Proxy({self.identity})"
+
+
+class ProxyStats:
+    """Son N olayın kayan penceresi: başarı, ban ve sayfa yükleme süresi"""
+
+    def __init__(self, window: int):
+        self._events: Deque[Tuple[bool, bool, Optional[float]]] = deque(maxlen=window)
+
+    def add(self, ok: bool, banned: bool = False, latency: Optional[float] = None):
+        self._events.append((ok, banned, latency))
+
+    @property
+    def samples(self) -> int:
+        return len(self._events)
+
+    @property
+    def success_rate(self) -> float:
+        if not self._events:
+            return 1.0
+        return sum(1 for ok, _, _ in self._events if ok) / len(self._events)
+
+    @property
+    def ban_rate(self) -> float:
+        if not self._events:
+            return 0.0
+        return sum(1 for _, banned, _ in self._events if banned) / len(self._events)
+
+    @property
+    def median_latency(self) -> Optional[float]:
+        latencies = [latency for _, _, latency in self._events if latency is not None]
+        return statistics.median(latencies) if latencies else None
+
+
+class ProxyPool:
+    """Config'ten yüklenen proxy'ler ve kayan pencere sağlık skorları
+
+    Dispatch en hızlı (medyan sayfa yükleme) sağlıklı proxy'yi tercih eder;
+    henüz ölçülmemiş proxy'ler ölçülebilmeleri için öne alınır. Sağlık:
+    circuit breaker kapalı, başarı oranı ve ban oranı eşiklerin içinde.
+    """
+
+    def __init__(self, proxies: Iterable[str] = (), window: Optional[int] = None):
+        self.window = window or settings.proxy_stats_window
+        self.proxies: List[Proxy] = []
+        self._stats: Dict[str, ProxyStats] = {}
+        self._lock = threading.Lock()
+        for url in proxies:
+            if url and url.strip():
+                self.add(url)
+
+    @classmethod
+    def from_settings(cls) -> "ProxyPool":
+        """PROXY_LIST (virgüllü) ve PROXY_FILE (satır başına bir proxy); USE_PROXIES=false ise boş"""
+        if not settings.use_proxies:
+            return cls()
+        urls = [url.strip() for url in settings.proxy_list.split(',') if url.strip()]
+        if settings.proxy_file:
+            try:
+                lines = Path(settings.proxy_file).read_text(encoding='utf-8').splitlines()
+                urls.extend(line for line in lines if line.strip() and not line.startswith('#'))
+            except OSError as e:
+                logger.warning(f"Proxy dosyası okunamadı ({settings.proxy_file}): {e}")
+        pool = cls(urls)
+        if not pool.proxies:
+            logger.warning("USE_PROXIES=true ama proxy listesi boş, direkt bağlantı kullanılacak")
+        return pool
+
+    def add(self, url: str) -> Proxy:
+        proxy = Proxy(url)
+        with self._lock:
+            if proxy.identity not in self._stats:
+                self.proxies.append(proxy)
+                self._stats[proxy.identity] = ProxyStats(self.window)
+        return proxy
+
+    def __bool__(self) -> bool:
+        return bool(self.proxies)
+
+    def __len__(self) -> int:
+        return len(self.proxies)
+
+    def stats(self, proxy: Proxy) -> ProxyStats:
+        return self._stats[proxy.identity]
+
+    def _record(self, proxy: Optional[Proxy], ok: bool, banned: bool = False, latency: Optional[float] = None):
+        if proxy is None:
+            return
+        with self._lock:
+            stats = self._stats.get(proxy.identity)
+            if stats is None:
+                # Başka bir pool'un proxy'si: bu pool'un skorlarına yazılmaz
+                logger.debug(f"Proxy {proxy.identity} bu pool'da yok, ölçüm atlandı")
+                return
+            stats.add(ok, banned=banned, latency=latency)
+
+    def record_page_load(self, proxy: Optional[Proxy], latency: float):
+        self._record(proxy, True, latency=latency)
+
+    def record_failure(self, proxy: Optional[Proxy]):
+        self._record(proxy, False)
+
+    def record_ban(self, proxy: Optional[Proxy]):
+        self._record(proxy, False, banned=True)
+
+    def is_healthy(self, proxy: Proxy) -> bool:
+        if not breakers.get(proxy.identity).available():
+            return False
+        stats = self.stats(proxy)
+        if stats.samples < MIN_SAMPLES:
+            return True
+        return stats.success_rate >= MIN_SUCCESS_RATE and stats.ban_rate <= MAX_BAN_RATE
+
+    def rank(self, proxy: Proxy) -> tuple:
+        """Sıralama anahtarı (küçük = daha iyi): sağlıklı > ölçülmemiş > düşük medyan latency"""
+        stats = self.stats(proxy)
+        latency = stats.median_latency
+        return (
+            not self.is_healthy(proxy),
+            latency is not None,
+            latency if latency is not None else 0.0,
+            -stats.success_rate,
+        )
+
+    def choose(self, exclude: Iterable[str] = ()) -> Optional[Proxy]:
+        """En iyi proxy; exclude'daki kimlikler (başka browser'lara bağlı) mümkünse atlanır"""
+        if not self.proxies:
+            return None
+        excluded = set(exclude)
+        candidates = [p for p in self.proxies if p.identity not in excluded] or self.proxies
+        return min(candidates, key=self.rank)
+
+    def check(self, proxy: Proxy, url: Optional[str] = None, timeout: float = 10.0) -> bool:
+        """Proxy üzerinden tek GET ile ucuz sağlık/latency ölçümü"""
+        import requests  # Sadece health check'te gerekli, server açılışını yavaşlatmasın
+
+        started = time.perf_counter()
+        try:
+            response = requests.get(url or settings.tiktok_base_url, proxies=proxy.requests_proxies,
+                                    timeout=timeout, stream=True)
+            response.close()
+            ok = response.status_code < 500
+        except requests.RequestException as e:
+            logger.debug(f"Proxy check başarısız ({proxy.identity}): {e}")
+            ok = False
+        if ok:
+            self.record_page_load(proxy, time.perf_counter() - started)
+        else:
+            self.record_failure(proxy)
+        return ok
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            items = [(proxy, self._stats[proxy.identity]) for proxy in self.proxies]
+        return [{
+            'identity': proxy.identity,
+            'healthy': self.is_healthy(proxy),
+            'samples': stats.samples,
+            'success_rate': round(stats.success_rate, 3),
+            'ban_rate': round(stats.ban_rate, 3),
+            'median_latency_seconds': round(stats.median_latency, 3) if stats.median_latency is not None else None,
+        } for proxy, stats in items]
+
+
+# Global pool (USE_PROXIES=false ise boş)
+proxy_pool = ProxyPool.from_settings()
@@ -0,0 +1,140 @@
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.config.settings import settings
+from src.utils.media_urls import classify_media_url
+from src.utils.metrics import RATE_LIMIT_WAIT_SECONDS
+
+try:
+    import fcntl
+except ImportError:  # Windows: sadece process içi kilit
+    fcntl = None
+
+CDN_BUCKET = "cdn"
+# Tek seferde beklenecek en uzun süre; sonra state tekrar okunur (diğer process'ler)
+MAX_POLL_SECONDS = 1.0
+
+
+def bucket_for(url: str) -> str:
+    """URL'nin token bucket'ı: TikTok CDN host'ları ortak 'cdn', diğerleri host başına"""
+    if classify_media_url(url).is_tiktok_cdn:
+        return CDN_BUCKET
+    return urlsplit(url).hostname or "default"
+
+
+class RateLimiter:
+    """Host başına token bucket (thread'ler ve process'ler arası ortak)
+
+    Bucket durumu (token sayısı, son dolum zamanı) fcntl kilitli küçük bir
+    JSON dosyasında tutulur; aynı makinedeki tüm worker'lar ve batch/daemon
+    process'leri aynı limite tabidir. Library host'ları requests_per_minute,
+    CDN cdn_requests_per_minute ile dolar; rate <= 0 bucket'ı devre dışı bırakır.
+    """
+
+    def __init__(self,
+                 state_path: Optional[str] = None,
+                 requests_per_minute: Optional[float] = None,
+                 cdn_requests_per_minute: Optional[float] = None,
+                 burst: Optional[float] = None):
+        self.state_path = Path(state_path or settings.rate_limit_state_path)
+        self.requests_per_minute = (
+            settings.requests_per_minute if requests_per_minute is None else requests_per_minute
+        )
+        self.cdn_requests_per_minute = (
+            settings.cdn_requests_per_minute if cdn_requests_per_minute is None else cdn_requests_per_minute
+        )
+        self.burst = max(1.0, settings.rate_limit_burst if burst is None else burst)
+        self._lock = threading.Lock()
+
+    def rate_for(self, bucket: str) -> float:
+        """Bucket'ın saniye başına token oranı"""
+        per_minute = self.cdn_requests_per_minute if bucket == CDN_BUCKET else self.requests_per_minute
+        return per_minute / 60.0
+
+    def acquire(self,
+                url: str,
+                timeout: Optional[float] = None,
+                sleep: Callable[[float], None] = time.sleep) -> bool:
+        """URL'nin bucket'ından bir token al, gerekirse bekle
+
+        timeout içinde token alınamazsa False döner (None = süresiz bekle).
+        sleep: bekleme fonksiyonu (JobStats.sleep ile uyku süresi job'a yazılır).
+        """
+        bucket = bucket_for(url)
+        rate = self.rate_for(bucket)
+        if rate <= 0:
+            return True
+
+        started = time.monotonic()
+        while True:
+            wait = self._take(bucket, rate)
+            if wait <= 0:
+                RATE_LIMIT_WAIT_SECONDS.observe(time.monotonic() - started, bucket=bucket)
+                return True
+            if timeout is not None:
+                left = timeout - (time.monotonic() - started)
+                if left <= 0:
+                    return False
+                wait = min(wait, left)
+            sleep(min(wait, MAX_POLL_SECONDS))
+
+    def _take(self, bucket: str, rate: float) -> float:
+        """Token varsa düş ve 0 döndür, yoksa bir token için beklenecek süre"""
+        with self._lock, self._state_lock():
+            state = self._read_state()
+            now = time.time()
+            tokens, updated = state.get(bucket, (self.burst, now))
+            tokens = min(self.burst, tokens + max(now - updated, 0.0) * rate)
+            if tokens >= 1.0:
+                state[bucket] = (tokens - 1.0, now)
+                wait = 0.0
+            else:
+                state[bucket] = (tokens, now)
+                wait = (1.0 - tokens) / rate
+            self._write_state(state)
+            return wait
+
+    def _state_lock(self):
+        return _FileLock(self.state_path.with_suffix('.lock'))
+
+    def _read_state(self) -> Dict[str, Tuple[float, float]]:
+        try:
+            raw = json.loads(self.state_path.read_text(encoding='utf-8'))
+            return {bucket: (float(v[0]), float(v[1])) for bucket, v in raw.items()}
+        except (OSError, ValueError, TypeError, IndexError):
+            return {}
+
+    def _write_state(self, state: Dict[str, Tuple[float, float]]):
+        self.state_path.write_text(json.dumps(state), encoding='utf-8')
+
+
+class _FileLock:
+    """fcntl ile process'ler arası exclusive kilit (fcntl yoksa no-op)"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if fcntl is not None:
+            self._file = open(self.path, 'w')
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._file is not None:
+            try:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+            finally:
+                self._file.close()
+                self._file = None
+        return False
+
+
+# Global limiter (state dosyası ilk acquire'da oluşturulur)
+rate_limiter = RateLimiter()
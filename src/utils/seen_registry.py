@@ -0,0 +1,49 @@
+import threading
+from typing import Iterable, Optional
+
+
+class SeenAdRegistry:
+    """Job kapsamında görülen ad_id'ler (thread-safe)
+
+    Tüm keyword aramaları (ve paralel worker'lar) aynı registry'yi paylaşır.
+    Faz 1'de metadata toplanırken kontrol edilir; daha önce görülen reklam
+    detay sayfasına gitmeden atlanır ve bütçeden sadece bir kez düşer.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seen = set()
+        self.duplicates_avoided = 0
+
+    def reset(self):
+        """Yeni job için registry'yi temizle"""
+        with self._lock:
+            self._seen.clear()
+            self.duplicates_avoided = 0
+
+    def claim(self, ad_id: Optional[str]) -> bool:
+        """Reklamı bu job için sahiplen; daha önce görüldüyse False
+
+        ad_id yoksa dedup yapılamaz, reklam her zaman işlenir.
+        """
+        if not ad_id:
+            return True
+        with self._lock:
+            if ad_id in self._seen:
+                self.duplicates_avoided += 1
+                return False
+            self._seen.add(ad_id)
+            return True
+
+    def forget(self, ad_ids: Iterable[str]):
+        """Başarısız denemede sahiplenilen ad_id'leri bırak (tekrar denemede atlanmasınlar)"""
+        with self._lock:
+            self._seen.difference_update(ad_ids)
+
+    def __contains__(self, ad_id: str) -> bool:
+        with self._lock:
+            return ad_id in self._seen
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._seen)
@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Testler proje kökünden `src.` import'larıyla çalışır
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class FakeClock:
+    """Modüllerin `time` referansı yerine geçen, elle ilerletilen saat"""
+
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
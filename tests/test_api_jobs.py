@@ -0,0 +1,49 @@
+import pytest
+
+import fastapi_server
+from src.config.settings import settings
+from src.scraper.tiktok_selenium_scraper import TikTokSeleniumScraper
+from src.utils.job_queue import STATE_QUEUED, JobQueue
+
+
+@pytest.fixture
+def broken_driver(monkeypatch, tmp_path):
+    def setup_driver(self):
+        self.setup_error = "WebDriverException: chrome not reachable"
+        return False
+
+    monkeypatch.setattr(TikTokSeleniumScraper, "setup_driver", setup_driver)
+    monkeypatch.setattr(settings, "checkpoint_path", str(tmp_path / "checkpoints"))
+
+
+def test_scrape_with_failed_driver_setup_raises(broken_driver):
+    request = fastapi_server.ScrapeRequest(keywords=["kredi"], job_id="job-1")
+    with pytest.raises(RuntimeError, match="WebDriver kurulamadı"):
+        fastapi_server.run_scrape_request(request, "job-1")
+
+
+def test_queue_worker_retries_instead_of_completing_empty_result(broken_driver, monkeypatch, tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(fastapi_server, "job_queue", queue)
+    queue.enqueue(fastapi_server.ScrapeRequest(keywords=["kredi"]).dict(), queue=fastapi_server.API_QUEUE, job_id="job-1")
+
+    # Tek job işledikten sonra worker döngüsünü durdur
+    original_fail = queue.fail
+
+    def fail(*args, **kwargs):
+        state = original_fail(*args, **kwargs)
+        fastapi_server._stop_workers.set()
+        return state
+
+    monkeypatch.setattr(queue, "fail", fail)
+    fastapi_server._ready.set()
+    fastapi_server._stop_workers.clear()
+    try:
+        fastapi_server._queue_worker("api@test:1")
+    finally:
+        fastapi_server._stop_workers.clear()
+
+    job = queue.get("job-1")
+    assert job.state == STATE_QUEUED
+    assert job.attempts == 1
+    assert "WebDriver kurulamadı" in job.error
@@ -0,0 +1,85 @@
+import os
+import time
+
+import pytest
+
+from src.config.settings import settings
+from src.scraper import browser_supervisor as supervisor_module
+from src.scraper.browser_supervisor import BrowserSupervisor
+
+BOOT_AGE = 10_000
+
+
+@pytest.fixture
+def fake_proc(tmp_path):
+    root = tmp_path / "proc"
+    root.mkdir()
+    (root / "stat").write_text(f"cpu 0 0 0\nbtime {int(time.time()) - BOOT_AGE}\n")
+
+    def add(pid, comm, ppid, cmdline, age=BOOT_AGE, state="S"):
+        started = (BOOT_AGE - age) * supervisor_module.CLOCK_TICKS
+        directory = root / str(pid)
+        directory.mkdir()
+        # fields: state ppid + 17 alan + starttime (stat'ın 22. alanı)
+        (directory / "stat").write_text(f"{pid} ({comm}) {state} {ppid} " + "0 " * 17 + f"{int(started)} 0 0\n")
+        (directory / "cmdline").write_bytes(b"\0".join(arg.encode() for arg in cmdline) + b"\0")
+
+    add(1, "tini", 0, ["tini", "--", "python"])
+    return root, add
+
+
+def _supervisor(root, tmp_path):
+    (tmp_path / "tmp").mkdir(exist_ok=True)
+    (tmp_path / "shm").mkdir(exist_ok=True)
+    supervisor = BrowserSupervisor(ttl=600, interval=0, proc_root=str(root),
+                                   temp_dir=str(tmp_path / "tmp"), shm_dir=tmp_path / "shm")
+    killed = []
+    supervisor._terminate = killed.append
+    return supervisor, killed
+
+
+def test_sweep_reaps_only_orphaned_webdriver_chromes(fake_proc, tmp_path):
+    root, add = fake_proc
+    # chromedriver öldü, excludeSwitches ile enable-automation'sız açılmış Chrome init'e kaldı
+    add(100, "chrome", 1, ["/opt/google/chrome/chrome", "--remote-debugging-port=0", "--test-type=webdriver",
+                           "--user-data-dir=/tmp/.org.chromium.Chromium.abc"])
+    add(101, "chrome", 100, ["/opt/google/chrome/chrome", "--type=renderer"])
+    # Kalıcı profilli Chrome: debugging argümanı olmasa da profil dizininden tanınır
+    add(400, "chrome", 1, ["/opt/google/chrome/chrome", f"--user-data-dir={settings.browser_profile_path}/slot-0"])
+    # Canlı başka bir process'in (batch CLI) browser'ı
+    add(200, "python", 1, ["python", "n8n_tiktok_scraper.py"])
+    add(201, "chromedriver", 200, ["chromedriver", "--port=4444"])
+    add(202, "chrome", 201, ["/opt/google/chrome/chrome", "--remote-debugging-port=0"])
+    # Kullanıcının normal Chrome'u ve TTL'i dolmamış sahipsiz Chrome
+    add(300, "chrome", 1, ["/opt/google/chrome/chrome"])
+    add(500, "chrome", 1, ["/opt/google/chrome/chrome", "--remote-debugging-port=0"], age=5)
+
+    supervisor, killed = _supervisor(root, tmp_path)
+    counts = supervisor.sweep()
+
+    assert sorted(sorted(tree) for tree in killed) == [[100, 101], [400]]
+    assert counts["orphan"] == 2
+    assert supervisor.snapshot()["reaped"] == {"orphan": 2}
+    assert supervisor.snapshot()["browser_processes"] == 7
+
+
+def test_sweep_removes_only_unused_stale_temp_profiles(fake_proc, tmp_path):
+    root, add = fake_proc
+    supervisor, _ = _supervisor(root, tmp_path)
+    stale = tmp_path / "tmp" / ".org.chromium.Chromium.stale"
+    in_use = tmp_path / "tmp" / ".org.chromium.Chromium.inuse"
+    fresh = tmp_path / "tmp" / ".org.chromium.Chromium.fresh"
+    unrelated = tmp_path / "tmp" / "something-else"
+    for directory in (stale, in_use, fresh, unrelated):
+        directory.mkdir()
+    old = time.time() - 3600
+    for path in (stale, in_use, unrelated):
+        os.utime(path, (old, old))
+    add(600, "chrome", 200000, ["/opt/google/chrome/chrome", "--remote-debugging-port=0", f"--user-data-dir={in_use}"],
+        age=5)
+
+    counts = supervisor.sweep()
+
+    assert counts["profile"] == 1
+    assert not stale.exists()
+    assert in_use.exists() and fresh.exists() and unrelated.exists()
@@ -0,0 +1,53 @@
+from src.utils.checkpoint import JobCheckpoint
+
+PARAMS = {"keywords": ["kredi", "kart"], "region": "TR"}
+
+
+def test_completed_units_and_state_survive_restart(tmp_path):
+    checkpoint = JobCheckpoint("job/1", params=PARAMS, base_dir=str(tmp_path))
+    checkpoint.record_unit("keyword:kredi", [{"ad_id": "1"}], ["1", ""], {"1": {"media_urls": ["u"]}})
+    checkpoint.record_failure("keyword:kart")
+    checkpoint.record_window_plan("kredi", [{"start": "a", "end": "b", "label": "0-6d"}])
+
+    resumed = JobCheckpoint("job/1", params=PARAMS, base_dir=str(tmp_path))
+
+    assert resumed.is_done("keyword:kredi") and not resumed.is_done("keyword:kart")
+    assert resumed.resumed_units == 1
+    assert resumed.ads == [{"ad_id": "1"}]
+    assert resumed.seen_ad_ids == ["1"]
+    assert resumed.media == {"1": {"media_urls": ["u"]}}
+    assert resumed.window_plan("kredi") == [{"start": "a", "end": "b", "label": "0-6d"}]
+    # Başarısız birimler diske yazılmaz, sonraki çalıştırma onları tekrar dener
+    assert resumed.failed_units == []
+
+
+def test_unit_and_window_plan_are_recorded_once(tmp_path):
+    checkpoint = JobCheckpoint("job-1", params=PARAMS, base_dir=str(tmp_path))
+    checkpoint.record_failure("keyword:kredi")
+    checkpoint.record_unit("keyword:kredi", [{"ad_id": "1"}], ["1"], {})
+    checkpoint.record_unit("keyword:kredi", [{"ad_id": "1"}], ["1"], {})
+    checkpoint.record_window_plan("kredi", [{"label": "0-6d"}])
+    checkpoint.record_window_plan("kredi", [{"label": "0-2d"}])
+
+    assert checkpoint.ads == [{"ad_id": "1"}]
+    assert checkpoint.failed_units == []
+    assert checkpoint.window_plan("kredi") == [{"label": "0-6d"}]
+
+
+def test_changed_params_start_over_and_clear_removes_file(tmp_path):
+    checkpoint = JobCheckpoint("job-1", params=PARAMS, base_dir=str(tmp_path))
+    checkpoint.record_unit("keyword:kredi", [{"ad_id": "1"}], ["1"], {})
+
+    changed = JobCheckpoint("job-1", params={**PARAMS, "region": "DE"}, base_dir=str(tmp_path))
+    assert changed.done_units == [] and changed.ads == []
+
+    checkpoint.clear()
+    assert not checkpoint.path.exists()
+    assert JobCheckpoint("job-1", params=PARAMS, base_dir=str(tmp_path)).done_units == []
+
+
+def test_job_ids_with_same_safe_name_do_not_share_a_file(tmp_path):
+    first = JobCheckpoint("job/1", base_dir=str(tmp_path))
+    second = JobCheckpoint("job:1", base_dir=str(tmp_path))
+
+    assert first.path != second.path
@@ -0,0 +1,51 @@
+import sys
+from types import ModuleType
+
+import pytest
+
+from src.scraper import chromedriver
+
+
+def _executable(path):
+    path.write_text("#!/bin/sh\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.fixture
+def resolver(tmp_path, monkeypatch):
+    monkeypatch.setattr(chromedriver, "_resolved", None)
+    monkeypatch.setattr(chromedriver, "_pinned_failed", False)
+    monkeypatch.setattr(chromedriver.settings, "chromedriver_cache_file", str(tmp_path / "chromedriver_path"))
+    installed = _executable(tmp_path / "managed-chromedriver")
+
+    class ChromeDriverManager:
+        def install(self):
+            return installed
+
+    module = ModuleType("webdriver_manager.chrome")
+    module.ChromeDriverManager = ChromeDriverManager
+    monkeypatch.setitem(sys.modules, "webdriver_manager.chrome", module)
+    return installed
+
+
+def test_invalidated_pinned_path_falls_back_to_webdriver_manager(resolver, tmp_path, monkeypatch):
+    pinned = _executable(tmp_path / "pinned-chromedriver")
+    monkeypatch.setattr(chromedriver.settings, "chromedriver_path", pinned)
+
+    assert chromedriver.chromedriver_path() == pinned
+    chromedriver.invalidate()
+
+    assert chromedriver.chromedriver_path() == resolver
+
+
+def test_invalidated_cached_path_is_resolved_again(resolver, tmp_path, monkeypatch):
+    monkeypatch.setattr(chromedriver.settings, "chromedriver_path", "")
+    stale = _executable(tmp_path / "stale-chromedriver")
+    (tmp_path / "chromedriver_path").write_text(stale)
+
+    assert chromedriver.chromedriver_path() == stale
+    chromedriver.invalidate()
+
+    assert chromedriver.chromedriver_path() == resolver
+    assert (tmp_path / "chromedriver_path").read_text() == resolver
@@ -0,0 +1,56 @@
+from src.utils import circuit_breaker
+from src.utils.circuit_breaker import CircuitBreaker, STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN
+
+
+def _breaker(clock, monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return CircuitBreaker("proxy-1", anomaly_threshold=3, base_backoff=10, max_backoff=35)
+
+
+def test_anomalies_open_only_at_threshold_and_success_resets(clock, monkeypatch):
+    breaker = _breaker(clock, monkeypatch)
+
+    breaker.record_anomaly()
+    breaker.record_anomaly()
+    breaker.record_success()
+    breaker.record_anomaly()
+    breaker.record_anomaly()
+    assert breaker.state == STATE_CLOSED and breaker.available()
+
+    breaker.record_anomaly()
+    assert breaker.state == STATE_OPEN
+    assert breaker.seconds_until_probe() == 10
+    assert breaker.last_reason == "anomaly"
+
+
+def test_backoff_doubles_on_failed_probe_up_to_max(clock, monkeypatch):
+    breaker = _breaker(clock, monkeypatch)
+    breaker.record_ban("captcha")
+    backoffs = [breaker.seconds_until_probe()]
+
+    for _ in range(3):
+        assert not breaker.needs_probe()  # Backoff dolmadan probe yok
+        clock.advance(backoffs[-1])
+        assert breaker.available() and breaker.needs_probe()
+        assert breaker.state == STATE_HALF_OPEN
+        breaker.record_probe(False)
+        backoffs.append(breaker.seconds_until_probe())
+
+    assert backoffs == [10, 20, 35, 35]
+    assert breaker.last_reason == "probe_failed"
+
+
+def test_successful_probe_closes_and_resets_backoff(clock, monkeypatch):
+    breaker = _breaker(clock, monkeypatch)
+    breaker.record_ban("captcha")
+    clock.advance(10)
+    breaker.needs_probe()
+    breaker.record_probe(False)
+    clock.advance(20)
+    assert breaker.needs_probe()
+
+    breaker.record_probe(True)
+    assert breaker.state == STATE_CLOSED and not breaker.needs_probe()
+
+    breaker.record_ban("captcha")
+    assert breaker.seconds_until_probe() == 10
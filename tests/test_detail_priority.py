@@ -0,0 +1,43 @@
+from src.scraper.detail_priority import DetailQueue
+
+
+def _scores(*ads):
+    queue = DetailQueue()
+    for index, (advertiser, text) in enumerate(ads):
+        queue.push({"advertiser_name": advertiser, "ad_text": text, "scrape_index": index})
+    return {ad["advertiser_name"]: ad["priority_score"] for ad in queue.drain()}
+
+
+def test_bank_names_match_advertiser_on_word_boundaries():
+    scores = _scores(
+        ("TEB A.S.", "Yeni yıl kampanyası"),
+        ("Papara", "Hemen indir"),
+        ("Tebrikler Organizasyon", "Tebrikler, çekilişi kazandınız"),
+        ("Parametre Yazılım", "Param param kazan"),
+    )
+
+    assert scores["TEB A.S."] == scores["Papara"] == 50
+    # "teb" ⊂ "tebrikler", "param" ⊂ "parametre": banka sayılmaz; metindeki isim de sayılmaz
+    assert scores["Tebrikler Organizasyon"] == scores["Parametre Yazılım"] == 0
+
+
+def test_banking_keywords_still_match_ad_text():
+    assert _scores(("Mobilya Dünyası", "Kredi kartına 12 taksit"))["Mobilya Dünyası"] == 50
+
+
+def test_media_cache_entries_expire(monkeypatch, clock):
+    from src.scraper import detail_priority
+    from src.scraper.detail_priority import ResolvedMediaCache
+
+    monkeypatch.setattr(detail_priority, "time", clock)
+    cache = ResolvedMediaCache(ttl_seconds=600)
+    cache.put("1", {"media_urls": ["https://v16-webapp.tiktokcdn.com/video/a.mp4"]})
+    cache.put("2", {"media_urls": [f"https://v16-webapp.tiktokcdn.com/video/b.mp4?x-expires={int(clock.now) + 60}"]})
+
+    assert cache.get("1") and cache.get("2")
+    clock.advance(61)
+    # İmzası expire olan URL TTL dolmadan düşer
+    assert cache.get("1") and cache.get("2") is None
+    clock.advance(600)
+    assert cache.get("1") is None
+    assert "1" not in cache
@@ -0,0 +1,86 @@
+from src.scraper import tiktok_selenium_scraper
+from src.scraper.browser_profile import PersistentProfile
+from src.scraper.tiktok_selenium_scraper import TikTokSeleniumScraper
+
+
+class _HalfStartedDriver:
+    """Chrome açıldı ama CDP komutu başarısız"""
+
+    def __init__(self, *args, **kwargs):
+        self.quit_called = False
+
+    def execute(self, command, params=None):
+        return {}
+
+    def execute_cdp_cmd(self, command, params):
+        raise RuntimeError("devtools disconnected")
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_failed_setup_quits_partial_driver_and_releases_profile(monkeypatch, tmp_path):
+    created = []
+
+    def chrome(*args, **kwargs):
+        created.append(_HalfStartedDriver())
+        return created[-1]
+
+    monkeypatch.setattr(tiktok_selenium_scraper.webdriver, "Chrome", chrome)
+    monkeypatch.setattr(tiktok_selenium_scraper.chromedriver, "chromedriver_path", lambda: "/usr/bin/chromedriver")
+    monkeypatch.setattr(tiktok_selenium_scraper, "Service", lambda path: None)
+    scraper = TikTokSeleniumScraper()
+    scraper.profile = PersistentProfile(slot=0, base_dir=str(tmp_path))
+
+    assert scraper.setup_driver() is False
+    assert scraper.driver is None
+    assert created[0].quit_called
+    assert "devtools disconnected" in scraper.setup_error
+    assert not scraper.profile.active
+
+    # Kilit bırakıldı: aynı slot başka bir profil nesnesi tarafından alınabilir
+    other = PersistentProfile(slot=0, base_dir=str(tmp_path))
+    assert other.acquire()
+    other.release()
+
+
+def test_failed_setup_keeps_ads_restored_from_checkpoint(monkeypatch, tmp_path):
+    from src.utils.checkpoint import JobCheckpoint
+
+    params = {"keywords": ["kredi", "kart"]}
+    done = JobCheckpoint("job-1", params=params, base_dir=str(tmp_path))
+    done.record_unit("keyword:kredi", [{"ad_id": "1"}, {"ad_id": "2"}], ["1", "2"], {})
+
+    monkeypatch.setattr(TikTokSeleniumScraper, "setup_driver", lambda self: False)
+    scraper = TikTokSeleniumScraper()
+    scraper.checkpoint = JobCheckpoint("job-1", params=params, base_dir=str(tmp_path))
+
+    assert [ad["ad_id"] for ad in scraper.search_ads_by_keyword(["kredi", "kart"], 10)] == ["1", "2"]
+    assert [ad["ad_id"] for ad in scraper.search_ads_by_advertiser(["kredi", "kart"], 10)] == ["1", "2"]
+
+
+def test_failed_recycle_fails_unit_instead_of_searching_without_driver(monkeypatch, tmp_path):
+    from src.utils.checkpoint import JobCheckpoint
+
+    monkeypatch.setattr(tiktok_selenium_scraper.settings, "browser_recycle_pages", 5)
+    monkeypatch.setattr(TikTokSeleniumScraper, "_sample_memory", lambda self: None)
+    monkeypatch.setattr(TikTokSeleniumScraper, "shutdown", lambda self: setattr(self, "driver", None))
+
+    def setup_driver(self):
+        self.setup_error = "WebDriverException: chrome crashed"
+        return False
+
+    def scrape_search(self, url, **kwargs):
+        raise AssertionError("driver yokken arama yapılmamalı")
+
+    monkeypatch.setattr(TikTokSeleniumScraper, "setup_driver", setup_driver)
+    monkeypatch.setattr(TikTokSeleniumScraper, "_scrape_search", scrape_search)
+    scraper = TikTokSeleniumScraper()
+    scraper.checkpoint = JobCheckpoint("job-2", params={}, base_dir=str(tmp_path))
+    scraper.driver = _HalfStartedDriver()
+    scraper.pages_since_launch = 5
+
+    assert scraper._run_unit("keyword:kredi", "https://example.test") == []
+    assert scraper.driver is None
+    assert scraper.checkpoint.failed_units == ["keyword:kredi"]
+    assert not scraper.checkpoint.is_done("keyword:kredi")
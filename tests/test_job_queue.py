@@ -0,0 +1,127 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.utils import job_queue
+from src.utils.job_queue import (
+    JobQueue, STATE_DEAD, STATE_DONE, STATE_LEASED, STATE_QUEUED, owner_prefix, worker_owner
+)
+
+
+@pytest.fixture
+def queue(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(job_queue, "time", clock)
+    return JobQueue(str(tmp_path / "jobs.db"), visibility_timeout=60)
+
+
+def test_enqueue_is_idempotent_per_job_id(queue):
+    first = queue.enqueue({"keywords": ["kredi"]}, job_id="job-1", max_attempts=3)
+    again = queue.enqueue({"keywords": ["başka"]}, job_id="job-1", max_attempts=3)
+
+    assert again.payload == first.payload == {"keywords": ["kredi"]}
+    assert queue.pending("default") == 1
+
+
+def test_lease_complete_and_owner_checks(queue):
+    queue.enqueue({}, job_id="job-1", max_attempts=3)
+    job = queue.lease("default", "w1")
+
+    assert (job.state, job.attempts, job.lease_owner) == (STATE_LEASED, 1, "w1")
+    assert queue.lease("default", "w2") is None
+    # Lease sahibi olmayan heartbeat/complete/fail yapamaz
+    assert not queue.heartbeat("job-1", "w2")
+    assert not queue.complete("job-1", "w2", [])
+    assert queue.fail("job-1", "w2", "hata") is None
+
+    assert queue.complete("job-1", "w1", [{"ad_id": "1"}])
+    done = queue.get("job-1")
+    assert (done.state, done.result, done.lease_owner) == (STATE_DONE, [{"ad_id": "1"}], None)
+    assert queue.pending("default") == 0
+
+
+def test_expired_lease_is_redispatched_and_heartbeat_keeps_it(queue, clock):
+    queue.enqueue({}, job_id="job-1", max_attempts=3)
+    queue.lease("default", "w1")
+
+    clock.advance(50)
+    assert queue.heartbeat("job-1", "w1")
+    clock.advance(50)
+    assert queue.lease("default", "w2") is None  # heartbeat lease'i 60s uzattı
+
+    clock.advance(11)
+    job = queue.lease("default", "w2")
+    assert (job.lease_owner, job.attempts) == ("w2", 2)
+    # Eski sahip lease'i kaybetti
+    assert not queue.heartbeat("job-1", "w1")
+    assert not queue.complete("job-1", "w1", [])
+
+
+def test_expired_lease_without_attempts_left_is_dead_lettered(queue, clock):
+    queue.enqueue({}, job_id="job-1", max_attempts=1)
+    clock.advance(1)
+    queue.enqueue({}, job_id="job-2", max_attempts=1)
+    assert queue.lease("default", "w1").id == "job-1"
+
+    clock.advance(61)
+    job = queue.lease("default", "w2")
+
+    assert job.id == "job-2"
+    dead = queue.get("job-1")
+    assert dead.state == STATE_DEAD
+    assert dead.error == "lease süresi doldu, deneme hakkı tükendi"
+
+
+def test_fail_retries_after_delay_then_dead_letters(queue, clock):
+    queue.enqueue({}, job_id="job-1", max_attempts=2)
+    queue.lease("default", "w1")
+
+    assert queue.fail("job-1", "w1", "timeout", retry_delay=30) == STATE_QUEUED
+    assert queue.lease("default", "w1") is None  # backoff'ta
+    clock.advance(30)
+    assert queue.lease("default", "w1").attempts == 2
+
+    assert queue.fail("job-1", "w1", "yine timeout", retry_delay=30) == STATE_DEAD
+    clock.advance(30)
+    assert queue.lease("default", "w1") is None
+    assert queue.get("job-1").error == "yine timeout"
+
+    assert queue.requeue("job-1")
+    assert not queue.requeue("job-1")  # Sadece dead job'lar
+    job = queue.lease("default", "w1")
+    assert (job.id, job.attempts) == ("job-1", 1)
+
+
+def test_release_owner_requeues_only_dead_processes_leases(queue):
+    prefix = owner_prefix("api")
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+    owners = {
+        "job-1": f"{prefix}{finished.pid}-dead0001/0",       # çökmüş process
+        "job-2": f"{prefix}{os.getpid()}-previous/0",       # aynı pid ile yeniden başlamış biz
+        "job-3": f"{prefix}{os.getppid()}-alive001/0",      # aynı host'ta çalışan ikinci worker
+        "job-4": f"other@host:{finished.pid}-dead0002/0",   # başka rol / host
+    }
+    for job_id, owner in owners.items():
+        queue.enqueue({}, queue="api", job_id=job_id, max_attempts=3)
+        queue.lease("api", owner)
+    queue.enqueue({}, queue="batch", job_id="job-5", max_attempts=3)
+    queue.lease("batch", owners["job-1"])
+
+    assert queue.release_owner("api", prefix) == 2
+
+    released = queue.get("job-1")
+    # Deneme sayısı korunur: sürekli çöken job sonunda dead olur
+    assert (released.state, released.lease_owner, released.attempts) == (STATE_QUEUED, None, 1)
+    assert queue.get("job-2").state == STATE_QUEUED
+    assert queue.get("job-3").lease_owner == owners["job-3"]
+    assert queue.get("job-4").state == STATE_LEASED
+    assert queue.get("job-5").state == STATE_LEASED
+    assert queue.complete("job-3", owners["job-3"], [])
+
+
+def test_worker_owner_carries_pid():
+    owner = worker_owner("batch")
+
+    assert owner.startswith(f"{owner_prefix('batch')}{os.getpid()}-")
@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.scraper.network_capture import NetworkCapture
+
+VIDEO_URL = "https://v16-webapp.tiktokcdn.com/video/tos/alisg/abc/?mime_type=video_mp4"
+
+
+class _TimeoutDriver:
+    """Script timeout'unu Selenium gibi tutan sahte driver"""
+
+    def __init__(self, script_timeout, result=None, error=None):
+        self.timeouts = SimpleNamespace(script=script_timeout)
+        self.result = result
+        self.error = error
+        self.timeout_during_script = None
+
+    def set_script_timeout(self, seconds):
+        self.timeouts.script = seconds
+
+    def execute_async_script(self, script, *args):
+        self.timeout_during_script = self.timeouts.script
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+@pytest.mark.parametrize("result, error", [([VIDEO_URL], None), (None, TimeoutError("script timeout"))])
+def test_wait_for_video_restores_previous_script_timeout(result, error):
+    driver = _TimeoutDriver(30, result=result, error=error)
+
+    urls = NetworkCapture(driver).wait_for_video(8)
+
+    assert urls == ([VIDEO_URL] if result else [])
+    assert driver.timeout_during_script == 13
+    assert driver.timeouts.script == 30
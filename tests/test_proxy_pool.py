@@ -0,0 +1,100 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.scraper.driver_pool import DriverPool
+from src.utils.proxy_manager import Proxy, ProxyPool
+
+TARGET_URL = "http://ads.example.test/ads"
+
+
+class _ForwardProxy(BaseHTTPRequestHandler):
+    """Mutlak URL'li GET'leri karşılayan sahte HTTP proxy (her isteği kaydeder)"""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        body = b"<html><body>ok</body></html>"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_proxy():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ForwardProxy)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class _ProxiedDriver:
+    """driver.get'i scraper'ın bağlı olduğu proxy üzerinden yapan sahte WebDriver"""
+
+    def __init__(self, proxy: Proxy):
+        self.proxy = proxy
+
+    def get(self, url):
+        requests.get(url, proxies=self.proxy.requests_proxies, timeout=5).raise_for_status()
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def execute_cdp_cmd(self, command, params):
+        return {}
+
+
+def test_check_measures_latency_through_local_proxy(local_proxy):
+    pool = ProxyPool([f"127.0.0.1:{local_proxy.server_port}"])
+    proxy = pool.proxies[0]
+
+    assert pool.check(proxy, url=TARGET_URL)
+    assert local_proxy.requests == [TARGET_URL]
+    assert pool.stats(proxy).samples == 1
+    assert pool.stats(proxy).median_latency is not None
+
+
+def test_driver_pool_scrapers_report_to_injected_pool(local_proxy, monkeypatch):
+    pool = ProxyPool([f"127.0.0.1:{local_proxy.server_port}"])
+    drivers = DriverPool(1, proxies=pool)
+    scraper = drivers.checkout().scraper
+    assert scraper.proxy_pool is pool
+
+    monkeypatch.setattr(scraper, "_throttle", lambda url: None)
+    scraper.driver = _ProxiedDriver(scraper.proxy)
+    scraper._navigate(TARGET_URL)
+    scraper.driver = None
+
+    assert local_proxy.requests == [TARGET_URL]
+    assert pool.stats(scraper.proxy).samples == 1
+
+
+def test_record_ignores_proxies_of_other_pools():
+    pool = ProxyPool(["127.0.0.1:1"])
+    stranger = Proxy("10.0.0.1:8080")
+    pool.record_page_load(stranger, 0.1)
+    pool.record_failure(stranger)
+    pool.record_ban(stranger)
+    assert pool.stats(pool.proxies[0]).samples == 0
+
+
+def test_comma_separated_proxy_list_env(monkeypatch):
+    from src.config.settings import Settings
+    from src.utils import proxy_manager
+
+    monkeypatch.setenv("USE_PROXIES", "true")
+    monkeypatch.setenv("PROXY_LIST", "http://1.2.3.4:8080, http://5.6.7.8:3128,")
+    monkeypatch.setattr(proxy_manager, "settings", Settings(use_proxies=True))
+
+    pool = ProxyPool.from_settings()
+
+    assert [proxy.identity for proxy in pool.proxies] == [Proxy("http://1.2.3.4:8080").identity,
+                                                          Proxy("http://5.6.7.8:3128").identity]
@@ -0,0 +1,56 @@
+from src.utils import rate_limiter
+from src.utils.rate_limiter import CDN_BUCKET, RateLimiter, bucket_for
+
+LIBRARY_URL = "https://library.tiktok.com/ads?region=TR"
+
+
+def _limiter(tmp_path, clock, monkeypatch, **kwargs):
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    return RateLimiter(state_path=str(tmp_path / "rate.json"), **kwargs)
+
+
+def test_bucket_refills_at_configured_rate(tmp_path, clock, monkeypatch):
+    limiter = _limiter(tmp_path, clock, monkeypatch, requests_per_minute=60, burst=2)
+
+    # Burst kadar token beklemeden alınır, sonra saniyede bir token
+    assert limiter._take("library.tiktok.com", 1.0) == 0
+    assert limiter._take("library.tiktok.com", 1.0) == 0
+    assert limiter._take("library.tiktok.com", 1.0) == 1.0
+    clock.advance(0.5)
+    assert limiter._take("library.tiktok.com", 1.0) == 0.5
+    clock.advance(0.5)
+    assert limiter._take("library.tiktok.com", 1.0) == 0
+    # Uzun boşluk burst'ten fazla token biriktirmez
+    clock.advance(600)
+    assert [limiter._take("library.tiktok.com", 1.0) for _ in range(3)] == [0, 0, 1.0]
+
+
+def test_acquire_waits_for_refill_and_honours_timeout(tmp_path, clock, monkeypatch):
+    limiter = _limiter(tmp_path, clock, monkeypatch, requests_per_minute=30, burst=1)
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        clock.advance(seconds)
+
+    assert limiter.acquire(LIBRARY_URL, sleep=sleep)
+    assert limiter.acquire(LIBRARY_URL, sleep=sleep)
+    # 2 saniyede bir token: tek bekleme MAX_POLL_SECONDS ile bölünür
+    assert slept == [1.0, 1.0]
+    assert not limiter.acquire(LIBRARY_URL, timeout=0.5, sleep=sleep)
+
+
+def test_state_is_shared_between_limiters(tmp_path, clock, monkeypatch):
+    first = _limiter(tmp_path, clock, monkeypatch, requests_per_minute=60, burst=1)
+    second = RateLimiter(state_path=first.state_path, requests_per_minute=60, burst=1)
+
+    assert first._take("library.tiktok.com", 1.0) == 0
+    assert second._take("library.tiktok.com", 1.0) == 1.0
+
+
+def test_cdn_hosts_share_one_bucket_and_zero_rate_disables(tmp_path, clock, monkeypatch):
+    limiter = _limiter(tmp_path, clock, monkeypatch, requests_per_minute=60, cdn_requests_per_minute=0)
+
+    assert bucket_for("https://v16-webapp.tiktokcdn.com/video/tos/abc.mp4") == CDN_BUCKET
+    assert bucket_for(LIBRARY_URL) == "library.tiktok.com"
+    assert all(limiter.acquire("https://v16-webapp.tiktokcdn.com/video/tos/abc.mp4", timeout=0) for _ in range(50))
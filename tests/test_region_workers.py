@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+from src.models.ad_model import ScrapingResult
+from src.scraper import tiktok_scraper
+from src.scraper.driver_pool import DriverPool
+from src.scraper.tiktok_scraper import TikTokAdScraper
+
+
+@pytest.fixture(autouse=True)
+def region_workers(monkeypatch):
+    monkeypatch.setattr(tiktok_scraper.settings, "region_workers", 3)
+
+
+def _recording_search(used, fail_region=None):
+    lock = threading.Lock()
+
+    def search(selenium_scraper, search_region, max_ads):
+        with lock:
+            used.append(selenium_scraper)
+        if search_region == fail_region:
+            raise RuntimeError("sayfa yüklenemedi")
+        return [{"ad_id": f"{search_region}-1"}]
+    return search
+
+
+def test_regions_borrow_idle_browsers_from_callers_pool(monkeypatch):
+    pool = DriverPool(3, headless=True)
+    primary = pool.checkout()
+    originals = {id(worker): worker.scraper.seen_ads for worker in pool._idle}
+    monkeypatch.setattr(tiktok_scraper, "DriverPool", lambda *args, **kwargs: pytest.fail("yeni pool açılmamalı"))
+    scraper = TikTokAdScraper(selenium_scraper=primary.scraper, driver_pool=pool)
+    used = []
+
+    ads, _ = scraper._search_regions(["TR", "DE", "FR"], _recording_search(used), 30, None, {}, ScrapingResult())
+
+    assert sorted(ad["ad_id"] for ad in ads) == ["DE-1", "FR-1", "TR-1"]
+    assert {id(s) for s in used} <= {id(worker.scraper) for worker in pool._all}
+    # Ödünç alınanlar iade edildi, kendi dedup registry'leri geri kondu
+    assert len(pool._idle) == 2
+    assert all(worker.scraper.seen_ads is originals[id(worker)] for worker in pool._idle)
+
+
+def test_regions_fall_back_to_slots_after_callers_pool(monkeypatch):
+    pool = DriverPool(2, headless=True)
+    primary = pool.checkout()
+    primary.scraper.headless = False  # Pool headless, istek değil: pool'dan ödünç alınamaz
+    created = []
+
+    class RecordingPool(DriverPool):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created.append(kwargs["first_slot"])
+
+    monkeypatch.setattr(tiktok_scraper, "DriverPool", RecordingPool)
+    scraper = TikTokAdScraper(selenium_scraper=primary.scraper, driver_pool=pool)
+    scraper._search_regions(["TR", "DE"], _recording_search([]), 30, None, {}, ScrapingResult())
+
+    assert created == [pool.end_slot]
+
+
+def test_region_failure_is_reported_as_job_error():
+    pool = DriverPool(2, headless=True)
+    primary = pool.checkout()
+    scraper = TikTokAdScraper(selenium_scraper=primary.scraper, driver_pool=pool)
+    result = ScrapingResult()
+
+    ads, _ = scraper._search_regions(["TR", "DE"], _recording_search([], fail_region="DE"), 30, None, {}, result)
+
+    assert [ad["ad_id"] for ad in ads] == ["TR-1"]
+    assert len(result.errors) == 1 and result.errors[0].endswith("Region DE hatası: sayfa yüklenemedi")
+    assert result.region_timings["DE"]["error"] == "sayfa yüklenemedi"
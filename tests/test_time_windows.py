@@ -0,0 +1,93 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.scraper import time_windows
+from src.scraper.time_windows import AdDensityHistory, TimeWindow, density_key, plan_windows
+from src.utils.checkpoint import JobCheckpoint
+
+NOW = datetime(2026, 1, 31, 12, 0)
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    history = AdDensityHistory(str(tmp_path / "density.json"))
+    monkeypatch.setattr(time_windows, "ad_density", history)
+    return history
+
+
+def test_plan_without_history_uses_equal_windows(history):
+    windows = plan_windows(30, ["keyword:kredi:TR"], now=NOW)
+    assert [w.label for w in windows] == ["0-6d", "6-12d", "12-18d", "18-24d", "24-30d"]
+    assert windows[0].end == NOW
+    assert windows[-1].start == NOW - timedelta(days=30)
+
+
+def test_dense_recent_days_get_narrow_windows(history):
+    key = "keyword:kredi:TR"
+    ads = [{"last_shown": (NOW - timedelta(days=day)).strftime("%Y-%m-%d")} for day in range(3) for _ in range(40)]
+    history.record(key, TimeWindow.last_days(30, now=NOW), ads, now=NOW)
+    windows = plan_windows(30, [key], target_ads=60, now=NOW)
+    assert windows[0].label == "0-2d"
+    assert windows[-1].label.endswith("-30d")
+
+
+def test_resumed_job_reuses_checkpointed_window_plan(history, tmp_path, monkeypatch):
+    from src.scraper.tiktok_selenium_scraper import TikTokSeleniumScraper
+
+    key = density_key("keyword", "kredi", "TR")
+    params = {"keywords": ["kredi"], "days_back": 30}
+    scraper = TikTokSeleniumScraper()
+    scraper.checkpoint = JobCheckpoint("job-1", params=params, base_dir=str(tmp_path))
+    first = scraper._window_plan(key, 30)
+
+    # İlk pencere bitti: yoğunluk geçmişi değişti, yeni plan farklı olurdu
+    ads = [{"last_shown": (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")}] * 80
+    history.record(key, first[0], ads)
+    assert [w.label for w in plan_windows(30, [key])] != [w.label for w in first]
+
+    # Çöken job aynı job_id ile yeniden başlatılıyor
+    scraper.checkpoint = JobCheckpoint("job-1", params=params, base_dir=str(tmp_path))
+    resumed = scraper._window_plan(key, 30)
+    assert [(w.label, w.start, w.end) for w in resumed] == [(w.label, w.start, w.end) for w in first]
+
+
+def test_windows_are_searched_in_parallel_on_borrowed_pool_browsers(history, tmp_path, monkeypatch):
+    from src.scraper import tiktok_selenium_scraper
+    from src.scraper.driver_pool import DriverPool
+    from src.scraper.tiktok_selenium_scraper import TikTokSeleniumScraper
+
+    monkeypatch.setattr(tiktok_selenium_scraper, "ad_density", history)
+    monkeypatch.setattr(tiktok_selenium_scraper.settings, "time_window_workers", 3)
+    lock = threading.Lock()
+    # İlk üç pencere aynı anda aranmıyorsa barrier zaman aşımına düşer
+    barrier = threading.Barrier(3, timeout=5)
+    calls = []
+
+    def run_unit(self, unit, url, max_ads_per_search, **kwargs):
+        with lock:
+            calls.append((self, unit, max_ads_per_search))
+            first_round = len(calls) <= 3
+        if first_round:
+            barrier.wait()
+        self._unit_error = None
+        return [{"ad_id": unit}]
+
+    monkeypatch.setattr(TikTokSeleniumScraper, "_run_unit", run_unit)
+    monkeypatch.setattr(TikTokSeleniumScraper, "setup_driver", lambda self: True)
+    pool = DriverPool(3, headless=True)
+    primary = pool.checkout().scraper
+    primary.driver_pool = pool
+    primary.checkpoint = JobCheckpoint("job-1", params={}, base_dir=str(tmp_path))
+
+    ads = primary._search_term("keyword", "kredi", 100, "TR", 30, partition=True)
+
+    labels = [w["label"] for w in primary.checkpoint.window_plan(density_key("keyword", "kredi", "TR"))]
+    # Sonuçlar pencere sırasıyla (en yeniden eskiye)
+    assert [ad["ad_id"] for ad in ads] == [f"keyword:kredi@{label}" for label in labels]
+    assert len({id(scraper) for scraper, _, _ in calls}) == 3
+    assert sum(quota for _, _, quota in calls[:3]) <= 100
+    # Ödünç browser'lar iade edildi
+    assert len(pool._idle) == 2
+    assert all(worker.scraper.checkpoint is None for worker in pool._idle)